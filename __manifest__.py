@@ -1,6 +1,6 @@
 {
     'name': 'Quiz',
-    'version': '17.0.1.0.4',
+    'version': '17.0.1.0.6',
     'category': 'Education',
     'summary': 'Advanced Quiz Engine with Multiple Question Types',
     'description': """
@@ -15,13 +15,19 @@
     'author': 'Your Company',
     'website': 'https://www.yourcompany.com',
     'license': 'LGPL-3',
-    'depends': ['base', 'web', 'website', 'portal'],
+    'depends': ['base', 'web', 'website', 'portal', 'bus'],
     'external_dependencies': {'python': []},
     'data': [
         'security/security_groups.xml',
         'security/quiz_security.xml',
         'security/ir.model.access.csv',
         'data/quiz_mode_data.xml',
+        'data/archive_cron.xml',
+        'data/analytics_cron.xml',
+        'data/grading_cron.xml',
+        'data/proctor_cron.xml',
+        'data/dedup_cron.xml',
+        'data/leaderboard_cron.xml',
         'views/quiz_views.xml',
         'views/question_views.xml', 
            'views/passage_question_views.xml',
@@ -41,36 +47,61 @@
         'views/quiz_play_template.xml',
         'views/quiz_result_template.xml',
             'views/miku_base_template.xml',
+        'views/snapshot_views.xml',
+        'views/regrade_views.xml',
+        'views/archive_views.xml',
+        'views/analytics_views.xml',
+        'views/perf_views.xml',
+        'views/attempt_ledger_views.xml',
+        'views/proctor_views.xml',
+        'views/quiz_offline_template.xml',
+        'views/question_search_views.xml',
+        'views/question_dedup_views.xml',
+        'views/spaced_repetition_views.xml',
     ],
     
     'assets': {
         'web.assets_backend': [
             'quiz_engine_pro/static/src/css/quiz_design_system.css',
-            'quiz_engine_pro/static/src/js/quiz_enhanced_interaction.js',
+            'quiz_engine_pro/static/src/proctor/*',
             # Temporarily disabled due to Odoo 17 compatibility issues
             # 'quiz_engine_pro/static/src/js/question_editor.js',
             # 'quiz_engine_pro/static/src/xml/question_editor_templates.xml',
         ],
-        'web.assets_frontend': [
-              # Enhanced Design System
-              'quiz_engine_pro/static/src/css/quiz_design_system.css',
-            # Original CSS files (keep for compatibility)
+        # Quiz pages only (see models/quiz_assets.py): core styles and the lazy loader
+        'quiz_engine_pro.assets_quiz': [
+            'quiz_engine_pro/static/src/css/quiz_design_system.css',
             'quiz_engine_pro/static/src/css/quiz_styles.css',
+            'quiz_engine_pro/static/src/js/quiz_assets.js',
+        ],
+        # One bundle per question type family, loaded when the question plan has that type
+        'quiz_engine_pro.assets_quiz_drag_drop': [
             'quiz_engine_pro/static/src/css/quiz_drag_drop.css',
+        ],
+        'quiz_engine_pro.assets_quiz_dropdown': [
             'quiz_engine_pro/static/src/css/quiz_dropdown.css',
+        ],
+        'quiz_engine_pro.assets_quiz_sequence': [
             'quiz_engine_pro/static/src/css/quiz_sequence.css',
+            'quiz_engine_pro/static/src/js/sequence_buttons.js',
+        ],
+        'quiz_engine_pro.assets_quiz_matrix': [
             'quiz_engine_pro/static/src/css/quiz_matrix.css',
+        ],
+        'quiz_engine_pro.assets_quiz_fill_blanks': [
             'quiz_engine_pro/static/src/css/quiz_fill_blanks.css',
+        ],
+        'quiz_engine_pro.assets_quiz_sentence_completion': [
             'quiz_engine_pro/static/src/css/quiz_sentence_completion.css',
+        ],
+        'quiz_engine_pro.assets_quiz_passage': [
             'quiz_engine_pro/static/src/css/passage_question.css',
+            'quiz_engine_pro/static/src/css/quiz_passage.css',
             'quiz_engine_pro/static/src/css/quiz_passage_short_text.css',
-            # Enhanced JavaScript
-            'quiz_engine_pro/static/src/js/quiz_enhanced_interaction.js',
-            'quiz_engine_pro/static/src/js/quiz_fill_blanks.js',
-            'quiz_engine_pro/static/src/js/quiz_sentence_completion.js',
-            'quiz_engine_pro/static/src/js/quiz_passage.js',
-            # Original JS files (keep for compatibility)
-            'quiz_engine_pro/static/src/js/sequence_buttons.js',
+        ],
+        # Offline player, only on the pages of offline sessions
+        'quiz_engine_pro.assets_quiz_offline': [
+            'quiz_engine_pro/static/src/js/quiz_offline.js',
         ],
     },
     'images': ['static/description/icon.png'],
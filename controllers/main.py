@@ -1,5 +1,12 @@
 from odoo import http, fields, _
 from odoo.http import request
+from odoo.addons.quiz_engine_pro.models.answer_codec import encode_answer, parse_answer
+from odoo.addons.quiz_engine_pro.models.perf import instrument, render_metrics, timed_grading
+from odoo.addons.quiz_engine_pro.models.attempt_ledger import attempt_identity
+from odoo.addons.quiz_engine_pro.models.offline_delivery import MAX_BUNDLE_BYTES, SIGNATURE_HEADER
+from odoo.addons.quiz_engine_pro.models.spaced_repetition import REVIEW_MODE_KEY
+from odoo.exceptions import AccessError, ValidationError
+import hmac
 import json
 import uuid
 import logging
@@ -10,6 +17,8 @@ QUIZ_MODEL = 'quiz.quiz'
 SESSION_MODEL = 'quiz.session'
 RESPONSE_MODEL = 'quiz.response'
 INVITATION_MODEL = 'quiz.access.invitation'
+LEDGER_MODEL = 'quiz.attempt.ledger'
+SUBMISSION_KEY_MODEL = 'quiz.submission.key'
 PORTAL_ACCESS_MODEL = 'quiz.portal.access'
 QUIZ_MODE_MODEL = 'quiz.mode'
 TEMPLATE_ACCESS_DENIED = 'quiz_engine_pro.quiz_access_denied'
@@ -21,6 +30,7 @@ _logger = logging.getLogger(__name__)
 
 class QuizController(http.Controller):
     @http.route(['/quiz'], type='http', auth='public', website=True)
+    @instrument('list')
     def quiz_list(self, **kwargs):
         """List all published quizzes that the user has access to"""
         # Show only published quizzes filtered by user access
@@ -49,7 +59,7 @@ class QuizController(http.Controller):
         quizzes = request.env[QUIZ_MODEL].sudo().search(domain)
         active_mode = None
         if active_mode_key:
-            active_mode = mode_env.search([('key', '=', active_mode_key)], limit=1)
+            active_mode = mode_env._get_by_key(active_mode_key)
             if active_mode:
                 quizzes = quizzes.filtered(lambda q: active_mode in q.mode_ids)
         values = {
@@ -61,6 +71,7 @@ class QuizController(http.Controller):
         return request.render('quiz_engine_pro.quiz_list_template', values)
 
     @http.route(['/quiz/<string:slug>'], type='http', auth='public', website=True)
+    @instrument('detail')
     def quiz_detail(self, slug, **kwargs):
         """Show quiz details and start form"""
         quiz = request.env[QUIZ_MODEL].sudo().search([('slug', '=', slug), ('published', '=', True)], limit=1)
@@ -111,7 +122,7 @@ class QuizController(http.Controller):
         mode_env = request.env[QUIZ_MODE_MODEL].sudo()
         active_mode = None
         if mode_key:
-            m = mode_env.search([('key', '=', mode_key)], limit=1)
+            m = mode_env._get_by_key(mode_key)
             if m and m in quiz.mode_ids:
                 active_mode = m
 
@@ -138,11 +149,15 @@ class QuizController(http.Controller):
             'quiz': quiz,
             'questions': questions,
             'active_mode': active_mode,
+            'submit_key': str(uuid.uuid4()),
+            'start_key': str(uuid.uuid4()),
+            'quiz_asset_bundles': quiz._get_asset_bundles(questions),
             'show_rationales': bool(active_mode and active_mode.supports_rationales and quiz.allow_rationales),
             'immediate_feedback': bool(active_mode and active_mode.immediate_feedback),
         }
         return request.render('quiz_engine_pro.quiz_play_template', values)
     @http.route(['/quiz/<string:slug>/submit'], type='http', auth='public', methods=['POST'], csrf=True, website=True)
+    @instrument('submit')
     def quiz_submit(self, slug, **kwargs):
         """Handle submission of all questions on one page"""
         quiz = request.env[QUIZ_MODEL].sudo().search([('slug', '=', slug), ('published', '=', True)], limit=1)
@@ -150,6 +165,15 @@ class QuizController(http.Controller):
             return request.not_found()
         participant_name = request.env.user.name if not request.env.user._is_public() else 'Anonymous'
         participant_email = request.env.user.email if not request.env.user._is_public() else ''
+        # A replayed POST (same idempotency key) goes to the session the first one graded
+        submit_key = kwargs.get('idempotency_key')
+        claimed, previous = request.env[SUBMISSION_KEY_MODEL].sudo()._claim(quiz, submit_key)
+        if not claimed:
+            if previous:
+                return request.redirect(f'/quiz/session/{previous.session_token}/results')
+            return request.redirect(f'/quiz/{quiz.slug}')
+        if not request.env[LEDGER_MODEL].sudo()._claim_attempt(quiz, attempt_identity(request.env.user, participant_email)):
+            return self._render_attempts_exhausted(quiz)
         session_token = str(uuid.uuid4())
         session = request.env[SESSION_MODEL].sudo().create({
             'quiz_id': quiz.id,
@@ -159,9 +183,14 @@ class QuizController(http.Controller):
             'state': 'completed',
             'start_time': fields.Datetime.now(),
             'end_time': fields.Datetime.now(),
+            'snapshot_id': quiz._get_current_snapshot().id,
         })
         total_score = 0.0
         max_score = sum(quiz.question_ids.mapped('points'))
+        # Heavy exams: store the answers now, a grading job scores them (see quiz.grading.job)
+        grade_later = quiz.async_grading
+        response_vals = []
+        answered_count = 0
         for question in quiz.question_ids:
             # Extract raw answers for our one-page form
             if question.type == 'mcq_multiple':
@@ -171,6 +200,8 @@ class QuizController(http.Controller):
                 if raw_answer is None:
                     raw_answer = request.httprequest.form.get('question_' + str(question.id))
 
+            if raw_answer not in (None, '', []):
+                answered_count += 1
             # Always serialize answer as JSON for consistency
             answer_json = json.dumps(raw_answer)
             # Evaluate using model logic for consistency across types
@@ -182,28 +213,41 @@ class QuizController(http.Controller):
                         eval_answer = json.loads(raw_answer)
                     except Exception:
                         pass
-                computed = self._evaluate_answer(question, eval_answer)
+                eval_answer = question._resolve_client_answer(eval_answer)
+                computed = 0.0 if grade_later else self._grade_for_session(session, question, eval_answer)
             except Exception as e:
                 _logger.exception("Evaluation failed for question %s: %s", question.id, e)
                 computed = 0.0
 
             total_score += float(computed or 0.0)
 
-            request.env[RESPONSE_MODEL].sudo().create({
+            response_vals.append({
                 'session_id': session.id,
                 'question_id': question.id,
-                'answer_data': answer_json,
+                'answer_value': encode_answer(question.type, question._resolve_client_answer(parse_answer(answer_json))),
                 'score': computed,
             })
+        # One batched create instead of one INSERT (and recompute) per question
+        request.env[RESPONSE_MODEL].sudo().create(response_vals)
+        request.env[SUBMISSION_KEY_MODEL].sudo()._bind(quiz, submit_key, session)
+        progress = {'answered_count': answered_count, 'question_count': len(quiz.question_ids)}
+        if grade_later:
+            session.write({'total_score': 0.0, 'max_score': max_score, 'percentage': 0.0, 'passed': False,
+                           'grading_state': 'pending', **progress})
+            request.env['quiz.grading.job'].sudo()._enqueue(session)
+            return request.redirect(f'/quiz/session/{session.session_token}/results')
         percentage = (total_score / max_score * 100) if max_score > 0 else 0
         passed = percentage >= quiz.passing_score if hasattr(quiz, 'passing_score') else False
-        session.write({'total_score': total_score, 'max_score': max_score, 'percentage': percentage, 'passed': passed})
+        session.write({'total_score': total_score, 'max_score': max_score, 'percentage': percentage, 'passed': passed,
+                       **progress})
+        session._update_leaderboard()
         results_url = f'/quiz/session/{session.session_token}/results'
         if _logger.isEnabledFor(logging.DEBUG):
             _logger.debug(f"quiz_submit: score={total_score} max_score={max_score} percentage={percentage} passed={passed}")
         return request.redirect(results_url)
 
     @http.route(['/quiz/<string:slug>/start'], type='http', auth='public', methods=['POST'], csrf=False, website=True)
+    @instrument('start')
     def quiz_start(self, slug, **kwargs):
         """Start a quiz session"""
         quiz = request.env[QUIZ_MODEL].sudo().search([('slug', '=', slug), ('published', '=', True)], limit=1)
@@ -232,6 +276,26 @@ class QuizController(http.Controller):
             })
         participant_name = kwargs.get('participant_name', 'Anonymous')
         participant_email = kwargs.get('participant_email', '')
+        start_key = kwargs.get('idempotency_key')
+        claimed, previous = request.env[SUBMISSION_KEY_MODEL].sudo()._claim(quiz, start_key)
+        if not claimed:
+            if previous:
+                return request.redirect(self._get_start_redirect_url(quiz, previous, token))
+            return request.redirect(f'/quiz/{slug}')
+
+        # Mode handling
+        mode_key = kwargs.get('mode') or kwargs.get('mode_key') or request.params.get('mode')
+        mode_env = request.env[QUIZ_MODE_MODEL].sudo()
+        mode = None
+        if mode_key:
+            mode = mode_env._get_by_key(mode_key)
+            if mode and mode not in quiz.mode_ids:
+                mode = None  # disallow modes not assigned to quiz
+        is_review = bool(mode and mode.key == REVIEW_MODE_KEY)
+        # Tutor sessions are practice: they never use up one of the quiz's attempts
+        if not is_review and not request.env[LEDGER_MODEL].sudo()._claim_attempt(
+                quiz, attempt_identity(user, participant_email)):
+            return self._render_attempts_exhausted(quiz)
         session_token = str(uuid.uuid4())
         # Build question order (randomize + limit) for per-question navigation mode
         questions = quiz.question_ids
@@ -244,14 +308,11 @@ class QuizController(http.Controller):
             questions = questions[:quiz.question_limit]
         question_order = ','.join(str(q.id) for q in questions)
 
-        # Mode handling
-        mode_key = kwargs.get('mode') or kwargs.get('mode_key') or request.params.get('mode')
-        mode_env = request.env[QUIZ_MODE_MODEL].sudo()
-        mode = None
-        if mode_key:
-            mode = mode_env.search([('key', '=', mode_key)], limit=1)
-            if mode and mode not in quiz.mode_ids:
-                mode = None  # disallow modes not assigned to quiz
+        if is_review and not is_public:
+            # Tutor sessions of logged-in users practice what their review schedule says is due
+            review_ids = quiz._get_review_question_ids(user)
+            if review_ids:
+                question_order = ','.join(str(qid) for qid in review_ids)
 
         # Derive selection length overrides
         # Derive effective limit if needed (currently handled inline when building order)
@@ -265,6 +326,7 @@ class QuizController(http.Controller):
             'quiz_id': quiz.id,
             'participant_name': participant_name,
             'participant_email': participant_email,
+            'user_id': False if is_public else user.id,
             'session_token': session_token,
             'state': 'in_progress',
             'start_time': fields.Datetime.now(),
@@ -273,11 +335,13 @@ class QuizController(http.Controller):
             'show_rationales': bool(mode and mode.supports_rationales and quiz.allow_rationales),
             'immediate_feedback': bool(mode and mode.immediate_feedback),
             'explanation_policy': mode.explanation_policy if mode else 'after_completion',
+            'snapshot_id': quiz._get_current_snapshot().id,
         }
         if time_limit_minutes and time_limit_minutes > 0:
             session_vals['time_limit'] = time_limit_minutes
             session_vals['time_limit_end'] = fields.Datetime.now() + timedelta(minutes=time_limit_minutes)
         session = request.env[SESSION_MODEL].sudo().create(session_vals)
+        request.env[SUBMISSION_KEY_MODEL].sudo()._bind(quiz, start_key, session)
         access_token = kwargs.get('token')
         if access_token:
             invitation = request.env[INVITATION_MODEL].sudo().validate_token(access_token, quiz.id)
@@ -298,62 +362,43 @@ class QuizController(http.Controller):
                     'last_access': fields.Datetime.now()
                 })
         
-        # Include access token if provided (keep original token value)
-        redirect_url = f'/quiz/{slug}/question/1?session={session.session_token}'
-        if mode:
-            redirect_url += f'&mode={mode.key}'
-        if kwargs.get('token'):
-            redirect_url += f'&token={kwargs.get("token")}'
-
+        redirect_url = self._get_start_redirect_url(quiz, session, kwargs.get('token'))
         if _logger.isEnabledFor(logging.DEBUG):
             _logger.debug("quiz_start redirect -> %s", redirect_url)
         return request.redirect(redirect_url)
 
+    def _get_start_redirect_url(self, quiz, session, token=None):
+        """Where a started session is played, also used when a start POST is replayed"""
+        # Include access token if provided (keep original token value)
+        if quiz.offline_mode:
+            # The offline player downloads the whole plan once and submits one signed bundle
+            redirect_url = f'/quiz/session/{session.session_token}/offline'
+            if token:
+                redirect_url += f'?token={token}'
+            return redirect_url
+        redirect_url = f'/quiz/{quiz.slug}/question/1?session={session.session_token}'
+        if session.mode_id:
+            redirect_url += f'&mode={session.mode_id.key}'
+        if token:
+            redirect_url += f'&token={token}'
+        return redirect_url
+
+    def _render_attempts_exhausted(self, quiz):
+        return request.render(TEMPLATE_ACCESS_DENIED, {
+            'quiz': quiz,
+            'login_required': False,
+            'message': _('You have used all %s attempts allowed for this quiz.', quiz.max_attempts),
+        })
+
     def _diagnose_question_type_field(self, question):
         """Helper method to diagnose issues with the question type field"""
         try:
-            # Get all fields from the model
-            model_fields = request.env['quiz.question']._fields
-            field_names = list(model_fields.keys())
-            
-            # Get the type field's technical details
-            type_field = model_fields.get('type')
-            type_field_info = {
-                'name': 'type',
-                'type': type_field.type if type_field else 'not found',
-                'selection': dict(type_field.selection) if type_field and hasattr(type_field, 'selection') else {},
-                'stored': type_field.store if type_field else False,
-                'required': type_field.required if type_field else False,
-            }
-            
-            # Check for potential alternative/conflicting fields
-            alt_fields = []
-            for name in field_names:
-                if name != 'type' and ('type' in name or name.endswith('_type')):
-                    field = model_fields.get(name)
-                    alt_fields.append({
-                        'name': name,
-                        'type': field.type if field else 'unknown',
-                        'selection': dict(field.selection) if field and hasattr(field, 'selection') else {},
-                        'value': getattr(question, name, None),
-                    })
-            
-            # Get actual value
-            type_value = getattr(question, 'type', 'not accessible')
-            
-            return {
-                'field_info': type_field_info,
-                'field_value': type_value,
-                'field_value_type': type(type_value).__name__,
-                'alternative_fields': alt_fields,
-                'all_fields': field_names[:30],  # Just show first 30 fields
-                'model_name': question._name,
-                'record_id': question.id,
-            }
+            return question._get_type_field_diagnostics()
         except Exception as e:
             return {'error': str(e)}
     
     @http.route(['/quiz/<string:slug>/question/<int:question_num>'], type='http', auth='public', methods=['GET', 'POST'], csrf=False, website=True)
+    @instrument('question')
     def quiz_question(self, slug, question_num, **kwargs):
         """Display or process a quiz question"""
         session_token = request.params.get('session')
@@ -368,7 +413,8 @@ class QuizController(http.Controller):
         # Reconstruct ordered question list from stored order for consistency
         if session.question_order:
             id_order = [int(x) for x in session.question_order.split(',') if x]
-            existing_ids = [qid for qid in id_order if qid in quiz.question_ids.ids]
+            quiz_question_ids = set(quiz.question_ids.ids)
+            existing_ids = [qid for qid in id_order if qid in quiz_question_ids]
             if existing_ids:
                 questions = quiz.question_ids.browse(existing_ids)
             else:
@@ -377,16 +423,7 @@ class QuizController(http.Controller):
             questions = quiz.question_ids.sorted(lambda q: q.sequence)
         
         # Apply access filters based on user type
-        if request.env.user._is_public():
-            # Public users can only access public questions
-            questions = questions.filtered(lambda q: 
-                q.access_mode == 'public' or 
-                (q.access_mode == 'inherit' and q.category_id and q.category_id.access_mode == 'public'))
-        elif request.env.user.has_group(GROUP_PORTAL):
-            # Portal users can access public and portal questions
-            questions = questions.filtered(lambda q: 
-                q.access_mode in ['public', 'portal'] or 
-                (q.access_mode == 'inherit' and q.category_id and q.category_id.access_mode in ['public', 'portal']))
+        questions = self._filter_accessible_questions(questions)
         
         # Check for token-based access to question categories
         token = kwargs.get('token')
@@ -414,18 +451,24 @@ class QuizController(http.Controller):
         if request.httprequest.method == 'POST':
             # Handle answer submission
             answer_data = request.params.get('answer_data')
-            request.env[RESPONSE_MODEL].sudo().create({
+            response = request.env[RESPONSE_MODEL].sudo().create({
                 'session_id': session.id,
                 'question_id': question.id,
-                'answer_data': json.dumps(answer_data) if answer_data else '{}',
+                'answer_value': encode_answer(question.type, question._resolve_client_answer(
+                    parse_answer(json.dumps(answer_data))) if answer_data else {}),
             })
+            session._proctor_record_answer(response)
+            if session._is_review_session():
+                # Graded right away: the answer reschedules the question in the user's review plan
+                response.score = self._grade_for_session(session, question, response._get_answer())
             
             # Get access token if provided
             access_token = kwargs.get('token')
 
             if len(questions) == question_num:
-                # Last question, complete the quiz
+                # Last question, complete the quiz; it is scored and ranked here, the results page only reads
                 session.write({'state': 'completed', 'end_time': fields.Datetime.now()})
+                session._grade_responses()
 
                 # Include access token in results URL if provided
                 results_url = f'/quiz/session/{session.session_token}/results'
@@ -471,6 +514,16 @@ class QuizController(http.Controller):
             
         # Add diagnostics to template values
         values['field_diagnostics'] = field_diagnostics
+        # Stem and answer inputs as the session's snapshot froze them (rendered once per version and
+        # language, shared across sessions), so the page shows what the answer is graded against
+        display = session._get_question_display(question)
+        values['question_stem'] = display['html']
+        values['question_points'] = display['points']
+        values['question_body'] = display['body']
+        values['question_unavailable'] = display['body'] is None
+        # The session's option permutation is applied client-side over the shared fragment
+        values['option_order'] = ','.join(str(option_id) for option_id in session._get_option_order(question)) or None
+        values['quiz_asset_bundles'] = session._get_asset_bundles()
         
         # Add this code to change the message display
         if question.type == 'step_sequence':
@@ -480,7 +533,146 @@ class QuizController(http.Controller):
         
         return request.render('quiz_engine_pro.quiz_question', values)
 
+    def _filter_accessible_questions(self, questions):
+        """Restrict questions to those the current user type may see"""
+        if request.env.user._is_public():
+            # Public users can only access public questions
+            audience = 'public'
+        elif request.env.user.has_group(GROUP_PORTAL):
+            # Portal users can access public and portal questions
+            audience = 'portal'
+        else:
+            return questions
+        visible = set()
+        for quiz in questions.quiz_id:
+            visible |= quiz._get_visible_question_ids(audience)
+        return questions.filtered(lambda q: q.id in visible)
+
+    @http.route('/quiz/session/<string:token>/payload', type='http', auth='public', methods=['GET'], website=True)
+    @instrument('payload')
+    def quiz_payload(self, token, **kwargs):
+        """Return the session's question plan as compact JSON (answer keys stripped) for client-side rendering"""
+        session = request.env[SESSION_MODEL].sudo().search([('session_token', '=', token)], limit=1)
+        if not session or session.state != 'in_progress':
+            return request.not_found()
+        quiz = session.quiz_id
+        version = session.snapshot_id.version if session.snapshot_id else quiz.content_version
+        etag = f'"{quiz.id}-{version}-{session.id}"'
+        headers = [
+            ('Content-Type', 'application/json; charset=utf-8'),
+            ('Cache-Control', 'private, no-cache'),
+            ('ETag', etag),
+        ]
+        if request.httprequest.headers.get('If-None-Match') == etag:
+            return request.make_response('', headers=headers, status=304)
+        return request.make_response(session._get_delivery_payload(self._plan_question_ids(session)), headers=headers)
+
+    def _plan_question_ids(self, session):
+        """Question ids of the session's plan the current user may see, in delivery order"""
+        allowed_ids = set(self._filter_accessible_questions(session.quiz_id.question_ids).ids)
+        return [qid for qid in session._get_delivery_question_ids() if qid in allowed_ids]
+
+    def _get_offline_session(self, token):
+        session = request.env[SESSION_MODEL].sudo().search([('session_token', '=', token)], limit=1)
+        if not session or not session.quiz_id.offline_mode:
+            return None
+        return session
+
+    @http.route('/quiz/session/<string:token>/offline', type='http', auth='public', methods=['GET'], website=True)
+    @instrument('offline')
+    def quiz_offline(self, token, **kwargs):
+        """Offline player shell; the questions come from the offline payload route"""
+        session = self._get_offline_session(token)
+        if not session:
+            return request.redirect(ROUTE_QUIZ)
+        if session.state != 'in_progress':
+            return request.redirect(f'/quiz/session/{session.session_token}/results')
+        return request.render('quiz_engine_pro.quiz_offline_play', {
+            'session': session,
+            'quiz': session.quiz_id,
+            'quiz_asset_bundles': session._get_asset_bundles() + ['quiz_engine_pro.assets_quiz_offline'],
+        })
+
+    @http.route('/quiz/session/<string:token>/offline/payload', type='http', auth='public', methods=['GET'])
+    @instrument('offline_payload')
+    def quiz_offline_payload(self, token, **kwargs):
+        """Question plan (answer keys stripped) and signing key of an offline session"""
+        session = self._get_offline_session(token)
+        if not session or session.state != 'in_progress':
+            return request.not_found()
+        headers = [
+            ('Content-Type', 'application/json; charset=utf-8'),
+            ('Cache-Control', 'no-store'),
+        ]
+        return request.make_response(session._get_offline_payload(self._plan_question_ids(session)), headers=headers)
+
+    @http.route('/quiz/session/<string:token>/offline/submit', type='http', auth='public', methods=['POST'], csrf=False)
+    @instrument('offline_submit')
+    def quiz_offline_submit(self, token, **kwargs):
+        """Verify, store and grade a signed answer bundle; the signature stands in for the CSRF token"""
+        headers = [
+            ('Content-Type', 'application/json; charset=utf-8'),
+            ('Cache-Control', 'no-store'),
+        ]
+        session = self._get_offline_session(token)
+        if not session:
+            return request.not_found()
+        if (request.httprequest.content_length or 0) > MAX_BUNDLE_BYTES:
+            return request.make_response(json.dumps({'error': 'too_large'}), headers=headers, status=413)
+        body = request.httprequest.get_data(cache=False)
+        question_ids = self._plan_question_ids(session)
+        try:
+            bundle = session._check_offline_bundle(body, request.httprequest.headers.get(SIGNATURE_HEADER), question_ids)
+        except AccessError:
+            return request.make_response(json.dumps({'error': 'signature'}), headers=headers, status=403)
+        except ValidationError as e:
+            return request.make_response(json.dumps({'error': 'invalid', 'message': str(e)}), headers=headers, status=400)
+        if not session._submit_offline_bundle(bundle, question_ids):
+            return request.make_response(json.dumps({'error': 'closed'}), headers=headers, status=409)
+        results_url = f'/quiz/session/{session.session_token}/results'
+        return request.make_response(json.dumps({'results_url': results_url}), headers=headers)
+
+    @http.route('/quiz/analytics/<int:quiz_id>', type='http', auth='user', methods=['GET'])
+    @instrument('analytics')
+    def quiz_analytics(self, quiz_id, **kwargs):
+        """Return quiz analytics as JSON, read from the periodically refreshed materialized views"""
+        if not request.env.user.has_group('quiz_engine_pro.group_quiz_master'):
+            return request.not_found()
+        quiz = request.env[QUIZ_MODEL].browse(quiz_id).exists()
+        if not quiz:
+            return request.not_found()
+        headers = [
+            ('Content-Type', 'application/json; charset=utf-8'),
+            ('Cache-Control', 'private, max-age=60'),
+        ]
+        return request.make_response(json.dumps(quiz._get_analytics(), default=str), headers=headers)
+
+    @http.route('/quiz/<string:slug>/leaderboard', type='http', auth='public', methods=['GET'], website=True)
+    @instrument('leaderboard')
+    def quiz_leaderboard(self, slug, **kwargs):
+        """Return the quiz's top list as JSON; shared by every candidate, so cacheable downstream"""
+        quiz = request.env[QUIZ_MODEL].sudo().search([
+            ('slug', '=', slug), ('published', '=', True), ('public_leaderboard', '=', True)], limit=1)
+        if not quiz:
+            return request.not_found()
+        headers = [
+            ('Content-Type', 'application/json; charset=utf-8'),
+            ('Cache-Control', 'public, max-age=30'),
+        ]
+        return request.make_response(json.dumps(quiz._get_leaderboard_data()), headers=headers)
+
+    @http.route('/quiz/metrics', type='http', auth='public', methods=['GET'], csrf=False)
+    def quiz_metrics(self, **kwargs):
+        """Prometheus text endpoint; requires the quiz_engine_pro.metrics_token system parameter as bearer token"""
+        expected = request.env['ir.config_parameter'].sudo().get_param('quiz_engine_pro.metrics_token')
+        authorization = request.httprequest.headers.get('Authorization', '')
+        if not expected or not hmac.compare_digest(authorization, f'Bearer {expected}'):
+            return request.not_found()
+        headers = [('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')]
+        return request.make_response(render_metrics(request.env.cr.dbname), headers=headers)
+
     @http.route('/quiz/session/<string:token>/results', type='http', auth='public', website=True)
+    @instrument('results')
     def quiz_results(self, token, **kwargs):
         """View quiz results"""
         session = request.env[SESSION_MODEL].sudo().search([('session_token', '=', token)], limit=1)
@@ -489,30 +681,51 @@ class QuizController(http.Controller):
                 _logger.debug("quiz_results: session not found redirect -> %s (token=%s)", ROUTE_QUIZ, token)
             return request.redirect(ROUTE_QUIZ)
         
-        # Calculate results if not already calculated
-        if session.state == 'completed' and not session.total_score:
-            responses = request.env[RESPONSE_MODEL].sudo().search([('session_id', '=', session.id)])
-            total_score = 0
-            max_score = sum(session.quiz_id.question_ids.mapped('points'))
-            for response in responses:
-                # Use _evaluate_answer for accurate scoring
-                score = self._evaluate_answer(response.question_id, response.answer_data)
-                total_score += score
-            percentage = (total_score / max_score * 100) if max_score > 0 else 0
-            session.write({
-                'total_score': total_score,
-                'percentage': percentage,
-                'passed': percentage >= session.quiz_id.passing_score,
+        if session.grading_state != 'done':
+            # Graded in the background: the page polls the status route until the score is in
+            return request.render('quiz_engine_pro.quiz_results_custom', {
+                'session': session,
+                'quiz': session.quiz_id,
+                'grading_pending': session.grading_state == 'pending',
+                'grading_failed': session.grading_state == 'failed',
             })
-        
+
+        # Sessions are scored and ranked when they complete: this GET only reads
+        top_percent = None
+        if session.state == 'completed':
+            top_percent = session._get_leaderboard_rank()
+
         values = {
             'session': session,
             'quiz': session.quiz_id,
             'score': session.total_score,
             'max_score': sum(session.quiz_id.question_ids.mapped('points')),
+            'leaderboard': session.quiz_id._get_leaderboard_data(),
+            'top_percent': top_percent,
         }
         return request.render('quiz_engine_pro.quiz_results_custom', values)
 
+    @http.route('/quiz/session/<string:token>/status', type='http', auth='public', methods=['GET'])
+    @instrument('status')
+    def quiz_status(self, token, **kwargs):
+        """Grading status of a session as JSON: a single indexed read, cheap enough to poll"""
+        session = request.env[SESSION_MODEL].sudo().search([('session_token', '=', token)], limit=1)
+        if not session:
+            return request.not_found()
+        headers = [
+            ('Content-Type', 'application/json; charset=utf-8'),
+            ('Cache-Control', 'no-store'),
+        ]
+        return request.make_response(json.dumps(session._get_grading_status()), headers=headers)
+
+    def _grade_for_session(self, session, question, answer_data):
+        """Grade against the session's pinned snapshot, falling back to live evaluation"""
+        with timed_grading(request.env, question.type):
+            score = session._grade_from_snapshot(question, answer_data)
+            if score is None:
+                score = self._evaluate_answer(question, answer_data)
+        return score
+
     def _evaluate_answer(self, question, answer_data):
         """Evaluate answer based on question type"""
         if not answer_data:
@@ -540,46 +753,9 @@ class QuizController(http.Controller):
                     return question.points
                 return 0
                 
-            # Passage Question: evaluate each sub-question
+            # Passage Question: graded by the model against the compiled sub-question key table
             elif question.type == 'passage':
-                if not question.passage_ids or not answer_data:
-                    return 0
-                
-                # Total points is sum of sub-question points
-                total_score = 0
-                
-                # Process each sub-question answer
-                for passage in question.passage_ids:
-                    for sub_q in passage.sub_question_ids:
-                        sub_q_key = f'sub_q_{sub_q.id}'
-                        if sub_q_key in answer_data:
-                            sub_answer = answer_data[sub_q_key]
-                            
-                            # Evaluate based on sub-question type
-                            if sub_q.question_type == 'mcq_single':
-                                correct_choice = sub_q.choice_ids.filtered(lambda c: c.is_correct)
-                                correct_id = str(correct_choice[0].id) if correct_choice else None
-                                user_choice = str(sub_answer) if sub_answer is not None else None
-                                if correct_id and user_choice == correct_id:
-                                    total_score += sub_q.points
-                                    
-                            elif sub_q.question_type == 'mcq_multiple':
-                                correct_choices = {str(c.id) for c in sub_q.choice_ids.filtered(lambda c: c.is_correct)}
-                                user_choices = {str(cid) for cid in (sub_answer or [])}
-                                if user_choices == correct_choices:
-                                    total_score += sub_q.points
-                                    
-                            elif sub_q.question_type in ['text_short', 'text_long']:
-                                # Simple text match or keywords check
-                                if sub_q.correct_answer and isinstance(sub_answer, str):
-                                    # Check for exact match or keywords
-                                    correct_keywords = [k.strip().lower() for k in sub_q.correct_answer.split(',')]
-                                    user_answer = sub_answer.lower()
-                                    
-                                    if any(kw in user_answer for kw in correct_keywords if kw):
-                                        total_score += sub_q.points
-                
-                return total_score
+                return question.evaluate_answer(answer_data)
             
             # ...other question types...
                 
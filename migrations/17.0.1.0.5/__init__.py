@@ -0,0 +1 @@
+# Migration scripts of 17.0.1.0.5
@@ -0,0 +1,47 @@
+import json
+import logging
+from psycopg2.extras import execute_values
+from odoo.addons.quiz_engine_pro.models.answer_codec import encode_answer, parse_answer
+
+_logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 10000
+
+
+def migrate(cr, version):
+    """Move quiz_response.answer_data text into the typed answer_value JSONB column"""
+    cr.execute("SELECT 1 FROM information_schema.columns WHERE table_name = 'quiz_response' AND column_name = 'answer_data'")
+    if not cr.fetchone():
+        return
+    cr.execute("SELECT count(*) FROM quiz_response WHERE answer_data IS NOT NULL")
+    total = cr.fetchone()[0]
+    _logger.info("Encoding %d quiz responses into answer_value", total)
+    last_id = 0
+    done = 0
+    while True:
+        cr.execute("""
+            SELECT r.id, q.type, r.answer_data
+              FROM quiz_response r
+              JOIN quiz_question q ON q.id = r.question_id
+             WHERE r.id > %s AND r.answer_data IS NOT NULL
+          ORDER BY r.id
+             LIMIT %s
+        """, [last_id, CHUNK_SIZE])
+        rows = cr.fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        values = []
+        for rid, qtype, answer_data in rows:
+            encoded = encode_answer(qtype, parse_answer(answer_data))
+            values.append((rid, json.dumps(encoded) if encoded is not None else None))
+        execute_values(cr, """
+            UPDATE quiz_response r
+               SET answer_value = v.value::jsonb
+              FROM (VALUES %s) AS v(id, value)
+             WHERE r.id = v.id
+        """, values)
+        done += len(rows)
+        _logger.info("Encoded %d/%d quiz responses", done, total)
+    # answer_data is now computed from answer_value; the space is reclaimed by the next VACUUM FULL
+    cr.execute("ALTER TABLE quiz_response DROP COLUMN answer_data")
@@ -0,0 +1,20 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Keep untouched quizzes unlimited now that max_attempts is enforced.
+
+    max_attempts used to default to 1. Only quizzes still holding that
+    default and never written since their creation are reset to 0
+    (unlimited, the new default); a 1 on an edited quiz may be the author's
+    choice and is kept.
+    """
+    cr.execute("""
+        UPDATE quiz_quiz
+           SET max_attempts = 0
+         WHERE max_attempts = 1
+           AND write_date = create_date
+    """)
+    _logger.info("Reset max_attempts to unlimited on %d untouched quizzes", cr.rowcount)
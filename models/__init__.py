@@ -10,3 +10,24 @@ from . import ghost_models
 from . import matrix_question  # Import the matrix question model
 from . import passage_question  # Import the passage question model
 from . import mode
+from . import content_version  # Must come after every model it versions
+from . import delivery
+from . import answer_key
+from . import snapshot
+from . import regrade
+from . import archive
+from . import analytics
+from . import leaderboard
+from . import perf
+from . import question_fragment
+from . import option_shuffle
+from . import attempt_ledger
+from . import grading_queue
+from . import cache_bus
+from . import proctor
+from . import quiz_assets
+from . import offline_delivery
+from . import question_search
+from . import question_dedup
+from . import quiz_clone
+from . import spaced_repetition
@@ -0,0 +1,178 @@
+from odoo import models, fields, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Finished sessions, live and archived
+FINISHED_SESSIONS_SQL = """
+    SELECT quiz_id, percentage, passed, start_time, end_time
+      FROM quiz_session
+     WHERE state IN ('completed', 'expired')
+    UNION ALL
+    SELECT quiz_id, percentage, passed, start_time, end_time
+      FROM quiz_session_archive
+     WHERE state IN ('completed', 'expired')
+"""
+
+# Responses of finished sessions, live and archived
+FINISHED_RESPONSES_SQL = """
+    SELECT r.question_id, r.score, r.is_correct
+      FROM quiz_response r
+      JOIN quiz_session s ON s.id = r.session_id
+     WHERE s.state IN ('completed', 'expired')
+    UNION ALL
+    SELECT r.question_id, r.score, r.is_correct
+      FROM quiz_response_archive r
+"""
+
+HISTOGRAM_BUCKETS = 10
+
+ANALYTICS_MODELS = ('quiz.analytics.quiz', 'quiz.analytics.score.bucket', 'quiz.analytics.question')
+
+
+class QuizAnalyticsMixin(models.AbstractModel):
+    """Reporting model backed by a materialized view.
+
+    Implementations set ``_query`` to the SELECT the view materializes; the
+    view gets a unique index on id so it can be refreshed concurrently,
+    without blocking readers.
+    """
+    _name = 'quiz.analytics.mixin'
+    _description = 'Quiz Analytics Materialized View'
+    _auto = False
+
+    _query = None
+
+    def init(self):
+        if self._abstract or not self._query:
+            return
+        cr = self.env.cr
+        cr.execute("DROP VIEW IF EXISTS %s CASCADE" % self._table)
+        cr.execute("DROP MATERIALIZED VIEW IF EXISTS %s CASCADE" % self._table)
+        cr.execute("CREATE MATERIALIZED VIEW %s AS (%s)" % (self._table, self._query))
+        cr.execute("CREATE UNIQUE INDEX %s_id_idx ON %s (id)" % (self._table, self._table))
+
+    def _refresh(self):
+        self.env.cr.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY %s" % self._table)
+        self.invalidate_model()
+
+
+class QuizAnalyticsQuiz(models.Model):
+    _name = 'quiz.analytics.quiz'
+    _inherit = 'quiz.analytics.mixin'
+    _description = 'Quiz Analytics'
+    _auto = False
+    _order = 'attempts desc'
+
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', readonly=True)
+    attempts = fields.Integer(string='Attempts', readonly=True)
+    passed_count = fields.Integer(string='Passed', readonly=True)
+    pass_rate = fields.Float(string='Pass Rate (%)', readonly=True, group_operator='avg')
+    avg_percentage = fields.Float(string='Average Score (%)', readonly=True, group_operator='avg')
+    avg_duration = fields.Float(string='Mean Time (minutes)', readonly=True, group_operator='avg')
+
+    _query = """
+        SELECT quiz_id AS id,
+               quiz_id,
+               count(*) AS attempts,
+               count(*) FILTER (WHERE passed) AS passed_count,
+               100.0 * count(*) FILTER (WHERE passed) / count(*) AS pass_rate,
+               avg(COALESCE(percentage, 0)) AS avg_percentage,
+               avg(EXTRACT(EPOCH FROM end_time - start_time) / 60.0)
+                   FILTER (WHERE end_time IS NOT NULL AND start_time IS NOT NULL) AS avg_duration
+          FROM (%s) sessions
+      GROUP BY quiz_id
+    """ % FINISHED_SESSIONS_SQL
+
+
+class QuizAnalyticsScoreBucket(models.Model):
+    _name = 'quiz.analytics.score.bucket'
+    _inherit = 'quiz.analytics.mixin'
+    _description = 'Quiz Score Distribution'
+    _auto = False
+    _order = 'quiz_id, bucket'
+
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', readonly=True)
+    bucket = fields.Integer(string='Bucket', readonly=True)
+    name = fields.Char(string='Score Range', readonly=True)
+    session_count = fields.Integer(string='Sessions', readonly=True)
+
+    # Bucket b covers [10 * b, 10 * b + 10) percent, 100% falls in the last one
+    _query = """
+        SELECT quiz_id * %(buckets)s + bucket AS id,
+               quiz_id,
+               bucket,
+               (bucket * %(width)s)::text || '-' || ((bucket + 1) * %(width)s)::text || '%%' AS name,
+               count(*) AS session_count
+          FROM (SELECT quiz_id,
+                       LEAST(GREATEST(floor(COALESCE(percentage, 0) / %(width)s)::int, 0), %(buckets)s - 1) AS bucket
+                  FROM (%(sessions)s) sessions) bucketed
+      GROUP BY quiz_id, bucket
+    """ % {'buckets': HISTOGRAM_BUCKETS, 'width': 100 // HISTOGRAM_BUCKETS, 'sessions': FINISHED_SESSIONS_SQL}
+
+
+class QuizAnalyticsQuestion(models.Model):
+    _name = 'quiz.analytics.question'
+    _inherit = 'quiz.analytics.mixin'
+    _description = 'Question Analytics'
+    _auto = False
+    _order = 'correct_rate'
+
+    question_id = fields.Many2one('quiz.question', string='Question', readonly=True)
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', readonly=True)
+    answered = fields.Integer(string='Answered', readonly=True)
+    correct_count = fields.Integer(string='Correct', readonly=True)
+    correct_rate = fields.Float(string='Correctness Rate (%)', readonly=True, group_operator='avg')
+    avg_score = fields.Float(string='Average Score', readonly=True, group_operator='avg')
+
+    _query = """
+        SELECT q.id AS id,
+               q.id AS question_id,
+               q.quiz_id,
+               count(*) AS answered,
+               count(*) FILTER (WHERE responses.is_correct) AS correct_count,
+               100.0 * count(*) FILTER (WHERE responses.is_correct) / count(*) AS correct_rate,
+               avg(COALESCE(responses.score, 0)) AS avg_score
+          FROM (%s) responses
+          JOIN quiz_question q ON q.id = responses.question_id
+      GROUP BY q.id, q.quiz_id
+    """ % FINISHED_RESPONSES_SQL
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    @api.model
+    def _cron_refresh_analytics(self):
+        for model_name in ANALYTICS_MODELS:
+            self.env[model_name]._refresh()
+        self.env['ir.config_parameter'].sudo().set_param(
+            'quiz_engine_pro.analytics_refreshed_at', fields.Datetime.to_string(fields.Datetime.now()))
+
+    def _get_analytics(self):
+        """Analytics of this quiz as a JSON-serializable dict, read from the materialized views only"""
+        self.ensure_one()
+        summary = self.env['quiz.analytics.quiz'].sudo().search_read(
+            [('quiz_id', '=', self.id)],
+            ['attempts', 'passed_count', 'pass_rate', 'avg_percentage', 'avg_duration'], limit=1)
+        buckets = self.env['quiz.analytics.score.bucket'].sudo().search_read(
+            [('quiz_id', '=', self.id)], ['bucket', 'name', 'session_count'])
+        histogram = [0] * HISTOGRAM_BUCKETS
+        for row in buckets:
+            histogram[row['bucket']] = row['session_count']
+        questions = self.env['quiz.analytics.question'].sudo().search_read(
+            [('quiz_id', '=', self.id)], ['question_id', 'answered', 'correct_rate', 'avg_score'], order='question_id')
+        summary = summary[0] if summary else {}
+        summary.pop('id', None)
+        return {
+            'quiz_id': self.id,
+            'refreshed_at': self.env['ir.config_parameter'].sudo().get_param('quiz_engine_pro.analytics_refreshed_at'),
+            'summary': summary,
+            'histogram': histogram,
+            'questions': [{
+                'question_id': row['question_id'][0],
+                'answered': row['answered'],
+                'correct_rate': row['correct_rate'],
+                'avg_score': row['avg_score'],
+            } for row in questions],
+        }
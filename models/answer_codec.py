@@ -0,0 +1,87 @@
+"""Typed, compact storage encoding of quiz.response answers.
+
+Answers are stored in the JSONB ``answer_value`` column as a small envelope:
+
+* ``{"c": payload}`` holds a compact, type-specific payload: choice ids as
+  integers and placement lists as ``[a, b]`` pairs instead of repeated
+  ``{"key_a": a, "key_b": b}`` objects;
+* ``{"v": value}`` holds the decoded answer verbatim, for answers that do not
+  fit their type's compact form.
+
+``encode_answer`` only emits a compact payload when ``decode_answer`` gives
+the original value back, so the encoding is lossless.
+"""
+import json
+
+# Placement answers posted as lists of two-key objects, stored as pairs
+PAIR_FIELDS = {
+    'match': ('left_id', 'right_id'),
+    'drag_zone': ('zone', 'token_id'),
+    'drag_text': ('zone', 'token_id'),
+    'sentence_completion': ('zone_id', 'token_id'),
+    'dropdown_blank': ('blank_id', 'option_id'),
+    'step_sequence': ('step_id', 'position'),
+}
+
+
+def parse_answer(answer_data):
+    """Decode a posted or legacy stored answer into a plain value.
+
+    Legacy rows hold the JSON dump of the posted value, which is decoded
+    exactly once: a posted string stays a string even when it reads as
+    JSON, like a text answer ``[1]``. Text that is not JSON is kept as is.
+    """
+    if not isinstance(answer_data, str):
+        return answer_data
+    try:
+        return json.loads(answer_data)
+    except ValueError:
+        return answer_data
+
+
+def _is_id(value):
+    return isinstance(value, str) and value.isdigit() and str(int(value)) == value
+
+
+def _compact(question_type, value):
+    if question_type == 'mcq_single':
+        if _is_id(value):
+            return int(value)
+    elif question_type == 'mcq_multiple':
+        if isinstance(value, list) and all(_is_id(v) for v in value):
+            return [int(v) for v in value]
+    elif question_type in PAIR_FIELDS:
+        fields = PAIR_FIELDS[question_type]
+        if isinstance(value, list) and all(isinstance(e, dict) and e.keys() == set(fields) for e in value):
+            return [[e[fields[0]], e[fields[1]]] for e in value]
+    return None
+
+
+def _expand(question_type, payload):
+    if question_type == 'mcq_single':
+        return str(payload)
+    if question_type == 'mcq_multiple':
+        return [str(v) for v in payload]
+    if question_type in PAIR_FIELDS:
+        first, second = PAIR_FIELDS[question_type]
+        return [{first: a, second: b} for a, b in payload]
+    return payload
+
+
+def encode_answer(question_type, value):
+    """Storage envelope for a decoded answer value (None when there is no answer)"""
+    if value is None:
+        return None
+    payload = _compact(question_type, value)
+    if payload is not None and _expand(question_type, payload) == value:
+        return {'c': payload}
+    return {'v': value}
+
+
+def decode_answer(question_type, stored):
+    """Answer value of a storage envelope, as posted by the quiz front-end"""
+    if not stored:
+        return None
+    if 'c' in stored:
+        return _expand(question_type, stored['c'])
+    return stored.get('v')
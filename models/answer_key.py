@@ -0,0 +1,174 @@
+from odoo import models, tools
+from .graders import GRADERS
+from .text_matcher import normalize_text, split_keywords
+
+
+class QuestionAnswerKey(models.Model):
+    _inherit = 'quiz.question'
+
+    def _compile_answer_keys(self):
+        """Compile the answer keys of these questions into JSON-serializable dicts.
+
+        Returns ``{question_id: key}``; questions whose type has no compiled
+        grader are left out so callers fall back to ``evaluate_answer``. Uses one
+        query per child model whatever the number of questions.
+        """
+        questions = self.sudo()
+        keys = {}
+        for question in questions:
+            if question.type in GRADERS:
+                keys[question.id] = {'type': question.type, 'points': question.points}
+        if not keys:
+            return keys
+        env = self.env
+        by_type = {}
+        for qid, key in keys.items():
+            by_type.setdefault(key['type'], []).append(qid)
+
+        def _ids(*types):
+            return [qid for t in types for qid in by_type.get(t, [])]
+
+        mcq_ids = _ids('mcq_single', 'mcq_multiple')
+        if mcq_ids:
+            for qid in mcq_ids:
+                keys[qid]['correct'] = None if keys[qid]['type'] == 'mcq_single' else []
+            choices = env['quiz.choice'].sudo().search_read(
+                [('question_id', 'in', mcq_ids), ('is_correct', '=', True)], ['question_id'])
+            for c in choices:
+                key = keys[c['question_id'][0]]
+                if key['type'] == 'mcq_single':
+                    # Mirror evaluate_answer: the first correct choice (in display order) wins
+                    if key['correct'] is None:
+                        key['correct'] = c['id']
+                else:
+                    key['correct'].append(c['id'])
+
+        fill_ids = _ids('fill_blank')
+        if fill_ids:
+            for qid in fill_ids:
+                keys[qid]['blanks'] = {}
+            for b in env['quiz.fill.blank.answer'].sudo().search_read(
+                    [('question_id', 'in', fill_ids)], ['question_id', 'blank_number', 'answer_text']):
+                keys[b['question_id'][0]]['blanks'][str(b['blank_number'])] = (b['answer_text'] or '').strip().lower()
+
+        match_ids = _ids('match')
+        if match_ids:
+            for qid in match_ids:
+                keys[qid]['pairs'] = {}
+            for p in env['quiz.match.pair'].sudo().search_read(
+                    [('question_id', 'in', match_ids)], ['question_id', 'right_text']):
+                keys[p['question_id'][0]]['pairs'][str(p['id'])] = (p['right_text'] or '').strip().lower()
+
+        token_ids = _ids('drag_zone', 'drag_text', 'sentence_completion')
+        if token_ids:
+            for qid in token_ids:
+                keys[qid]['tokens'] = []
+            for t in env['quiz.drag.token'].sudo().search_read(
+                    [('question_id', 'in', token_ids)], ['question_id', 'text', 'correct_position']):
+                keys[t['question_id'][0]]['tokens'].append([t['id'], t['correct_position'], t['text']])
+            for qid in _ids('sentence_completion'):
+                key = keys[qid]
+                html = questions.browse(qid).question_html or ''
+                total_blanks = html.count('{blank}') if key['tokens'] else 0
+                key['blanks'] = total_blanks
+                key['positions'] = {f"blank_{position}": token_id for token_id, position, _text in key.pop('tokens')
+                                    if 0 <= position < total_blanks}
+
+        matrix_ids = _ids('matrix')
+        if matrix_ids:
+            rows = env['quiz.matrix.row'].sudo().search_read([('question_id', 'in', matrix_ids)], ['question_id'])
+            cols = env['quiz.matrix.column'].sudo().search_read([('question_id', 'in', matrix_ids)], ['question_id'])
+            correct_cells = {
+                (c['row_id'][0], c['column_id'][0])
+                for c in env['quiz.matrix.cell'].sudo().search_read(
+                    [('question_id', 'in', matrix_ids), ('is_correct', '=', True)], ['row_id', 'column_id'])
+            }
+            cols_by_question = {}
+            for c in cols:
+                cols_by_question.setdefault(c['question_id'][0], []).append(c['id'])
+            for qid in matrix_ids:
+                keys[qid]['cells'] = {}
+            for r in rows:
+                qid = r['question_id'][0]
+                for col_id in cols_by_question.get(qid, []):
+                    keys[qid]['cells'][f"cell_{r['id']}_{col_id}"] = (r['id'], col_id) in correct_cells
+
+        dropdown_ids = _ids('dropdown_blank')
+        if dropdown_ids:
+            blanks = env['quiz.blank'].sudo().search_read([('question_id', 'in', dropdown_ids)], ['question_id'])
+            blank_question = {b['id']: b['question_id'][0] for b in blanks}
+            for qid in dropdown_ids:
+                keys[qid]['blanks'] = 0
+                keys[qid]['correct'] = {}
+            for qid in blank_question.values():
+                keys[qid]['blanks'] += 1
+            if blank_question:
+                for o in env['quiz.option'].sudo().search_read(
+                        [('blank_id', 'in', list(blank_question)), ('is_correct', '=', True)], ['blank_id']):
+                    blank_id = o['blank_id'][0]
+                    keys[blank_question[blank_id]]['correct'][str(o['id'])] = blank_id
+
+        sequence_ids = _ids('step_sequence')
+        if sequence_ids:
+            for qid in sequence_ids:
+                keys[qid]['positions'] = {}
+            for s in env['quiz.sequence.item'].sudo().search_read(
+                    [('question_id', 'in', sequence_ids)], ['question_id', 'correct_position']):
+                keys[s['question_id'][0]]['positions'][str(s['id'])] = s['correct_position']
+
+        passage_ids = _ids('passage')
+        if passage_ids:
+            self._compile_passage_keys(keys, passage_ids)
+
+        return keys
+
+    def _compile_passage_keys(self, keys, question_ids):
+        """Flatten each passage question's first passage into ``sub-question id -> (type, points, key)``.
+
+        The key is the correct choice id (mcq_single), the list of correct choice
+        ids (mcq_multiple) or the pre-normalized expected text and keywords
+        (see text_matcher).
+        """
+        env = self.env
+        first_passage = {}
+        for p in env['quiz.passage'].sudo().search_read([('question_id', 'in', question_ids)], ['question_id']):
+            # Currently supporting one passage per question: the first in display order
+            first_passage.setdefault(p['question_id'][0], p['id'])
+        for qid in question_ids:
+            keys[qid].update({'total': 0.0, 'subs': {}})
+        if not first_passage:
+            return
+        passage_question = {pid: qid for qid, pid in first_passage.items()}
+        subs = env['quiz.passage.sub.question'].sudo().search_read(
+            [('passage_id', 'in', list(passage_question))],
+            ['passage_id', 'question_type', 'points', 'correct_answer', 'fuzzy_max_distance'])
+        choice_sub_ids = [s['id'] for s in subs if s['question_type'] in ('mcq_single', 'mcq_multiple')]
+        correct_choices = {}
+        if choice_sub_ids:
+            for c in env['quiz.passage.choice'].sudo().search_read(
+                    [('sub_question_id', 'in', choice_sub_ids), ('is_correct', '=', True)], ['sub_question_id']):
+                correct_choices.setdefault(c['sub_question_id'][0], []).append(c['id'])
+        for s in subs:
+            key = keys[passage_question[s['passage_id'][0]]]
+            sub_type = s['question_type']
+            if sub_type == 'mcq_single':
+                sub_key = correct_choices.get(s['id'], [None])[0]
+            elif sub_type == 'mcq_multiple':
+                sub_key = correct_choices.get(s['id'], [])
+            else:
+                sub_key = {
+                    'exact': normalize_text(s['correct_answer']),
+                    'keywords': list(split_keywords(s['correct_answer'])),
+                    'fuzzy': s['fuzzy_max_distance'],
+                }
+            key['total'] += s['points']
+            key['subs'][str(s['id'])] = [sub_type, s['points'], sub_key]
+
+    def _get_answer_key(self):
+        """Compiled answer key of this question for its quiz's current content version (or None)"""
+        self.ensure_one()
+        return self._get_versioned_answer_key(self.quiz_id.content_version)
+
+    @tools.ormcache('self.id', 'version')
+    def _get_versioned_answer_key(self, version):
+        return self._compile_answer_keys().get(self.id)
@@ -0,0 +1,213 @@
+from odoo import models, fields, api, tools, _
+from .answer_codec import decode_answer
+from datetime import timedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Retention defaults, overridable through ir.config_parameter
+DEFAULT_RETENTION_DAYS = 365
+DEFAULT_CLOSED_RETENTION_DAYS = 30
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_MAX_BATCHES = 50
+
+# Columns copied verbatim from quiz_session into quiz_session_archive
+SESSION_COLUMNS = (
+    'quiz_id', 'user_id', 'session_token', 'state', 'start_time', 'end_time',
+    'total_score', 'max_score', 'percentage', 'passed', 'participant_name',
+    'participant_email', 'mode_id', 'snapshot_id', 'create_uid', 'create_date',
+)
+
+
+class QuizSessionArchive(models.Model):
+    """Finished sessions moved out of quiz_session to keep the hot tables small"""
+    _name = 'quiz.session.archive'
+    _description = 'Archived Quiz Session'
+    _order = 'end_time desc, id desc'
+
+    session_ref = fields.Integer(string='Original Session ID', index=True, readonly=True)
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', required=True, ondelete='cascade', index=True, readonly=True)
+    user_id = fields.Many2one('res.users', string='User', readonly=True)
+    session_token = fields.Char(string='Session Token', readonly=True)
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('in_progress', 'In Progress'),
+        ('completed', 'Completed'),
+        ('expired', 'Expired'),
+    ], string='State', readonly=True)
+    start_time = fields.Datetime(string='Start Time', readonly=True)
+    end_time = fields.Datetime(string='End Time', readonly=True)
+    total_score = fields.Float(string='Total Score', readonly=True)
+    max_score = fields.Float(string='Maximum Score', readonly=True)
+    percentage = fields.Float(string='Percentage', readonly=True)
+    passed = fields.Boolean(string='Passed', readonly=True)
+    participant_name = fields.Char(string='Participant Name', readonly=True)
+    participant_email = fields.Char(string='Participant Email', readonly=True)
+    mode_id = fields.Many2one('quiz.mode', string='Mode', ondelete='set null', readonly=True)
+    snapshot_id = fields.Many2one('quiz.snapshot', string='Snapshot', ondelete='set null', readonly=True)
+    archive_date = fields.Datetime(string='Archived On', readonly=True)
+    response_ids = fields.One2many('quiz.response.archive', 'session_archive_id', string='Responses', readonly=True)
+
+    @api.model
+    def _get_archive_domain_sql(self):
+        """WHERE clause and params selecting the sessions due for archival"""
+        params = self.env['ir.config_parameter'].sudo()
+        now = fields.Datetime.now()
+        retention = int(params.get_param('quiz_engine_pro.session_retention_days', DEFAULT_RETENTION_DAYS))
+        closed_retention = int(params.get_param('quiz_engine_pro.closed_quiz_retention_days',
+                                                DEFAULT_CLOSED_RETENTION_DAYS))
+        where = """
+            s.state IN ('completed', 'expired')
+            AND (COALESCE(s.end_time, s.create_date) < %(cutoff)s
+                 OR (q.published IS NOT TRUE AND COALESCE(s.end_time, s.create_date) < %(closed_cutoff)s))
+        """
+        return where, {
+            'cutoff': now - timedelta(days=retention),
+            'closed_cutoff': now - timedelta(days=closed_retention),
+        }
+
+    @api.model
+    def _archive_sessions(self, batch_size=DEFAULT_BATCH_SIZE, max_batches=None, commit=False):
+        """Move due sessions and their responses to the archive tables.
+
+        Works in batches of ``batch_size`` sessions, each moved with three
+        set-based statements (copy sessions, copy responses, delete the
+        originals, whose responses go with them through the cascade). Rows
+        locked by a running quiz are skipped, and so are sessions still
+        queued for the leaderboard. Archived sessions stay ranked: the
+        leaderboard entries are renamed to their archive rows in the same
+        transaction (see ``quiz.leaderboard._rename_archived_entries``).
+        With ``commit`` every batch is committed on its own, so an
+        interrupted run keeps its progress. Returns the number of sessions
+        archived.
+        """
+        self.env.flush_all()
+        cr = self.env.cr
+        where, params = self._get_archive_domain_sql()
+        columns = ', '.join(SESSION_COLUMNS)
+        archived = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            cr.execute("""
+                SELECT s.id
+                  FROM quiz_session s
+                  JOIN quiz_quiz q ON q.id = s.quiz_id
+                 WHERE %s
+                   AND NOT EXISTS (SELECT 1 FROM quiz_leaderboard_delta d WHERE d.session_id = s.id)
+              ORDER BY s.id
+                 LIMIT %%(limit)s
+                   FOR UPDATE OF s SKIP LOCKED
+            """ % where, dict(params, limit=batch_size))
+            session_ids = tuple(row[0] for row in cr.fetchall())
+            if not session_ids:
+                break
+            cr.execute("""
+                INSERT INTO quiz_session_archive (session_ref, %(columns)s, archive_date, write_uid, write_date)
+                SELECT id, %(columns)s, now() at time zone 'UTC', %%(uid)s, now() at time zone 'UTC'
+                  FROM quiz_session
+                 WHERE id IN %%(ids)s
+             RETURNING id, session_ref, quiz_id
+            """ % {'columns': columns}, {'uid': self.env.uid, 'ids': session_ids})
+            refs_by_quiz = {}
+            for archive_id, session_ref, quiz_id in cr.fetchall():
+                refs_by_quiz.setdefault(quiz_id, {})[session_ref] = archive_id
+            cr.execute("""
+                INSERT INTO quiz_response_archive (session_archive_id, question_id, answer_value, score, is_correct,
+                                                   create_uid, create_date, write_uid, write_date)
+                SELECT a.id, r.question_id, r.answer_value, r.score, r.is_correct,
+                       r.create_uid, r.create_date, r.write_uid, r.write_date
+                  FROM quiz_response r
+                  JOIN quiz_session_archive a ON a.session_ref = r.session_id
+                 WHERE r.session_id IN %s
+            """, [session_ids])
+            cr.execute("DELETE FROM quiz_session WHERE id IN %s", [session_ids])
+            self.env['quiz.leaderboard'].sudo()._rename_archived_entries(refs_by_quiz)
+            archived += len(session_ids)
+            batches += 1
+            if commit:
+                cr.commit()
+            _logger.info("Archived %d quiz sessions (%d batches)", archived, batches)
+        if archived:
+            self.env['quiz.session'].invalidate_model()
+            self.env['quiz.response'].invalidate_model()
+            self.env['quiz.quiz'].invalidate_model(['session_ids'])
+        return archived
+
+    @api.model
+    def _cron_archive_sessions(self):
+        params = self.env['ir.config_parameter'].sudo()
+        batch_size = int(params.get_param('quiz_engine_pro.archive_batch_size', DEFAULT_BATCH_SIZE))
+        max_batches = int(params.get_param('quiz_engine_pro.archive_max_batches', DEFAULT_MAX_BATCHES))
+        return self._archive_sessions(batch_size=batch_size, max_batches=max_batches, commit=True)
+
+
+class QuizResponseArchive(models.Model):
+    _name = 'quiz.response.archive'
+    _description = 'Archived Quiz Response'
+
+    session_archive_id = fields.Many2one('quiz.session.archive', string='Session', required=True,
+                                         ondelete='cascade', index=True, readonly=True)
+    question_id = fields.Many2one('quiz.question', string='Question', required=True, ondelete='cascade',
+                                  readonly=True)
+    answer_value = fields.Json(string='Answer Value', readonly=True)
+    score = fields.Float(string='Score', readonly=True)
+    is_correct = fields.Boolean(string='Is Correct', readonly=True)
+
+    def _get_answer(self):
+        """Decoded answer value, as posted by the quiz front-end"""
+        self.ensure_one()
+        return decode_answer(self.question_id.type, self.answer_value)
+
+
+class QuizSessionHistory(models.Model):
+    """Live and archived session results in one reporting model"""
+    _name = 'quiz.session.history'
+    _description = 'Quiz Session History'
+    _auto = False
+    _order = 'end_time desc'
+
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', readonly=True)
+    user_id = fields.Many2one('res.users', string='User', readonly=True)
+    participant_name = fields.Char(string='Participant Name', readonly=True)
+    mode_id = fields.Many2one('quiz.mode', string='Mode', readonly=True)
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('in_progress', 'In Progress'),
+        ('completed', 'Completed'),
+        ('expired', 'Expired'),
+    ], string='State', readonly=True)
+    end_time = fields.Datetime(string='End Time', readonly=True)
+    total_score = fields.Float(string='Total Score', readonly=True, group_operator='avg')
+    percentage = fields.Float(string='Percentage', readonly=True, group_operator='avg')
+    passed = fields.Boolean(string='Passed', readonly=True)
+    archived = fields.Boolean(string='Archived', readonly=True)
+
+    def init(self):
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        # Archived rows get negative ids so both halves of the union keep unique ids
+        self.env.cr.execute("""
+            CREATE OR REPLACE VIEW %s AS (
+                SELECT s.id, s.quiz_id, s.user_id, s.participant_name, s.mode_id, s.state,
+                       COALESCE(s.end_time, s.create_date) AS end_time,
+                       s.total_score, s.percentage, s.passed, FALSE AS archived
+                  FROM quiz_session s
+                UNION ALL
+                SELECT -a.id, a.quiz_id, a.user_id, a.participant_name, a.mode_id, a.state,
+                       COALESCE(a.end_time, a.create_date) AS end_time,
+                       a.total_score, a.percentage, a.passed, TRUE AS archived
+                  FROM quiz_session_archive a
+            )
+        """ % self._table)
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    archived_session_count = fields.Integer(string='Archived Sessions', compute='_compute_archived_session_count')
+
+    def _compute_archived_session_count(self):
+        data = self.env['quiz.session.archive'].sudo()._read_group(
+            [('quiz_id', 'in', self.ids)], ['quiz_id'], ['__count'])
+        counts = {quiz.id: count for quiz, count in data}
+        for quiz in self:
+            quiz.archived_session_count = counts.get(quiz.id, 0)
@@ -0,0 +1,121 @@
+from odoo import models, fields, api
+
+
+def attempt_identity(user, email=None):
+    """Who an attempt is counted against: the user when logged in, else the e-mail; None when anonymous"""
+    if not user._is_public():
+        return 'user:%d' % user.id
+    email = (email or '').strip().lower()
+    return 'email:%s' % email if email else None
+
+
+class QuizAttemptLedger(models.Model):
+    """Attempts per quiz and participant, one counter row each.
+
+    The counter is claimed with a single UPSERT, so the attempt check costs
+    one indexed statement and concurrent starts of the same participant are
+    serialized on the row instead of counting quiz.session rows.
+    """
+    _name = 'quiz.attempt.ledger'
+    _description = 'Quiz Attempt Ledger'
+    _order = 'last_attempt desc'
+
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', required=True, ondelete='cascade')
+    identity = fields.Char(string='Participant', required=True, readonly=True,
+                           help='user:<id> for logged-in users, email:<address> for identified anonymous participants.')
+    attempt_count = fields.Integer(string='Attempts', readonly=True)
+    last_attempt = fields.Datetime(string='Last Attempt', readonly=True)
+
+    _sql_constraints = [
+        ('quiz_identity_unique', 'unique(quiz_id, identity)', 'One ledger row per quiz and participant.'),
+    ]
+
+    @api.model
+    def _claim_attempt(self, quiz, identity):
+        """Count one more attempt for ``identity``; False, without counting, when its attempts are used up"""
+        if not identity:
+            return True
+        max_attempts = quiz.max_attempts or 0
+        self.env.cr.execute("""
+            INSERT INTO quiz_attempt_ledger AS ledger (quiz_id, identity, attempt_count, last_attempt,
+                                                       create_uid, create_date, write_uid, write_date)
+            VALUES (%(quiz)s, %(identity)s, 1, now() at time zone 'UTC',
+                    %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC')
+            ON CONFLICT (quiz_id, identity) DO UPDATE
+               SET attempt_count = ledger.attempt_count + 1,
+                   last_attempt = EXCLUDED.last_attempt,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+             WHERE %(max)s <= 0 OR ledger.attempt_count < %(max)s
+         RETURNING attempt_count
+        """, {'quiz': quiz.id, 'identity': identity, 'uid': self.env.uid, 'max': max_attempts})
+        claimed = self.env.cr.fetchone()
+        self.invalidate_model(['attempt_count', 'last_attempt'])
+        return bool(claimed)
+
+    @api.model
+    def _get_attempt_count(self, quiz, identity):
+        if not identity:
+            return 0
+        ledger = self.search([('quiz_id', '=', quiz.id), ('identity', '=', identity)], limit=1)
+        return ledger.attempt_count
+
+
+class QuizSubmissionKey(models.Model):
+    """Client-generated key of a start or submit POST.
+
+    The first request with a key inserts it and creates the session; replays
+    of the same key (double clicks, client retries) wait on the unique index
+    for that transaction and are then sent to the session it created. Under
+    REPEATABLE READ a replay racing the first request fails to serialize,
+    which the HTTP layer retries with a snapshot that sees the key.
+    """
+    _name = 'quiz.submission.key'
+    _description = 'Quiz Submission Idempotency Key'
+    _log_access = False
+
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', required=True, ondelete='cascade')
+    key = fields.Char(string='Key', required=True)
+    session_id = fields.Many2one('quiz.session', string='Session', ondelete='cascade')
+    create_date = fields.Datetime(string='Created', default=fields.Datetime.now)
+
+    _sql_constraints = [
+        ('quiz_key_unique', 'unique(quiz_id, key)', 'Submission keys are unique per quiz.'),
+    ]
+
+    @api.model
+    def _claim(self, quiz, key):
+        """(claimed, session): claimed is True for the first request with this key, else the session it created"""
+        if not key:
+            return True, self.env['quiz.session']
+        cr = self.env.cr
+        cr.execute("""
+            INSERT INTO quiz_submission_key (quiz_id, key, create_date)
+            VALUES (%s, %s, now() at time zone 'UTC')
+            ON CONFLICT (quiz_id, key) DO NOTHING
+            RETURNING id
+        """, [quiz.id, key[:64]])
+        if cr.fetchone():
+            return True, self.env['quiz.session']
+        cr.execute("SELECT session_id FROM quiz_submission_key WHERE quiz_id = %s AND key = %s", [quiz.id, key[:64]])
+        row = cr.fetchone()
+        return False, self.env['quiz.session'].browse(row and row[0] or [])
+
+    @api.model
+    def _bind(self, quiz, key, session):
+        if key:
+            self.env.cr.execute(
+                "UPDATE quiz_submission_key SET session_id = %s WHERE quiz_id = %s AND key = %s",
+                [session.id, quiz.id, key[:64]])
+
+    @api.autovacuum
+    def _gc_keys(self):
+        # Replays come within seconds; a day of keys is plenty
+        self.env.cr.execute(
+            "DELETE FROM quiz_submission_key WHERE create_date < now() at time zone 'UTC' - interval '1 day'")
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    attempt_ledger_ids = fields.One2many('quiz.attempt.ledger', 'quiz_id', string='Attempt Ledger')
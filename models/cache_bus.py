@@ -0,0 +1,246 @@
+"""Cross-worker invalidation of the module's in-process caches.
+
+Writes to quizzes, questions and their children bump the quiz's
+content_version (see content_version.py); that bump, like writes to question
+categories and quiz modes, is broadcast on a Postgres ``LISTEN/NOTIFY``
+channel. Notifications are delivered at commit, only for committed data.
+Every worker process runs one listener thread per database which applies the
+events to its ``HotCache``; until the listener is connected, or after it
+lost its connection, the cache is bypassed, so a missed event can never
+leave a worker serving stale entries.
+
+The writing process applies its own events right after the commit, without
+waiting for the round trip through the database; a rolled back transaction
+applies nothing.
+"""
+from odoo import models, api
+import odoo
+import odoo.modules.module
+import functools
+import json
+import logging
+import os
+import select
+import threading
+import time
+
+_logger = logging.getLogger(__name__)
+
+CHANNEL = 'quiz_engine_pro_invalidation'
+# Above this many ids an event invalidates the whole model (NOTIFY payloads are limited to 8000 bytes)
+MAX_EVENT_IDS = 200
+POLL_TIMEOUT = 50
+RETRY_DELAY = 5
+
+# Cache namespaces and the models whose events clear them
+NAMESPACE_MODELS = {
+    'visibility': ('quiz.question.category',),
+    'mode': ('quiz.mode',),
+}
+
+
+class HotCache:
+    """Process-local cache of small, frequently read values, per database and namespace.
+
+    Entries may carry the content_version of the quiz they were computed
+    from; once a newer version of that quiz is announced, they are dropped
+    and older versions are refused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+        self._versions = {}
+
+    def get(self, dbname, namespace, key, version=None):
+        with self._lock:
+            entry = self._data.get((dbname, namespace, key))
+        if entry is None or entry[0] != version:
+            return None
+        return entry[1]
+
+    def set(self, dbname, namespace, key, value, version=None, quiz_id=None):
+        with self._lock:
+            if quiz_id is not None and version is not None \
+                    and version < self._versions.get((dbname, quiz_id), version):
+                return
+            self._data[(dbname, namespace, key)] = (version, value)
+
+    def apply(self, dbname, model, ids=None, versions=None):
+        """Apply an invalidation event: ``versions`` maps quiz ids to their new content_version"""
+        with self._lock:
+            for quiz_id, version in (versions or {}).items():
+                key = (dbname, int(quiz_id))
+                self._versions[key] = max(version, self._versions.get(key, version))
+            namespaces = {ns for ns, deps in NAMESPACE_MODELS.items() if model in deps}
+            if model == 'quiz.quiz':
+                # Entries keyed on an older version of these quizzes (of every quiz without versions) are dead
+                stale = {int(quiz_id) for quiz_id in versions} if versions else None
+                for entry_key in [k for k in self._data if k[0] == dbname and isinstance(k[2], tuple) and k[2]
+                                  and (stale is None or k[2][0] in stale)]:
+                    del self._data[entry_key]
+            for entry_key in [k for k in self._data if k[0] == dbname and k[1] in namespaces]:
+                del self._data[entry_key]
+
+    def clear(self, dbname):
+        with self._lock:
+            for entry_key in [k for k in self._data if k[0] == dbname]:
+                del self._data[entry_key]
+            for version_key in [k for k in self._versions if k[0] == dbname]:
+                del self._versions[version_key]
+
+
+hot_cache = HotCache()
+
+
+class _Listener(threading.Thread):
+    def __init__(self, dbname):
+        super().__init__(name='quiz.cache_bus.%s' % dbname, daemon=True)
+        self.dbname = dbname
+        self.live = False
+
+    def run(self):
+        while True:
+            try:
+                self._listen()
+            except Exception:
+                _logger.warning("Quiz cache bus listener on %s lost, retrying in %ss",
+                                self.dbname, RETRY_DELAY, exc_info=True)
+            self.live = False
+            hot_cache.clear(self.dbname)
+            time.sleep(RETRY_DELAY)
+
+    def _listen(self):
+        with odoo.sql_db.db_connect(self.dbname).cursor() as cr:
+            conn = cr._cnx
+            cr.execute('LISTEN "%s"' % CHANNEL)
+            cr.commit()
+            # Anything cached before we were listening may have missed an event
+            hot_cache.clear(self.dbname)
+            self.live = True
+            while True:
+                if select.select([conn], [], [], POLL_TIMEOUT) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    _dispatch(self.dbname, conn.notifies.pop(0).payload)
+
+
+_listeners = {}
+_listeners_lock = threading.Lock()
+
+
+def _dispatch(dbname, payload):
+    try:
+        event = json.loads(payload)
+    except ValueError:
+        return
+    hot_cache.apply(dbname, event.get('model'), event.get('ids'), event.get('versions'))
+
+
+def is_live(dbname):
+    """Whether this process receives the invalidations of ``dbname``; starts the listener on first use"""
+    key = (os.getpid(), dbname)
+    listener = _listeners.get(key)
+    if listener is None:
+        if odoo.tools.config['test_enable'] or odoo.modules.module.current_test:
+            # Test transactions are rolled back without any event: never trust the cache there
+            return False
+        with _listeners_lock:
+            listener = _listeners.get(key)
+            if listener is None:
+                listener = _listeners[key] = _Listener(dbname)
+                listener.start()
+    return listener.live
+
+
+def cache_get(env, namespace, key, version=None):
+    dbname = env.cr.dbname
+    return hot_cache.get(dbname, namespace, key, version) if is_live(dbname) else None
+
+
+def cache_set(env, namespace, key, value, version=None, quiz_id=None):
+    dbname = env.cr.dbname
+    if is_live(dbname):
+        hot_cache.set(dbname, namespace, key, value, version, quiz_id)
+
+
+def notify(env, model, ids=None, versions=None):
+    """Broadcast an invalidation event for ``model`` to every worker once the transaction commits"""
+    if ids is not None and len(ids) > MAX_EVENT_IDS:
+        ids = versions = None
+    event = {'model': model, 'ids': list(ids) if ids is not None else None,
+             'versions': {str(k): v for k, v in (versions or {}).items()}}
+    env.cr.postcommit.add(functools.partial(hot_cache.apply, env.cr.dbname, model, event['ids'], versions))
+    env.cr.execute("SELECT pg_notify(%s, %s)", [CHANNEL, json.dumps(event)])
+
+
+class QuestionCategory(models.Model):
+    _inherit = 'quiz.question.category'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        notify(self.env, self._name, records.ids)
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        notify(self.env, self._name, self.ids)
+        return res
+
+    def unlink(self):
+        ids = self.ids
+        res = super().unlink()
+        notify(self.env, self._name, ids)
+        return res
+
+
+class QuizMode(models.Model):
+    _inherit = 'quiz.mode'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        notify(self.env, self._name, records.ids)
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        notify(self.env, self._name, self.ids)
+        return res
+
+    def unlink(self):
+        ids = self.ids
+        res = super().unlink()
+        notify(self.env, self._name, ids)
+        return res
+
+    @api.model
+    def _get_by_key(self, key):
+        """Mode with the given URL key, resolved from the hot cache"""
+        if not key:
+            return self.browse()
+        mode_id = cache_get(self.env, 'mode', key)
+        if mode_id is None:
+            mode_id = self.search([('key', '=', key)], limit=1).id or 0
+            cache_set(self.env, 'mode', key, mode_id)
+        return self.browse(mode_id or [])
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    def _get_visible_question_ids(self, audience):
+        """Ids of the quiz's questions an ``audience`` ('public' or 'portal') may see, cached per content version"""
+        self.ensure_one()
+        version = self.content_version
+        key = (self.id, audience)
+        visible = cache_get(self.env, 'visibility', key, version)
+        if visible is None:
+            allowed = ('public',) if audience == 'public' else ('public', 'portal')
+            visible = frozenset(self.sudo().question_ids.filtered(
+                lambda q: q.access_mode in allowed
+                or (q.access_mode == 'inherit' and q.category_id and q.category_id.access_mode in allowed)).ids)
+            cache_set(self.env, 'visibility', key, visible, version, self.id)
+        return visible
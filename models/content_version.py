@@ -0,0 +1,207 @@
+from odoo import models, fields, api
+import logging
+
+from .cache_bus import notify
+
+_logger = logging.getLogger(__name__)
+
+
+class QuizContentMixin(models.AbstractModel):
+    """Bump the owning quiz's content version whenever delivered content changes.
+
+    Every model whose data ends up in a delivered/graded quiz inherits this mixin
+    and implements ``_get_content_quizzes``. Caches keyed on
+    ``quiz.quiz.content_version`` can then never serve stale content. Writes
+    only bump the version when they touch ``_get_content_fields``.
+    """
+    _name = 'quiz.content.mixin'
+    _description = 'Quiz Content Versioning'
+
+    def _get_content_quizzes(self):
+        """Return the quiz.quiz records whose content includes these records"""
+        return self.env['quiz.quiz']
+
+    def _get_content_fields(self):
+        """Fields that end up in the delivered (or graded) content: changing them bumps the version.
+
+        Every stored field by default; models that also hold settings read
+        live narrow it down, like ``quiz.quiz._get_content_fields``.
+        """
+        return [name for name, field in self._fields.items() if field.store and name not in models.MAGIC_COLUMNS]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._get_content_quizzes()._bump_content_version()
+        return records
+
+    def write(self, vals):
+        if not set(vals) & set(self._get_content_fields()):
+            return super().write(vals)
+        quizzes = self._get_content_quizzes()
+        res = super().write(vals)
+        # The owner may have changed (e.g. a question moved to another quiz)
+        (quizzes | self._get_content_quizzes())._bump_content_version()
+        return res
+
+    def unlink(self):
+        quizzes = self._get_content_quizzes()
+        res = super().unlink()
+        quizzes.exists()._bump_content_version()
+        return res
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    content_version = fields.Integer(string='Content Version', default=1, readonly=True, copy=False,
+                                     help='Incremented whenever the delivered content of the quiz or any of its questions change. '
+                                          'Used as cache key for delivery and grading.')
+
+    def write(self, vals):
+        res = super().write(vals)
+        if set(vals) & set(self._get_content_fields()):
+            self._bump_content_version()
+        return res
+
+    def _get_content_fields(self):
+        """Quiz fields that end up in the delivered (or graded) content: changing them bumps the version.
+
+        The delivery header carries name, slug and time limit; question_ids
+        covers questions added or removed through the quiz form. Settings
+        such as published, max_attempts or async_grading are read live and
+        must not invalidate the version-keyed caches.
+        """
+        return ['name', 'slug', 'time_limit', 'question_ids']
+
+    def _bump_content_version(self):
+        """Increment content_version without going through write() (no write_date churn, no recursion)"""
+        if not self.ids:
+            return
+        self.env.cr.execute(
+            "UPDATE quiz_quiz SET content_version = COALESCE(content_version, 0) + 1 WHERE id IN %s"
+            " RETURNING id, content_version",
+            [tuple(self.ids)],
+        )
+        versions = dict(self.env.cr.fetchall())
+        self.invalidate_recordset(['content_version'])
+        # Tell every worker's hot caches about the new versions
+        notify(self.env, 'quiz.quiz', list(versions), versions)
+
+
+class Question(models.Model):
+    _name = 'quiz.question'
+    _inherit = ['quiz.question', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('quiz_id')
+
+    def _get_content_fields(self):
+        """Access rules and difficulty decide who gets a question, not what it contains"""
+        settings = {'difficulty_level', 'category_id', 'access_mode', 'allowed_group_ids',
+                    'is_public', 'is_portal', 'is_invited_only'}
+        return [name for name in super()._get_content_fields() if name not in settings]
+
+
+class Choice(models.Model):
+    _name = 'quiz.choice'
+    _inherit = ['quiz.choice', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('question_id.quiz_id')
+
+
+class MatchPair(models.Model):
+    _name = 'quiz.match.pair'
+    _inherit = ['quiz.match.pair', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('question_id.quiz_id')
+
+
+class DragToken(models.Model):
+    _name = 'quiz.drag.token'
+    _inherit = ['quiz.drag.token', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('question_id.quiz_id')
+
+
+class FillBlankAnswer(models.Model):
+    _name = 'quiz.fill.blank.answer'
+    _inherit = ['quiz.fill.blank.answer', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('question_id.quiz_id')
+
+
+class QuizBlank(models.Model):
+    _name = 'quiz.blank'
+    _inherit = ['quiz.blank', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('question_id.quiz_id')
+
+
+class QuizOption(models.Model):
+    _name = 'quiz.option'
+    _inherit = ['quiz.option', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('blank_id.question_id.quiz_id')
+
+
+class SequenceItem(models.Model):
+    _name = 'quiz.sequence.item'
+    _inherit = ['quiz.sequence.item', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('question_id.quiz_id')
+
+
+class MatrixRow(models.Model):
+    _name = 'quiz.matrix.row'
+    _inherit = ['quiz.matrix.row', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('question_id.quiz_id')
+
+
+class MatrixColumn(models.Model):
+    _name = 'quiz.matrix.column'
+    _inherit = ['quiz.matrix.column', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('question_id.quiz_id')
+
+
+class MatrixCell(models.Model):
+    _name = 'quiz.matrix.cell'
+    _inherit = ['quiz.matrix.cell', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('row_id.question_id.quiz_id')
+
+
+class Passage(models.Model):
+    _name = 'quiz.passage'
+    _inherit = ['quiz.passage', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('question_id.quiz_id')
+
+
+class PassageSubQuestion(models.Model):
+    _name = 'quiz.passage.sub.question'
+    _inherit = ['quiz.passage.sub.question', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('passage_id.question_id.quiz_id')
+
+
+class PassageChoice(models.Model):
+    _name = 'quiz.passage.choice'
+    _inherit = ['quiz.passage.choice', 'quiz.content.mixin']
+
+    def _get_content_quizzes(self):
+        return self.mapped('sub_question_id.passage_id.question_id.quiz_id')
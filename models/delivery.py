@@ -0,0 +1,205 @@
+from odoo import models, tools
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Compact separators: the payload is machine-read only
+JSON_SEPARATORS = (',', ':')
+
+
+def _dumps(value):
+    return json.dumps(value, separators=JSON_SEPARATORS, ensure_ascii=False)
+
+
+def order_right_items(items):
+    """Right-hand match items ({'id', 'text'}, in authoring order) in the order they are shown.
+
+    Sorted by text; when that is the authoring order, the list is rotated so
+    that no item sits on the row of its prompt.
+    """
+    ordered = sorted(items, key=lambda r: (r['text'] or '').lower())
+    if len(ordered) > 1 and ordered == list(items):
+        ordered = ordered[1:] + ordered[:1]
+    return ordered
+
+
+class QuizDelivery(models.Model):
+    _inherit = 'quiz.quiz'
+
+    def _get_delivery_fragments(self):
+        """Return the cached, pre-serialized delivery fragments for the current content version"""
+        self.ensure_one()
+        return self._build_delivery_fragments(self.content_version)
+
+    @tools.ormcache('self.id', 'version')
+    def _build_delivery_fragments(self, version):
+        """Serialize every question of the quiz for client-side rendering, answer keys stripped.
+
+        Runs a fixed number of queries (one per child model) whatever the size of
+        the quiz. The result is cached per (quiz, content_version) and must be
+        treated as read-only: ``{'quiz': str, 'questions': {question_id: str}}``
+        where each value is a compact JSON document.
+        """
+        self.ensure_one()
+        quiz = self.sudo()
+        questions = quiz.question_ids.read([
+            'type', 'name', 'question_html', 'text_template', 'points', 'sequence',
+        ])
+        by_id = {}
+        for q in questions:
+            data = {
+                'id': q['id'],
+                'type': q['type'],
+                'name': q['name'],
+                'html': q['question_html'] or '',
+                'points': q['points'],
+            }
+            if q['type'] == 'dropdown_blank':
+                data['text_template'] = q['text_template'] or ''
+            by_id[q['id']] = data
+        question_ids = list(by_id)
+        if question_ids:
+            self._delivery_add_children(by_id, question_ids)
+        header = {
+            'id': quiz.id,
+            'name': quiz.name,
+            'slug': quiz.slug,
+            'time_limit': quiz.time_limit,
+            'version': version,
+        }
+        return {
+            'quiz': _dumps(header),
+            'questions': {qid: _dumps(data) for qid, data in by_id.items()},
+        }
+
+    def _delivery_add_children(self, by_id, question_ids):
+        """Attach the display data of all child records to the question dicts in by_id"""
+        env = self.env
+        types = {data['type'] for data in by_id.values()}
+        domain = [('question_id', 'in', question_ids)]
+
+        if types & {'mcq_single', 'mcq_multiple'}:
+            for c in env['quiz.choice'].sudo().search_read(domain, ['question_id', 'text']):
+                by_id[c['question_id'][0]].setdefault('choices', []).append({'id': c['id'], 'text': c['text']})
+
+        if 'match' in types:
+            rows = env['quiz.match.pair'].sudo().search_read(domain, ['question_id', 'left_text', 'right_text'])
+            # Right-hand items carry opaque ids: the pair id would tell which prompt they answer
+            right_keys = env['quiz.match.pair'].browse([p['id'] for p in rows])._get_right_keys()
+            for p in rows:
+                pairs = by_id[p['question_id'][0]].setdefault('pairs', {'left': [], 'right': []})
+                pairs['left'].append({'id': p['id'], 'text': p['left_text']})
+                pairs['right'].append({'id': right_keys[p['id']], 'text': p['right_text']})
+            for data in by_id.values():
+                if 'pairs' in data:
+                    data['pairs']['right'] = order_right_items(data['pairs']['right'])
+
+        if types & {'drag_text', 'drag_zone', 'sentence_completion'}:
+            for t in env['quiz.drag.token'].sudo().search_read(domain, ['question_id', 'text']):
+                by_id[t['question_id'][0]].setdefault('tokens', []).append({'id': t['id'], 'text': t['text']})
+
+        if 'fill_blank' in types:
+            for b in env['quiz.fill.blank.answer'].sudo().search_read(domain, ['question_id', 'blank_number']):
+                by_id[b['question_id'][0]].setdefault('blanks', []).append(b['blank_number'])
+
+        if 'dropdown_blank' in types:
+            blanks = env['quiz.blank'].sudo().search_read(domain, ['question_id', 'blank_number', 'input_type'])
+            blank_map = {}
+            for b in blanks:
+                blank = {'id': b['id'], 'number': b['blank_number'], 'input_type': b['input_type'], 'options': []}
+                blank_map[b['id']] = blank
+                by_id[b['question_id'][0]].setdefault('dropdowns', []).append(blank)
+            if blank_map:
+                options = env['quiz.option'].sudo().search_read(
+                    [('blank_id', 'in', list(blank_map))], ['blank_id', 'label'])
+                for o in options:
+                    blank_map[o['blank_id'][0]]['options'].append({'id': o['id'], 'label': o['label']})
+
+        if 'step_sequence' in types:
+            # quiz.sequence.item is ordered by correct_position: re-order by authoring sequence
+            items = env['quiz.sequence.item'].sudo().search_read(
+                domain, ['question_id', 'label', 'content'], order='sequence, id')
+            for s in items:
+                by_id[s['question_id'][0]].setdefault('steps', []).append(
+                    {'id': s['id'], 'label': s['label'], 'content': s['content'] or ''})
+
+        if 'matrix' in types:
+            for model, key in (('quiz.matrix.row', 'rows'), ('quiz.matrix.column', 'columns')):
+                for r in env[model].sudo().search_read(domain, ['question_id', 'name', 'description']):
+                    matrix = by_id[r['question_id'][0]].setdefault('matrix', {'rows': [], 'columns': []})
+                    matrix[key].append({'id': r['id'], 'name': r['name'], 'description': r['description'] or ''})
+
+        if 'passage' in types:
+            passages = env['quiz.passage'].sudo().search_read(domain, ['question_id', 'name', 'passage_content'])
+            passage_map = {}
+            for p in passages:
+                passage = {'id': p['id'], 'name': p['name'], 'content': p['passage_content'] or '', 'sub_questions': []}
+                passage_map[p['id']] = passage
+                by_id[p['question_id'][0]].setdefault('passages', []).append(passage)
+            if passage_map:
+                subs = env['quiz.passage.sub.question'].sudo().search_read(
+                    [('passage_id', 'in', list(passage_map))],
+                    ['passage_id', 'question_text', 'question_type', 'points'])
+                sub_map = {}
+                for s in subs:
+                    sub = {'id': s['id'], 'type': s['question_type'], 'html': s['question_text'] or '',
+                           'points': s['points']}
+                    if s['question_type'] in ('mcq_single', 'mcq_multiple'):
+                        sub['choices'] = []
+                        sub_map[s['id']] = sub
+                    passage_map[s['passage_id'][0]]['sub_questions'].append(sub)
+                if sub_map:
+                    choices = env['quiz.passage.choice'].sudo().search_read(
+                        [('sub_question_id', 'in', list(sub_map))], ['sub_question_id', 'text'])
+                    for c in choices:
+                        sub_map[c['sub_question_id'][0]]['choices'].append({'id': c['id'], 'text': c['text']})
+
+
+class QuizSessionDelivery(models.Model):
+    _inherit = 'quiz.session'
+
+    def _get_delivery_question_ids(self):
+        """Question ids of the session's plan, in delivery order"""
+        self.ensure_one()
+        quiz_question_ids = self.quiz_id.question_ids.ids
+        if self.question_order:
+            allowed = set(quiz_question_ids)
+            ordered = [int(x) for x in self.question_order.split(',') if x]
+            ordered = [qid for qid in ordered if qid in allowed]
+            if ordered:
+                return ordered
+        return quiz_question_ids
+
+    def _get_delivery_fragments(self):
+        """Delivery fragments for this session (see quiz.quiz._get_delivery_fragments)"""
+        self.ensure_one()
+        return self.quiz_id._get_delivery_fragments()
+
+    def _get_delivery_payload(self, question_ids=None, extra=None):
+        """Return the session's full question plan as a compact JSON string.
+
+        Question fragments come pre-serialized from the per-version cache, so this
+        only joins strings and never re-reads question content. ``extra`` adds
+        top-level keys to the document.
+        """
+        self.ensure_one()
+        fragments = self._get_delivery_fragments()
+        if question_ids is None:
+            question_ids = self._get_delivery_question_ids()
+        questions = self._get_question_fragments(fragments, question_ids)
+        session = {
+            'token': self.session_token,
+            'state': self.state,
+            'mode': self.mode_id.key if self.mode_id else None,
+            'time_limit_end': self.time_limit_end.isoformat() if self.time_limit_end else None,
+            'show_rationales': self.show_rationales,
+            'immediate_feedback': self.immediate_feedback,
+        }
+        extra_json = ''.join(',%s:%s' % (_dumps(key), _dumps(value)) for key, value in (extra or {}).items())
+        return '{"quiz":%s,"session":%s,"questions":[%s]%s}' % (
+            fragments['quiz'], _dumps(session), ','.join(questions), extra_json)
+
+    def _get_question_fragments(self, fragments, question_ids):
+        """Serialized questions of the plan, in order; hook for per-session adjustments of the shared fragments"""
+        return [fragments['questions'][qid] for qid in question_ids if qid in fragments['questions']]
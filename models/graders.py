@@ -0,0 +1,294 @@
+"""Pure graders of compiled answer keys.
+
+Nothing here imports Odoo: re-grade worker processes import this module
+(and the text matcher and answer codec it uses) without loading the
+registry or the rest of the addon, see ``regrade.py``.
+"""
+from .answer_codec import decode_answer
+from .text_matcher import get_matcher, normalize_text
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def _load(answer_data):
+    """Decode a JSON string answer, returning other values unchanged"""
+    if isinstance(answer_data, str):
+        return json.loads(answer_data)
+    return answer_data
+
+
+def _grade_mcq_single(key, answer_data):
+    if not answer_data or answer_data in ('null', 'None', None, ''):
+        return 0.0
+    try:
+        selected_choice_id = int(answer_data)
+    except (ValueError, TypeError):
+        return 0.0
+    if key['correct'] and selected_choice_id == key['correct']:
+        return key['points']
+    return 0.0
+
+
+def _grade_mcq_multiple(key, answer_data):
+    if not answer_data:
+        return 0.0
+    try:
+        selected_ids = {int(x) for x in _load(answer_data) if x}
+    except Exception:
+        return 0.0
+    if selected_ids == set(key['correct']):
+        return key['points']
+    return 0.0
+
+
+def _grade_fill_blank(key, answer_data):
+    if not answer_data:
+        return 0.0
+    try:
+        answers = _load(answer_data)
+    except Exception:
+        return 0.0
+    blanks = key['blanks']
+    if not blanks or not isinstance(answers, dict):
+        return 0.0
+    correct_count = 0
+    for blank_number, correct_answer in blanks.items():
+        user_answer = answers.get(blank_number)
+        if user_answer is None:
+            continue
+        user_answer = str(user_answer).strip().lower()
+        if user_answer in ('', 'null', 'none'):
+            continue
+        if user_answer == correct_answer:
+            correct_count += 1
+    return (correct_count / len(blanks)) * key['points']
+
+
+def _grade_match(key, answer_data):
+    if not answer_data:
+        return 0.0
+    try:
+        matches = _load(answer_data)
+    except Exception:
+        return 0.0
+    pairs = key['pairs']
+    if not pairs:
+        return 0.0
+    correct_count = 0
+    if isinstance(matches, list):
+        for entry in matches:
+            if not isinstance(entry, dict):
+                continue
+            left_text = pairs.get(str(entry.get('left_id')))
+            right_text = pairs.get(str(entry.get('right_id')))
+            if left_text is not None and right_text is not None and left_text == right_text:
+                correct_count += 1
+    elif isinstance(matches, dict):
+        for pair_id in pairs:
+            left_key = f"left_{pair_id}"
+            right_key = f"right_{pair_id}"
+            if left_key in matches and right_key in matches:
+                if matches[left_key].strip().lower() == matches[right_key].strip().lower():
+                    correct_count += 1
+    return (correct_count / len(pairs)) * key['points']
+
+
+def _grade_drag_drop(key, answer_data):
+    if not answer_data:
+        return 0.0
+    try:
+        placements = _load(answer_data)
+    except Exception:
+        return 0.0
+    tokens = key['tokens']
+    if not tokens:
+        return 0.0
+    correct_count = 0
+    if isinstance(placements, list):
+        zone_to_token_id = {}
+        for entry in placements:
+            if not isinstance(entry, dict):
+                continue
+            z = entry.get('zone')
+            tid = entry.get('token_id')
+            if isinstance(z, int) and isinstance(tid, int):
+                zone_to_token_id[z] = tid
+                zone_to_token_id[z - 1] = tid
+        for token_id, position, _text in tokens:
+            if zone_to_token_id.get(position) == token_id or zone_to_token_id.get(position + 1) == token_id:
+                correct_count += 1
+    elif isinstance(placements, dict):
+        for _token_id, position, text in tokens:
+            if placements.get(str(position)) == text or placements.get(str(position + 1)) == text:
+                correct_count += 1
+    return (correct_count / len(tokens)) * key['points']
+
+
+def _grade_sentence_completion(key, answer_data):
+    if not answer_data:
+        return 0.0
+    try:
+        placement_data = _load(answer_data)
+    except Exception:
+        return 0.0
+    total_blanks = key['blanks']
+    if not total_blanks:
+        return 0.0
+    positions = key['positions']
+    correct_count = 0
+    processed_blanks = set()
+    for placement in placement_data:
+        if 'zone_id' not in placement or 'token_id' not in placement:
+            continue
+        zone_id = placement['zone_id']
+        if zone_id in processed_blanks:
+            continue
+        processed_blanks.add(zone_id)
+        if positions.get(zone_id) == int(placement['token_id']):
+            correct_count += 1
+    return (correct_count / total_blanks) * key['points']
+
+
+def _grade_matrix(key, answer_data):
+    if not answer_data:
+        return 0.0
+    try:
+        answers = _load(answer_data)
+    except Exception:
+        return 0.0
+    cells = key['cells']
+    if not cells or not isinstance(answers, dict):
+        return 0.0
+    correct_count = sum(1 for cell_key, expected in cells.items()
+                        if cell_key in answers and answers[cell_key] == expected)
+    return (correct_count / len(cells)) * key['points']
+
+
+def _grade_dropdown_blank(key, answer_data):
+    if not answer_data:
+        return 0.0
+    try:
+        answers = _load(answer_data)
+    except Exception:
+        return 0.0
+    if not key['blanks']:
+        return 0.0
+    correct = key['correct']
+    correct_count = 0
+    for entry in answers:
+        if 'blank_id' not in entry or 'option_id' not in entry:
+            continue
+        if correct.get(str(entry['option_id'])) == entry['blank_id']:
+            correct_count += 1
+    return (correct_count / key['blanks']) * key['points']
+
+
+def _grade_step_sequence(key, answer_data):
+    if not answer_data:
+        return 0.0
+    try:
+        data = _load(answer_data)
+    except Exception:
+        return 0.0
+    positions = key['positions']
+    if not positions:
+        return 0.0
+    user_sequence = {}
+    for entry in data:
+        step_id = entry.get('step_id')
+        position = entry.get('position')
+        if step_id is not None and position is not None:
+            user_sequence[str(step_id)] = position
+    correct_count = sum(1 for step_id, position in positions.items() if user_sequence.get(step_id) == position)
+    return (correct_count / len(positions)) * key['points']
+
+
+def _grade_passage_text(sub_type, points, text_key, answer_data):
+    if not answer_data or not isinstance(answer_data, str):
+        return 0.0
+    user_answer = normalize_text(answer_data)
+    keywords = text_key['keywords']
+    matcher = get_matcher(tuple(keywords), text_key.get('fuzzy', 0)) if keywords else None
+    if sub_type == 'text_short':
+        if user_answer == text_key['exact'] or (matcher and matcher.any(user_answer)):
+            return points
+    elif matcher:
+        return (matcher.count(user_answer) / len(keywords)) * points
+    return 0.0
+
+
+def _grade_passage(key, answer_data):
+    if not answer_data:
+        return 0.0
+    try:
+        answers = _load(answer_data)
+    except Exception:
+        return 0.0
+    if not key['total'] or not isinstance(answers, dict):
+        return 0.0
+    earned_points = 0.0
+    for sub_id, (sub_type, points, sub_key) in key['subs'].items():
+        # Accept keys either as raw id ("123") or prefixed ("sub_q_123")
+        sub_answer = answers.get(sub_id)
+        if sub_answer is None:
+            sub_answer = answers.get('sub_q_' + sub_id)
+        if not sub_answer:
+            continue
+        if sub_type == 'mcq_single':
+            try:
+                if sub_key and int(sub_answer) == sub_key:
+                    earned_points += points
+            except (ValueError, TypeError):
+                continue
+        elif sub_type == 'mcq_multiple':
+            try:
+                if {int(x) for x in sub_answer if x} == set(sub_key):
+                    earned_points += points
+            except (ValueError, TypeError):
+                continue
+        elif sub_type in ('text_short', 'text_long'):
+            earned_points += _grade_passage_text(sub_type, points, sub_key, sub_answer)
+    # Scale the points to the question's total points
+    return (earned_points / key['total']) * key['points']
+
+
+GRADERS = {
+    'mcq_single': _grade_mcq_single,
+    'mcq_multiple': _grade_mcq_multiple,
+    'fill_blank': _grade_fill_blank,
+    'match': _grade_match,
+    'drag_zone': _grade_drag_drop,
+    'drag_text': _grade_drag_drop,
+    'sentence_completion': _grade_sentence_completion,
+    'matrix': _grade_matrix,
+    'dropdown_blank': _grade_dropdown_blank,
+    'step_sequence': _grade_step_sequence,
+    'passage': _grade_passage,
+}
+
+
+def grade(key, answer_data):
+    """Grade an answer against a compiled answer key.
+
+    Pure function of its arguments (no ORM access), so it can run against
+    immutable snapshot keys or in worker processes.
+    """
+    grader = GRADERS.get(key['type'])
+    if not grader:
+        return 0.0
+    try:
+        return float(grader(key, answer_data) or 0.0)
+    except Exception as e:
+        _logger.error("Error grading answer for key type %s: %s", key['type'], e)
+        return 0.0
+
+
+def regrade_rows(keys, rows):
+    """Grade (response_id, question_id, key_ref, answer_value, old_score) rows against ``keys`` by key_ref.
+
+    Returns (response_id, question_id, old_score, new_score) rows.
+    """
+    return [(rid, qid, old_score, grade(keys[ref], decode_answer(keys[ref]['type'], stored)))
+            for rid, qid, ref, stored, old_score in rows]
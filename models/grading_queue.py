@@ -0,0 +1,158 @@
+from odoo import models, fields, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 20
+MAX_ATTEMPTS = 3
+CRON_XMLID = 'quiz_engine_pro.ir_cron_quiz_grading_jobs'
+
+
+class QuizGradingJob(models.Model):
+    """Grading of a submitted session, deferred to a cron worker.
+
+    Jobs are claimed with ``FOR UPDATE SKIP LOCKED``, so any number of
+    workers (the cron, a shell, a second cron) can drain the queue without
+    grading a session twice or waiting on each other.
+    """
+    _name = 'quiz.grading.job'
+    _description = 'Quiz Grading Job'
+    _order = 'id'
+
+    session_id = fields.Many2one('quiz.session', string='Session', required=True, ondelete='cascade', index=True)
+    state = fields.Selection([
+        ('pending', 'Pending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ], string='State', default='pending', required=True, index=True)
+    attempts = fields.Integer(string='Attempts', default=0)
+    error = fields.Text(string='Last Error', readonly=True)
+
+    @api.model
+    def _enqueue(self, session):
+        """Queue the grading of ``session`` and wake the grading cron up"""
+        job = self.create({'session_id': session.id})
+        self.env.ref(CRON_XMLID)._trigger()
+        return job
+
+    @api.model
+    def _process_jobs(self, batch_size=DEFAULT_BATCH_SIZE, max_batches=None, commit=False):
+        """Grade pending sessions, ``batch_size`` jobs at a time; returns the number of jobs done.
+
+        With ``commit`` every batch is committed on its own, releasing its
+        row locks and making the results visible to the polling candidates.
+        """
+        cr = self.env.cr
+        processed = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            self.env.flush_all()
+            cr.execute("""
+                SELECT id
+                  FROM quiz_grading_job
+                 WHERE state = 'pending'
+              ORDER BY id
+                 LIMIT %s
+                   FOR UPDATE SKIP LOCKED
+            """, [batch_size])
+            job_ids = [row[0] for row in cr.fetchall()]
+            if not job_ids:
+                break
+            for job in self.browse(job_ids):
+                try:
+                    with cr.savepoint():
+                        job.session_id._grade_responses()
+                        job.write({'state': 'done', 'attempts': job.attempts + 1, 'error': False})
+                except Exception as e:
+                    _logger.exception("Grading job %s failed", job.id)
+                    # Drop whatever the rolled back grading left in the cache
+                    self.env.invalidate_all(flush=False)
+                    attempts = job.attempts + 1
+                    job.write({
+                        'attempts': attempts,
+                        'state': 'failed' if attempts >= MAX_ATTEMPTS else 'pending',
+                        'error': str(e),
+                    })
+                    if attempts >= MAX_ATTEMPTS:
+                        job.session_id.grading_state = 'failed'
+            processed += len(job_ids)
+            batches += 1
+            if commit:
+                cr.commit()
+        return processed
+
+    @api.model
+    def _cron_process_jobs(self):
+        batch_size = int(self.env['ir.config_parameter'].sudo().get_param(
+            'quiz_engine_pro.grading_batch_size', DEFAULT_BATCH_SIZE))
+        return self._process_jobs(batch_size=batch_size, commit=True)
+
+    @api.autovacuum
+    def _gc_done_jobs(self):
+        cutoff = fields.Datetime.subtract(fields.Datetime.now(), days=7)
+        self.search([('state', '=', 'done'), ('write_date', '<', cutoff)]).unlink()
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    async_grading = fields.Boolean(string='Grade in Background', default=False,
+                                   help='Store the answers of one-page submissions right away and grade them in a '
+                                        'background job; the results page waits for the score.')
+
+
+class QuizSession(models.Model):
+    _inherit = 'quiz.session'
+
+    # Looked up on every results, status and payload request
+    session_token = fields.Char(index=True)
+    grading_state = fields.Selection([
+        ('done', 'Graded'),
+        ('pending', 'Grading'),
+        ('failed', 'Grading Failed'),
+    ], string='Grading', default='done', required=True, readonly=True, copy=False)
+
+    def _grade_responses(self):
+        """Grade the stored answers of the session and finalize its score, rank and grading state.
+
+        Only the latest response to each question counts: a re-posted answer
+        adds a row, and the rows it supersedes are dropped. Scores are
+        written with one UPDATE per distinct score.
+        """
+        self.ensure_one()
+        max_score = self.max_score or sum(self.quiz_id.question_ids.mapped('points'))
+        latest = {}
+        for response in self.response_ids.sorted('id'):
+            latest[response.question_id] = response
+        responses = self.env['quiz.response'].concat(*latest.values())
+        (self.response_ids - responses).unlink()
+        by_score = {}
+        for response in responses:
+            question = response.question_id
+            answer = response._get_answer()
+            score = self._grade_from_snapshot(question, answer)
+            if score is None:
+                score = question.evaluate_answer(answer)
+            score = float(score or 0.0)
+            by_score[score] = by_score.get(score, responses.browse()) | response
+        for score, scored in by_score.items():
+            scored.write({'score': score})
+        total_score = sum(score * len(scored) for score, scored in by_score.items())
+        percentage = (total_score / max_score * 100) if max_score > 0 else 0
+        self.write({
+            'total_score': total_score,
+            'max_score': max_score,
+            'percentage': percentage,
+            'passed': percentage >= self.quiz_id.passing_score,
+            'grading_state': 'done',
+        })
+        self._update_leaderboard()
+
+    def _get_grading_status(self):
+        """JSON-serializable grading status, polled by the results page"""
+        self.ensure_one()
+        status = {'grading_state': self.grading_state}
+        if self.grading_state == 'done':
+            status.update(total_score=self.total_score, max_score=self.max_score,
+                          percentage=self.percentage, passed=self.passed)
+        return status
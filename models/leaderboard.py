@@ -0,0 +1,291 @@
+from odoo import models, fields, api, _
+import logging
+
+from psycopg2 import errors
+
+_logger = logging.getLogger(__name__)
+
+# Number of sessions kept in the ranked top list
+TOP_K = 100
+# One bucket per whole percentage point, 0..100
+BUCKETS = 101
+# First key of the per-quiz advisory lock serializing leaderboard folds, the second one is the quiz id
+FOLD_LOCK = 7301
+
+
+def percentage_bucket(percentage):
+    return min(max(int(percentage or 0), 0), BUCKETS - 1)
+
+
+def _entry_sort_key(entry):
+    # Highest percentage first, then the earliest finisher
+    return (-entry['percentage'], entry['end_time'] or '', entry['session_id'])
+
+
+class QuizLeaderboard(models.Model):
+    """Per-quiz ranking maintained incrementally as sessions complete.
+
+    Holds the top ``TOP_K`` sessions and a count of sessions per whole
+    percentage point, which is enough to place any session ("top 12%")
+    without sorting all sessions of the quiz. Completions are queued as
+    ``quiz.leaderboard.delta`` rows and folded in by a single transaction
+    at a time, so concurrent completions never wait on the leaderboard row.
+    """
+    _name = 'quiz.leaderboard'
+    _description = 'Quiz Leaderboard'
+
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', required=True, ondelete='cascade')
+    session_count = fields.Integer(string='Ranked Sessions', readonly=True)
+    top_entries = fields.Json(string='Top Sessions', readonly=True)
+    bucket_counts = fields.Json(string='Sessions per Percentage Point', readonly=True)
+
+    _sql_constraints = [
+        ('quiz_unique', 'unique(quiz_id)', 'A quiz has a single leaderboard.'),
+    ]
+
+    @api.model
+    def _acquire_fold_lock(self, quiz_id, wait=False):
+        """Take the quiz's fold lock until the end of the transaction; without ``wait``, False when it is taken"""
+        cr = self.env.cr
+        if wait:
+            cr.execute("SELECT pg_advisory_xact_lock(%s, %s)", [FOLD_LOCK, quiz_id])
+            return True
+        cr.execute("SELECT pg_try_advisory_xact_lock(%s, %s)", [FOLD_LOCK, quiz_id])
+        return cr.fetchone()[0]
+
+    @api.model
+    def _get_for_quiz(self, quiz_id):
+        """Leaderboard of the quiz, created if needed; only called under the quiz's fold lock"""
+        cr = self.env.cr
+        cr.execute("""
+            INSERT INTO quiz_leaderboard (quiz_id, session_count, top_entries, bucket_counts,
+                                          create_uid, create_date, write_uid, write_date)
+            VALUES (%s, 0, '[]', %s, %s, now() at time zone 'UTC', %s, now() at time zone 'UTC')
+            ON CONFLICT (quiz_id) DO NOTHING
+        """, [quiz_id, '[%s]' % ','.join(['0'] * BUCKETS), self.env.uid, self.env.uid])
+        cr.execute("SELECT id FROM quiz_leaderboard WHERE quiz_id = %s", [quiz_id])
+        board = self.browse(cr.fetchone()[0])
+        board.invalidate_recordset()
+        return board
+
+    @api.model
+    def _fold(self, quiz_id, wait=False):
+        """Apply the queued completions of a quiz to its leaderboard; returns False when another transaction is folding.
+
+        Whatever that transaction misses is folded by the next completion
+        of the quiz or by the cron.
+        """
+        if not self._acquire_fold_lock(quiz_id, wait=wait):
+            return False
+        self.env['quiz.leaderboard.delta'].flush_model()
+        cr = self.env.cr
+        cr.execute("DELETE FROM quiz_leaderboard_delta WHERE quiz_id = %s RETURNING session_id", [quiz_id])
+        session_ids = sorted({row[0] for row in cr.fetchall()})
+        if not session_ids:
+            return True
+        board = self._get_for_quiz(quiz_id)
+        for session in self.env['quiz.session'].browse(session_ids).exists():
+            if session.state != 'completed' or session._is_ranked():
+                continue
+            session.leaderboard_bucket = board._apply(session, session.leaderboard_bucket)
+        return True
+
+    @api.model
+    def _cron_fold_deltas(self):
+        self.env['quiz.leaderboard.delta'].flush_model()
+        self.env.cr.execute("SELECT DISTINCT quiz_id FROM quiz_leaderboard_delta")
+        for (quiz_id,) in self.env.cr.fetchall():
+            self._fold(quiz_id)
+
+    def _apply(self, session, old_bucket):
+        """Account for a session entering the ranking or moving within it"""
+        self.ensure_one()
+        counts = list(self.bucket_counts or [0] * BUCKETS)
+        count = self.session_count
+        if old_bucket >= 0:
+            counts[old_bucket] = max(counts[old_bucket] - 1, 0)
+        else:
+            count += 1
+        new_bucket = percentage_bucket(session.percentage)
+        counts[new_bucket] += 1
+        previous = self.top_entries or []
+        entries = [e for e in previous if e['session_id'] != session.id]
+        entry = {
+            'session_id': session.id,
+            'name': session.participant_name or '',
+            'percentage': round(session.percentage or 0.0, 2),
+            'end_time': fields.Datetime.to_string(session.end_time) if session.end_time else '',
+        }
+        entries.append(entry)
+        entries.sort(key=_entry_sort_key)
+        if len(entries) == len(previous) and count > TOP_K and entries[-1] is entry:
+            # A top session fell to the bottom: a session outside the list may now rank above it
+            self._rebuild_for_quiz(self.quiz_id.id)
+            return new_bucket
+        del entries[TOP_K:]
+        self.write({'session_count': count, 'bucket_counts': counts, 'top_entries': entries})
+        return new_bucket
+
+    @api.model
+    def _rename_archived_entries(self, refs_by_quiz):
+        """Point the top entries of archived sessions to their archive rows.
+
+        ``refs_by_quiz`` maps quiz ids to {session id: archive id}. Archived
+        sessions stay ranked; like in quiz.session.history, they are known
+        by the negated id of their archive row.
+        """
+        for quiz_id, refs in refs_by_quiz.items():
+            self._acquire_fold_lock(quiz_id, wait=True)
+            board = self.search([('quiz_id', '=', quiz_id)], limit=1)
+            board.invalidate_recordset()
+            entries = board.top_entries or []
+            if not any(e['session_id'] in refs for e in entries):
+                continue
+            entries = [dict(e, session_id=-refs[e['session_id']]) if e['session_id'] in refs else e
+                       for e in entries]
+            entries.sort(key=_entry_sort_key)
+            board.write({'top_entries': entries})
+
+    @api.model
+    def _rebuild_for_quiz(self, quiz_id):
+        """Recompute the leaderboard of a quiz from its completed sessions, live and archived"""
+        self.env['quiz.session'].flush_model()
+        self._acquire_fold_lock(quiz_id, wait=True)
+        board = self._get_for_quiz(quiz_id)
+        cr = self.env.cr
+        # Every completed session is ranked below, queued ones included
+        cr.execute("DELETE FROM quiz_leaderboard_delta WHERE quiz_id = %s", [quiz_id])
+        cr.execute("""
+            UPDATE quiz_session
+               SET leaderboard_bucket = CASE WHEN state = 'completed'
+                                             THEN LEAST(GREATEST(floor(COALESCE(percentage, 0))::int, 0), %s)
+                                             ELSE -1 END
+             WHERE quiz_id = %s
+        """, [BUCKETS - 1, quiz_id])
+        cr.execute("""
+            SELECT bucket, count(*)
+              FROM (SELECT leaderboard_bucket AS bucket
+                      FROM quiz_session
+                     WHERE quiz_id = %(quiz)s AND leaderboard_bucket >= 0
+                 UNION ALL
+                    SELECT LEAST(GREATEST(floor(COALESCE(percentage, 0))::int, 0), %(last)s)
+                      FROM quiz_session_archive
+                     WHERE quiz_id = %(quiz)s AND state = 'completed') ranked
+          GROUP BY bucket
+        """, {'quiz': quiz_id, 'last': BUCKETS - 1})
+        counts = [0] * BUCKETS
+        for bucket, count in cr.fetchall():
+            counts[bucket] = count
+        cr.execute("""
+            SELECT id, participant_name, COALESCE(percentage, 0), end_time
+              FROM quiz_session
+             WHERE quiz_id = %(quiz)s AND leaderboard_bucket >= 0
+         UNION ALL
+            SELECT -id, participant_name, COALESCE(percentage, 0), end_time
+              FROM quiz_session_archive
+             WHERE quiz_id = %(quiz)s AND state = 'completed'
+          ORDER BY 3 DESC, 4 NULLS LAST, 1
+             LIMIT %(limit)s
+        """, {'quiz': quiz_id, 'limit': TOP_K})
+        entries = [{
+            'session_id': sid,
+            'name': name or '',
+            'percentage': round(percentage, 2),
+            'end_time': fields.Datetime.to_string(end_time) if end_time else '',
+        } for sid, name, percentage, end_time in cr.fetchall()]
+        self.env['quiz.session'].invalidate_model(['leaderboard_bucket'])
+        board.write({'session_count': sum(counts), 'bucket_counts': counts, 'top_entries': entries})
+        return board
+
+    def _get_top_percent(self, percentage):
+        """Share of ranked sessions (in %) scoring at least ``percentage``, rounded up"""
+        self.ensure_one()
+        if not self.session_count:
+            return 0
+        counts = self.bucket_counts or []
+        at_least = sum(counts[percentage_bucket(percentage):])
+        return max(1, -(-100 * at_least // self.session_count))
+
+    def _get_public_data(self, limit=10, show_names=False):
+        """Top list for display; participants are numbered by rank unless ``show_names``"""
+        self.ensure_one()
+        return {
+            'session_count': self.session_count,
+            'top': [{
+                'rank': rank,
+                'name': e['name'] if show_names else _("Participant %s", rank),
+                'percentage': e['percentage'],
+            } for rank, e in enumerate((self.top_entries or [])[:limit], 1)],
+        }
+
+
+class QuizLeaderboardDelta(models.Model):
+    """Completed session waiting to be folded into its quiz's leaderboard"""
+    _name = 'quiz.leaderboard.delta'
+    _description = 'Queued Leaderboard Update'
+    _log_access = False
+
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', required=True, index=True, ondelete='cascade')
+    session_id = fields.Many2one('quiz.session', string='Session', required=True, ondelete='cascade')
+
+
+class QuizSession(models.Model):
+    _inherit = 'quiz.session'
+
+    leaderboard_bucket = fields.Integer(string='Leaderboard Bucket', default=-1, readonly=True, copy=False,
+                                        help='Percentage point this session is counted under in the leaderboard, -1 if not ranked.')
+
+    def _is_ranked(self):
+        """Whether the leaderboard counts this session under its current percentage"""
+        self.ensure_one()
+        return self.leaderboard_bucket >= 0 and self.leaderboard_bucket == percentage_bucket(self.percentage)
+
+    def _update_leaderboard(self):
+        """Rank completed sessions, or move them if their score changed since they were ranked.
+
+        The sessions are queued, then folded in right away unless another
+        transaction is folding the same quiz or did so since this one
+        started; the queue is then left to that transaction or the cron.
+        """
+        sessions = self.filtered(lambda s: s.state == 'completed' and not s._is_ranked())
+        if not sessions:
+            return
+        self.env['quiz.leaderboard.delta'].sudo().create([
+            {'quiz_id': session.quiz_id.id, 'session_id': session.id} for session in sessions
+        ])
+        Leaderboard = self.env['quiz.leaderboard'].sudo()
+        for quiz_id in sessions.quiz_id.ids:
+            try:
+                with self.env.cr.savepoint():
+                    Leaderboard._fold(quiz_id)
+            except errors.SerializationFailure:
+                # Drop whatever the rolled back fold left in the cache
+                self.env.invalidate_all(flush=False)
+
+    def _get_leaderboard_rank(self):
+        """Top-percent placement of this session, None when it is not ranked"""
+        self.ensure_one()
+        board = self.env['quiz.leaderboard'].sudo().search([('quiz_id', '=', self.quiz_id.id)], limit=1)
+        if not board or self.leaderboard_bucket < 0:
+            return None
+        return board._get_top_percent(self.percentage)
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    public_leaderboard = fields.Boolean(string='Public Leaderboard',
+                                        help='Publish the top list of the quiz on its leaderboard page and results pages.')
+    leaderboard_show_names = fields.Boolean(string='Show Names on Leaderboard',
+                                            help='List participants by name on the public leaderboard instead of by rank.')
+
+    def _get_leaderboard_data(self):
+        """Public top list of the quiz, a single-row read whatever the number of sessions"""
+        self.ensure_one()
+        board = self.env['quiz.leaderboard'].sudo().search([('quiz_id', '=', self.id)], limit=1)
+        if not board:
+            return {'session_count': 0, 'top': []}
+        data = board._get_public_data(show_names=self.leaderboard_show_names)
+        if not self.public_leaderboard:
+            data['top'] = []
+        return data
@@ -0,0 +1,131 @@
+"""Offline delivery of a session: one download, one signed submission.
+
+The offline player downloads the session's question plan once (the delivery
+payload, answer keys stripped) together with a per-session key, keeps the
+answers in the browser and posts them as a single JSON bundle signed with
+HMAC-SHA256 under that key. The key is derived from the database secret, the
+session token and a digest of the plan, so a bundle only verifies against the
+session and the exact questions it was built for. Retries of a bundle that
+was already accepted (the connection dropped before the reply) get the
+results page again.
+"""
+from odoo import models, fields, _
+from odoo.exceptions import AccessError, ValidationError
+from .answer_codec import encode_answer, parse_answer
+from datetime import timedelta
+import hashlib
+import hmac
+import json
+
+SIGNATURE_HEADER = 'X-Quiz-Signature'
+# Minutes after the time limit during which a bundle of an expired session is still accepted
+DEFAULT_GRACE_MINUTES = 10
+MAX_BUNDLE_BYTES = 2 * 1024 * 1024
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    offline_mode = fields.Boolean(string='Offline Delivery', default=False,
+                                  help='Download the questions once when the session starts, keep the answers in the '
+                                       'browser and submit them in one signed request, so candidates can work '
+                                       'through connectivity drops.')
+
+
+class QuizSession(models.Model):
+    _inherit = 'quiz.session'
+
+    offline_bundle_id = fields.Char(string='Offline Bundle', readonly=True, copy=False)
+
+    def _get_offline_plan_digest(self, question_ids):
+        """Digest of the plan content: the pinned (or current) content version and the question ids in order"""
+        self.ensure_one()
+        version = self.snapshot_id.version if self.snapshot_id else self.quiz_id.content_version
+        plan = '%s:%s' % (version, ','.join(str(qid) for qid in question_ids))
+        return hashlib.sha256(plan.encode()).hexdigest()
+
+    def _get_offline_key(self, plan_digest):
+        self.ensure_one()
+        secret = self.env['ir.config_parameter'].sudo().get_param('database.secret')
+        message = 'quiz-offline:%s:%s' % (self.session_token, plan_digest)
+        return hmac.new(secret.encode(), message.encode(), hashlib.sha256).hexdigest()
+
+    def _get_offline_payload(self, question_ids):
+        """Delivery payload of ``question_ids`` plus what the player needs to sign its bundle"""
+        self.ensure_one()
+        plan = self._get_offline_plan_digest(question_ids)
+        return self._get_delivery_payload(question_ids, extra={'offline': {
+            'plan': plan,
+            'key': self._get_offline_key(plan),
+            'submit_url': '/quiz/session/%s/offline/submit' % self.session_token,
+            'bundles': self._get_asset_bundles(),
+        }})
+
+    def _check_offline_bundle(self, body, signature, question_ids):
+        """Verify a posted bundle (raw bytes) against its signature and the session's plan; returns it decoded"""
+        self.ensure_one()
+        plan = self._get_offline_plan_digest(question_ids)
+        expected = hmac.new(self._get_offline_key(plan).encode(), body, hashlib.sha256).hexdigest()
+        if not signature or not hmac.compare_digest(expected, signature):
+            raise AccessError(_("The answer bundle signature is invalid."))
+        try:
+            bundle = json.loads(body)
+        except ValueError:
+            raise ValidationError(_("The answer bundle is not valid JSON."))
+        if not isinstance(bundle, dict) or bundle.get('session') != self.session_token or bundle.get('plan') != plan:
+            raise ValidationError(_("The answer bundle does not belong to this session."))
+        if not bundle.get('bundle_id') or not isinstance(bundle.get('answers'), dict):
+            raise ValidationError(_("The answer bundle is incomplete."))
+        return bundle
+
+    def _accepts_offline_bundle(self):
+        """Whether a new bundle may still be submitted: in progress, or expired less than the grace period ago"""
+        self.ensure_one()
+        if self.state == 'in_progress':
+            return True
+        if self.state != 'expired' or not self.time_limit_end:
+            return False
+        grace = int(self.env['ir.config_parameter'].sudo().get_param(
+            'quiz_engine_pro.offline_grace_minutes', DEFAULT_GRACE_MINUTES))
+        return fields.Datetime.now() <= self.time_limit_end + timedelta(minutes=grace)
+
+    def _submit_offline_bundle(self, bundle, question_ids):
+        """Store and grade the answers of a verified bundle in one batch.
+
+        Returns False when the session no longer accepts answers. The session
+        row is locked first, so concurrent retries of a bundle wait for the
+        first one and then find it accepted.
+        """
+        self.ensure_one()
+        self.env.cr.execute("SELECT id FROM quiz_session WHERE id = %s FOR UPDATE", [self.id])
+        self.invalidate_recordset(['state', 'offline_bundle_id'])
+        if self.offline_bundle_id:
+            return self.offline_bundle_id == str(bundle['bundle_id'])[:64]
+        if not self._accepts_offline_bundle():
+            return False
+        answers = bundle['answers']
+        response_vals = []
+        for question in self.env['quiz.question'].browse(question_ids):
+            answer = answers.get(str(question.id))
+            if answer in (None, '', [], {}):
+                continue
+            response_vals.append({
+                'session_id': self.id,
+                'question_id': question.id,
+                'answer_value': encode_answer(question.type, question._resolve_client_answer(
+                    parse_answer(json.dumps(answer)))),
+            })
+        self.env['quiz.response'].create(response_vals)
+        self.write({
+            'state': 'completed',
+            'end_time': fields.Datetime.now(),
+            'offline_bundle_id': str(bundle['bundle_id'])[:64],
+            'answered_count': len(response_vals),
+            'question_count': len(question_ids),
+        })
+        if self.quiz_id.async_grading:
+            self.grading_state = 'pending'
+            self.env['quiz.grading.job']._enqueue(self)
+        else:
+            self._grade_responses()
+        return True
@@ -0,0 +1,122 @@
+from odoo import models, fields, api
+import hashlib
+import hmac
+import json
+import random
+import secrets
+
+from .delivery import _dumps, order_right_items
+
+# Option lists of a delivery fragment that carry no meaning in their order
+OPTION_LISTS = ('choices', 'tokens', 'steps')
+# Which option list a question's page orders, per question type
+PAGE_OPTION_LIST = {
+    'mcq_single': 'choices',
+    'mcq_multiple': 'choices',
+    'drag_text': 'tokens',
+    'drag_zone': 'tokens',
+    'sentence_completion': 'tokens',
+    'step_sequence': 'steps',
+    'match': 'pairs',
+}
+
+
+def permuted(items, seed, salt):
+    """Copy of ``items`` in an order that only depends on (seed, salt)"""
+    items = list(items)
+    random.Random('%s:%s' % (seed, salt)).shuffle(items)
+    return items
+
+
+def shuffle_question(data, seed):
+    """Permute the option lists of a parsed delivery fragment in place, deterministically for the seed"""
+    qid = data['id']
+    for key in OPTION_LISTS:
+        if data.get(key):
+            data[key] = permuted(data[key], seed, '%s:%s' % (qid, key))
+    if data.get('pairs'):
+        data['pairs']['right'] = permuted(data['pairs']['right'], seed, '%s:right' % qid)
+    for blank in data.get('dropdowns', []):
+        blank['options'] = permuted(blank['options'], seed, '%s:blank:%s' % (qid, blank['id']))
+    for passage in data.get('passages', []):
+        for sub in passage['sub_questions']:
+            if sub.get('choices'):
+                sub['choices'] = permuted(sub['choices'], seed, '%s:sub:%s' % (qid, sub['id']))
+    return data
+
+
+class MatchPair(models.Model):
+    _inherit = 'quiz.match.pair'
+
+    def _get_right_keys(self):
+        """Opaque id under which pages and payloads show the right-hand item of each pair: {pair id: key}"""
+        secret = self.env['ir.config_parameter'].sudo().get_param('database.secret').encode()
+        return {pair_id: hmac.new(secret, b'match-right:%d' % pair_id, hashlib.sha256).hexdigest()[:16]
+                for pair_id in self.ids}
+
+
+class Question(models.Model):
+    _inherit = 'quiz.question'
+
+    def _get_match_right_items(self):
+        """Right-hand items of a match question as the page renders them: opaque ids, never in prompt order"""
+        self.ensure_one()
+        keys = self.match_pair_ids._get_right_keys()
+        return order_right_items([{'id': keys[pair.id], 'text': pair.right_text} for pair in self.match_pair_ids])
+
+    def _resolve_client_answer(self, value):
+        """Posted answer with the opaque right-hand match ids turned back into pair ids.
+
+        Right ids that are not a key of this question (a pair id sent
+        directly, for instance) resolve to None and match nothing.
+        """
+        self.ensure_one()
+        if self.type != 'match' or not isinstance(value, list):
+            return value
+        pair_ids = {key: pair_id for pair_id, key in self.match_pair_ids._get_right_keys().items()}
+        return [dict(entry, right_id=pair_ids.get(str(entry.get('right_id'))))
+                if isinstance(entry, dict) else entry for entry in value]
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    shuffle_options = fields.Boolean(string='Shuffle Options', default=False,
+                                     help='Present choices, tokens, steps and match items in an order of its own '
+                                          'to each session. The order is stable across reloads of the session.')
+
+
+class QuizSession(models.Model):
+    _inherit = 'quiz.session'
+
+    shuffle_seed = fields.Integer(string='Shuffle Seed', readonly=True, copy=False,
+                                  help='Seed of the session\'s option order; 0 when options keep their authoring order.')
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        quiz_ids = {vals['quiz_id'] for vals in vals_list if vals.get('quiz_id') and 'shuffle_seed' not in vals}
+        shuffled = set(self.env['quiz.quiz'].sudo().browse(quiz_ids).filtered('shuffle_options').ids)
+        for vals in vals_list:
+            if vals.get('quiz_id') in shuffled and 'shuffle_seed' not in vals:
+                vals['shuffle_seed'] = secrets.randbelow(2 ** 31 - 1) + 1
+        return super().create(vals_list)
+
+    def _get_question_fragments(self, fragments, question_ids):
+        """Apply the session's option order on top of the shared, canonical fragments"""
+        if not self.shuffle_seed:
+            return super()._get_question_fragments(fragments, question_ids)
+        return [_dumps(shuffle_question(json.loads(fragments['questions'][qid]), self.shuffle_seed))
+                for qid in question_ids if qid in fragments['questions']]
+
+    def _get_option_order(self, question):
+        """Ids of the options of ``question`` as this session shows them on the question page, [] if unshuffled"""
+        self.ensure_one()
+        if not self.shuffle_seed or question.type not in PAGE_OPTION_LIST:
+            return []
+        fragment = self._get_delivery_fragments()['questions'].get(question.id)
+        if not fragment:
+            return []
+        data = shuffle_question(json.loads(fragment), self.shuffle_seed)
+        if question.type == 'match':
+            return [item['id'] for item in data['pairs']['right']] if data.get('pairs') else []
+        return [item['id'] for item in data.get(PAGE_OPTION_LIST[question.type]) or []]
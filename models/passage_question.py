@@ -48,6 +48,8 @@ class PassageSubQuestion(models.Model):
     # For text answers
     correct_answer = fields.Text(string='Correct Answer', 
                                 help="For text answers, enter keywords or the expected answer")
+    fuzzy_max_distance = fields.Integer(string='Fuzzy Match Distance', default=0,
+                                        help="Accept keywords misspelled by up to this many edits (0 = exact keywords only)")
     
     @api.constrains('question_type', 'choice_ids', 'correct_answer')
     def _check_required_fields(self):
@@ -0,0 +1,180 @@
+"""Lightweight runtime instrumentation of the quiz routes.
+
+Per route: request count, wall time (with a latency histogram), SQL query
+count and SQL time, taken from the per-thread counters Odoo's cursor keeps
+up to date. Per question type: grading count and time. The figures are
+aggregated in memory per worker process and exposed in the Prometheus text
+format by /quiz/metrics; requests can also be sampled into quiz.perf.sample
+for a cross-worker, persistent view.
+
+Everything is switched by the ``quiz_engine_pro.perf_enabled`` system
+parameter; when it is off an instrumented route costs one cached parameter
+lookup.
+"""
+from odoo import models, fields, api
+from odoo.http import request
+from odoo.tools import str2bool
+from odoo.tools.cache import STAT
+from collections import defaultdict
+from datetime import timedelta
+import functools
+import random
+import threading
+import time
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SAMPLE_RETENTION_DAYS = 7
+
+_lock = threading.Lock()
+# route -> [count, wall seconds, queries, sql seconds, per-bucket counts]
+_routes = {}
+# question type -> [count, seconds]
+_grading = defaultdict(lambda: [0, 0.0])
+
+
+def is_enabled(env):
+    return str2bool(env['ir.config_parameter'].sudo().get_param('quiz_engine_pro.perf_enabled', 'False'))
+
+
+def record_route(route, wall, queries, sql_time):
+    with _lock:
+        stats = _routes.get(route)
+        if stats is None:
+            stats = _routes[route] = [0, 0.0, 0, 0.0, [0] * len(LATENCY_BUCKETS)]
+        stats[0] += 1
+        stats[1] += wall
+        stats[2] += queries
+        stats[3] += sql_time
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if wall <= bound:
+                stats[4][index] += 1
+
+
+def record_grading(question_type, seconds):
+    with _lock:
+        stats = _grading[question_type]
+        stats[0] += 1
+        stats[1] += seconds
+
+
+def instrument(route):
+    """Decorator for controller methods recording the route's timings when instrumentation is enabled"""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            env = request.env
+            if not is_enabled(env):
+                return method(self, *args, **kwargs)
+            thread = threading.current_thread()
+            queries_before = getattr(thread, 'query_count', 0)
+            sql_before = getattr(thread, 'query_time', 0.0)
+            start = time.perf_counter()
+            response = method(self, *args, **kwargs)
+            if hasattr(response, 'flatten'):
+                # Render lazy QWeb responses now so the template is measured too
+                response.flatten()
+            wall = time.perf_counter() - start
+            queries = getattr(thread, 'query_count', 0) - queries_before
+            sql_time = getattr(thread, 'query_time', 0.0) - sql_before
+            record_route(route, wall, queries, sql_time)
+            env['quiz.perf.sample'].sudo()._maybe_sample(route, wall, queries, sql_time)
+            return response
+        return wrapper
+    return decorator
+
+
+class timed_grading:
+    """Context manager recording the grading time of a question type when instrumentation is enabled"""
+
+    def __init__(self, env, question_type):
+        self.question_type = question_type
+        self.enabled = is_enabled(env)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.enabled:
+            record_grading(self.question_type, time.perf_counter() - self.start)
+        return False
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_metrics(dbname):
+    """Metrics of this worker process in the Prometheus text exposition format"""
+    with _lock:
+        routes = {route: (s[0], s[1], s[2], s[3], list(s[4])) for route, s in _routes.items()}
+        grading = {qtype: tuple(s) for qtype, s in _grading.items()}
+    lines = [
+        '# HELP quiz_route_duration_seconds Wall time of quiz routes.',
+        '# TYPE quiz_route_duration_seconds histogram',
+    ]
+    for route, (count, wall, _queries, _sql, buckets) in sorted(routes.items()):
+        label = 'route="%s"' % _escape(route)
+        for bound, bucket_count in zip(LATENCY_BUCKETS, buckets):
+            lines.append('quiz_route_duration_seconds_bucket{%s,le="%s"} %d' % (label, bound, bucket_count))
+        lines.append('quiz_route_duration_seconds_bucket{%s,le="+Inf"} %d' % (label, count))
+        lines.append('quiz_route_duration_seconds_sum{%s} %f' % (label, wall))
+        lines.append('quiz_route_duration_seconds_count{%s} %d' % (label, count))
+    lines += [
+        '# HELP quiz_route_sql_queries_total SQL queries run by quiz routes.',
+        '# TYPE quiz_route_sql_queries_total counter',
+    ]
+    lines += ['quiz_route_sql_queries_total{route="%s"} %d' % (_escape(route), s[2])
+              for route, s in sorted(routes.items())]
+    lines += [
+        '# HELP quiz_route_sql_seconds_total SQL time of quiz routes.',
+        '# TYPE quiz_route_sql_seconds_total counter',
+    ]
+    lines += ['quiz_route_sql_seconds_total{route="%s"} %f' % (_escape(route), s[3])
+              for route, s in sorted(routes.items())]
+    lines += [
+        '# HELP quiz_grading_seconds Grading time per question type.',
+        '# TYPE quiz_grading_seconds summary',
+    ]
+    for qtype, (count, seconds) in sorted(grading.items()):
+        lines.append('quiz_grading_seconds_sum{type="%s"} %f' % (_escape(qtype), seconds))
+        lines.append('quiz_grading_seconds_count{type="%s"} %d' % (_escape(qtype), count))
+    lines += [
+        '# HELP quiz_ormcache_requests_total Lookups of the quiz ormcaches.',
+        '# TYPE quiz_ormcache_requests_total counter',
+    ]
+    for (db, model_name, method), counter in sorted(STAT.items(), key=lambda item: (item[0][1], str(item[0][2]))):
+        if db != dbname or not model_name.startswith('quiz.'):
+            continue
+        label = 'cache="%s.%s"' % (_escape(model_name), _escape(getattr(method, '__name__', method)))
+        lines.append('quiz_ormcache_requests_total{%s,result="hit"} %d' % (label, counter.hit))
+        lines.append('quiz_ormcache_requests_total{%s,result="miss"} %d' % (label, counter.miss))
+    return '\n'.join(lines) + '\n'
+
+
+class QuizPerfSample(models.Model):
+    _name = 'quiz.perf.sample'
+    _description = 'Quiz Route Performance Sample'
+    _order = 'create_date desc'
+    _log_access = False
+
+    create_date = fields.Datetime(string='Date', readonly=True, index=True, default=fields.Datetime.now)
+    route = fields.Char(string='Route', readonly=True, index=True)
+    duration_ms = fields.Float(string='Wall Time (ms)', readonly=True, group_operator='avg')
+    query_count = fields.Integer(string='SQL Queries', readonly=True, group_operator='avg')
+    sql_ms = fields.Float(string='SQL Time (ms)', readonly=True, group_operator='avg')
+
+    @api.model
+    def _maybe_sample(self, route, wall, queries, sql_time):
+        rate = float(self.env['ir.config_parameter'].sudo().get_param('quiz_engine_pro.perf_sample_rate', 0) or 0)
+        if rate <= 0 or random.random() >= rate:
+            return
+        self.env.cr.execute("""
+            INSERT INTO quiz_perf_sample (create_date, route, duration_ms, query_count, sql_ms)
+            VALUES (now() at time zone 'UTC', %s, %s, %s, %s)
+        """, [route, wall * 1000.0, queries, sql_time * 1000.0])
+
+    @api.autovacuum
+    def _gc_samples(self):
+        cutoff = fields.Datetime.now() - timedelta(days=SAMPLE_RETENTION_DAYS)
+        self.search([('create_date', '<', cutoff)]).unlink()
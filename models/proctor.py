@@ -0,0 +1,236 @@
+"""Live proctoring of the sessions of a quiz over the bus.
+
+Every session keeps a compact progress counter (``answered_count`` out of
+``question_count``), bumped by one indexed UPDATE per newly answered
+question. State transitions and answers are queued at commit into a
+process-local ``ProctorOutbox`` which coalesces them per session and sends
+one bus notification per quiz at most every ``THROTTLE_DELAY`` seconds, so
+the dashboards of thousands of candidates are kept current without any of
+them polling the database.
+"""
+from odoo import models, fields, api, _
+from odoo.exceptions import AccessError
+import odoo
+import odoo.modules.module
+import functools
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'quiz_proctor_'
+NOTIFICATION_TYPE = 'quiz_proctor/progress'
+PROCTOR_GROUP = 'quiz_engine_pro.group_quiz_master'
+THROTTLE_DELAY = 2.0
+# Sessions per bus message, keeps every notification well below the websocket frame limits
+MAX_MESSAGE_SESSIONS = 500
+SNAPSHOT_LIMIT = 5000
+SNAPSHOT_HOURS = 12
+EXPIRY_BATCH_SIZE = 1000
+
+STATE_EVENTS = {
+    'in_progress': 'started',
+    'completed': 'submitted',
+    'expired': 'expired',
+}
+
+
+def proctor_channel(quiz_id):
+    return '%s%d' % (CHANNEL_PREFIX, quiz_id)
+
+
+class ProctorOutbox:
+    """Progress entries waiting to be sent, per database, quiz and session.
+
+    The first entry pushed for a database arms a timer; when it fires, the
+    latest entry of every session is sent in one notification per quiz.
+    """
+
+    def __init__(self, delay=THROTTLE_DELAY):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timers = {}
+
+    def push(self, dbname, quiz_id, entry):
+        with self._lock:
+            self._pending.setdefault(dbname, {}).setdefault(quiz_id, {})[entry['id']] = entry
+            if self.delay is None or dbname in self._timers:
+                return
+            timer = self._timers[dbname] = threading.Timer(self.delay, self.flush, [dbname])
+            timer.daemon = True
+            timer.start()
+
+    def drain(self, dbname):
+        """Pop the pending entries of ``dbname`` as ``{quiz_id: [entry, ...]}``"""
+        with self._lock:
+            self._timers.pop(dbname, None)
+            batch = self._pending.pop(dbname, {})
+        return {quiz_id: list(sessions.values()) for quiz_id, sessions in batch.items()}
+
+    def flush(self, dbname):
+        batch = self.drain(dbname)
+        if not batch:
+            return
+        try:
+            with odoo.registry(dbname).cursor() as cr:
+                env = api.Environment(cr, odoo.SUPERUSER_ID, {})
+                env['quiz.session']._proctor_send(batch)
+        except Exception:
+            _logger.exception("Could not send the proctoring updates of %s", dbname)
+
+
+outbox = ProctorOutbox()
+
+
+class QuizResponse(models.Model):
+    _inherit = 'quiz.response'
+
+    # Progress counting looks up the earlier answers of the session
+    session_id = fields.Many2one(index=True)
+
+
+class QuizSession(models.Model):
+    _inherit = 'quiz.session'
+
+    quiz_id = fields.Many2one(index=True)
+    state = fields.Selection(index=True)
+    answered_count = fields.Integer(string='Answered', default=0, readonly=True, copy=False)
+    question_count = fields.Integer(string='Questions', default=0, readonly=True, copy=False)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if 'question_count' not in vals and vals.get('question_order'):
+                vals['question_count'] = len([x for x in vals['question_order'].split(',') if x])
+        sessions = super().create(vals_list)
+        sessions.filtered(lambda s: s.state in STATE_EVENTS)._proctor_queue()
+        return sessions
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'state' in vals:
+            self._proctor_queue()
+        elif 'answered_count' in vals or 'question_count' in vals:
+            self._proctor_queue('answered')
+        return res
+
+    def _proctor_entry(self, event=None):
+        """Compact JSON-serializable progress of the session, as shown on the proctor dashboard"""
+        self.ensure_one()
+        if self.state != 'in_progress':
+            # Answers counted at submission are part of the 'submitted' event
+            event = None
+        return {
+            'id': self.id,
+            'name': self.participant_name or '',
+            'event': event or STATE_EVENTS.get(self.state, self.state),
+            'state': self.state,
+            'answered': self.answered_count,
+            'total': self.question_count,
+            'time': fields.Datetime.to_string(fields.Datetime.now()),
+        }
+
+    def _proctor_queue(self, event=None):
+        """Hand the progress of the sessions to the outbox once the transaction commits"""
+        if odoo.modules.module.current_test:
+            # Test transactions never commit, and must not leave timers behind
+            return
+        dbname = self.env.cr.dbname
+        for session in self:
+            self.env.cr.postcommit.add(functools.partial(
+                outbox.push, dbname, session.quiz_id.id, session._proctor_entry(event)))
+
+    def _proctor_record_answer(self, response):
+        """Count ``response`` in the progress of the session unless its question was answered before"""
+        self.ensure_one()
+        self.env['quiz.response'].flush_model(['session_id', 'question_id'])
+        self.env.cr.execute("""
+            UPDATE quiz_session
+               SET answered_count = answered_count + 1
+             WHERE id = %s
+               AND NOT EXISTS (SELECT 1
+                                 FROM quiz_response
+                                WHERE session_id = %s
+                                  AND question_id = %s
+                                  AND id <> %s)
+         RETURNING answered_count
+        """, [self.id, self.id, response.question_id.id, response.id])
+        counted = bool(self.env.cr.fetchone())
+        if counted:
+            self.invalidate_recordset(['answered_count'])
+            self._proctor_queue('answered')
+        return counted
+
+    @api.model
+    def _proctor_send(self, batch):
+        """Send ``{quiz_id: [entry, ...]}`` to the proctor channels of the quizzes"""
+        bus = self.env['bus.bus'].sudo()
+        for quiz_id, entries in batch.items():
+            for start in range(0, len(entries), MAX_MESSAGE_SESSIONS):
+                bus._sendone(proctor_channel(quiz_id), NOTIFICATION_TYPE, {
+                    'quiz_id': quiz_id,
+                    'sessions': entries[start:start + MAX_MESSAGE_SESSIONS],
+                })
+
+    @api.model
+    def _cron_expire_sessions(self):
+        """Expire the sessions whose time limit is over"""
+        sessions = self.search([
+            ('state', '=', 'in_progress'),
+            ('time_limit_end', '<', fields.Datetime.now()),
+        ], limit=EXPIRY_BATCH_SIZE)
+        sessions.write({'state': 'expired', 'end_time': fields.Datetime.now()})
+        return len(sessions)
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    def get_proctor_snapshot(self):
+        """Current progress of the quiz's running and recent sessions, loaded once by the dashboard"""
+        self.ensure_one()
+        if not self.env.user.has_group(PROCTOR_GROUP):
+            raise AccessError(_("Only quiz masters can proctor a quiz."))
+        since = fields.Datetime.subtract(fields.Datetime.now(), hours=SNAPSHOT_HOURS)
+        rows = self.env['quiz.session'].sudo().search_read(
+            ['&', ('quiz_id', '=', self.id),
+             '|', ('state', '=', 'in_progress'), ('write_date', '>=', since)],
+            ['participant_name', 'state', 'answered_count', 'question_count', 'write_date'],
+            limit=SNAPSHOT_LIMIT, order='id desc')
+        return {
+            'quiz_id': self.id,
+            'name': self.name,
+            'channel': proctor_channel(self.id),
+            'sessions': [{
+                'id': row['id'],
+                'name': row['participant_name'] or '',
+                'event': STATE_EVENTS.get(row['state'], row['state']),
+                'state': row['state'],
+                'answered': row['answered_count'],
+                'total': row['question_count'],
+                'time': fields.Datetime.to_string(row['write_date']),
+            } for row in rows],
+        }
+
+    def action_open_proctor_dashboard(self):
+        self.ensure_one()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'quiz_engine_pro.proctor_dashboard',
+            'name': _('Proctor: %s', self.name),
+            'params': {'quiz_id': self.id},
+        }
+
+
+class IrWebsocket(models.AbstractModel):
+    _inherit = 'ir.websocket'
+
+    def _filter_proctor_channels(self, channels):
+        """Drop the proctor channels from ``channels`` unless the user may proctor"""
+        if self.env.user.has_group(PROCTOR_GROUP):
+            return list(channels)
+        return [c for c in channels if not (isinstance(c, str) and c.startswith(CHANNEL_PREFIX))]
+
+    def _build_bus_channel_list(self, channels):
+        return super()._build_bus_channel_list(self._filter_proctor_channels(channels))
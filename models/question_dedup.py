@@ -0,0 +1,263 @@
+"""Near-duplicate detection over the question bank.
+
+Each question (and passage sub-question) is reduced to the normalized text of
+its stem and choices, cut into word shingles and summarized by a MinHash
+signature. Signatures are split into bands; items sharing a band bucket are
+candidates, and candidates whose estimated Jaccard similarity reaches the
+threshold are joined into clusters. Every item is only compared with the
+first item of its buckets, so the job stays linear in the bank size.
+
+Candidates are looked for across the whole bank, so a question copied into
+another quiz is reported too. Merging only ever deletes items of the kept
+item's quiz: a copied quiz repeats its original's questions on purpose, and
+merging across quizzes would empty one of them.
+"""
+from odoo import models, fields, api, _
+from .question_search import html_to_text
+import hashlib
+import logging
+import re
+import struct
+
+_logger = logging.getLogger(__name__)
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+DEFAULT_THRESHOLD = 0.8
+# blake2b gives 16 32-bit values per digest: NUM_PERM / 16 digests per shingle, each salted differently
+_SALTS = [b'quizdup%d' % i for i in range(NUM_PERM // 16)]
+_WORD_RE = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Lower-cased words of ``text`` (HTML allowed), punctuation and markup dropped"""
+    return _WORD_RE.findall(html_to_text(text).lower())
+
+
+def shingles(words, size=SHINGLE_SIZE):
+    if len(words) <= size:
+        return {' '.join(words)} if words else set()
+    return {' '.join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(items):
+    """MinHash signature (tuple of NUM_PERM ints) of a non-empty set of strings"""
+    rows = []
+    for item in items:
+        data = item.encode()
+        values = ()
+        for salt in _SALTS:
+            values += struct.unpack('<16I', hashlib.blake2b(data, digest_size=64, salt=salt).digest())
+        rows.append(values)
+    return tuple(map(min, zip(*rows)))
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of the sets behind two signatures"""
+    return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def find_clusters(signatures, threshold=DEFAULT_THRESHOLD):
+    """Group ``{key: signature}`` into near-duplicate clusters.
+
+    Returns a list of ``(members, min_similarity)`` where members are keys,
+    the cluster's representative first, and min_similarity is the lowest
+    similarity of a member to that representative.
+    """
+    parent = {}
+
+    def root(key):
+        while parent.get(key, key) != key:
+            parent[key] = parent.get(parent[key], parent[key])
+            key = parent[key]
+        return key
+
+    for band in range(BANDS):
+        buckets = {}
+        start = band * ROWS
+        for key, signature in signatures.items():
+            head = buckets.setdefault(signature[start:start + ROWS], key)
+            if head == key:
+                continue
+            score = similarity(signatures[head], signature)
+            if score >= threshold:
+                a, b = root(head), root(key)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+    groups = {}
+    for key in parent:
+        groups.setdefault(root(key), set()).add(key)
+    clusters = []
+    for representative, members in groups.items():
+        members.add(representative)
+        if len(members) < 2:
+            continue
+        ordered = [representative] + sorted(members - {representative})
+        rep_signature = signatures[representative]
+        clusters.append((ordered, min(similarity(rep_signature, signatures[m]) for m in ordered[1:])))
+    return clusters
+
+
+class QuizDuplicateCluster(models.Model):
+    _name = 'quiz.duplicate.cluster'
+    _description = 'Near-Duplicate Question Cluster'
+    _order = 'state, similarity desc, id'
+
+    name = fields.Char(string='Question', readonly=True)
+    similarity = fields.Float(string='Similarity (%)', readonly=True, digits=(5, 1),
+                              help='Lowest estimated similarity of a member to the first question of the cluster')
+    item_count = fields.Integer(string='Items', readonly=True)
+    state = fields.Selection([
+        ('new', 'To Review'),
+        ('merged', 'Merged'),
+        ('ignored', 'Not Duplicates'),
+    ], string='State', default='new', required=True, index=True)
+    quiz_ids = fields.Many2many('quiz.quiz', string='Quizzes', compute='_compute_quiz_ids')
+    fingerprint = fields.Char(string='Members', readonly=True, index=True)
+    item_ids = fields.One2many('quiz.duplicate.item', 'cluster_id', string='Items')
+    note = fields.Text(string='Merge Notes', readonly=True)
+
+    @api.depends('item_ids.quiz_id')
+    def _compute_quiz_ids(self):
+        for cluster in self:
+            cluster.quiz_ids = cluster.item_ids.quiz_id
+
+    @api.model
+    def _load_signatures(self):
+        """MinHash signature of every question and sub-question, keyed ('q', id) / ('s', id), their text and quiz"""
+        cr = self.env.cr
+        self.env.flush_all()
+        texts = {}
+        cr.execute("""
+            SELECT q.id, q.quiz_id, CASE WHEN q.type = 'dropdown_blank' THEN q.text_template ELSE q.question_html END,
+                   string_agg(c.text, ' ' ORDER BY c.text)
+              FROM quiz_question q
+         LEFT JOIN quiz_choice c ON c.question_id = q.id
+             WHERE q.type != 'passage'
+          GROUP BY q.id
+        """)
+        for question_id, quiz_id, stem, choices in cr.fetchall():
+            texts[('q', question_id)] = (quiz_id, stem, choices)
+        cr.execute("""
+            SELECT s.id, q.quiz_id, s.question_text, string_agg(c.text, ' ' ORDER BY c.text)
+              FROM quiz_passage_sub_question s
+              JOIN quiz_passage p ON p.id = s.passage_id
+              JOIN quiz_question q ON q.id = p.question_id
+         LEFT JOIN quiz_passage_choice c ON c.sub_question_id = s.id
+          GROUP BY s.id, q.quiz_id
+        """)
+        for sub_id, quiz_id, stem, choices in cr.fetchall():
+            texts[('s', sub_id)] = (quiz_id, stem, choices)
+        signatures = {}
+        previews = {}
+        quizzes = {}
+        for key, (quiz_id, stem, choices) in texts.items():
+            items = shingles(normalize(stem) + normalize(choices))
+            if items:
+                signatures[key] = minhash(items)
+                previews[key] = html_to_text(stem)[:120]
+                quizzes[key] = quiz_id
+        return signatures, previews, quizzes
+
+    @api.model
+    def _detect_duplicates(self, threshold=None):
+        """Replace the clusters to review with a fresh detection run; returns the number of clusters found"""
+        if threshold is None:
+            threshold = float(self.env['ir.config_parameter'].sudo().get_param(
+                'quiz_engine_pro.duplicate_threshold', DEFAULT_THRESHOLD))
+        signatures, previews, quizzes = self._load_signatures()
+        clusters = find_clusters(signatures, threshold)
+        self.search([('state', '=', 'new')]).unlink()
+        # A set of questions reviewed as distinct is not proposed again
+        ignored = set(self.search([('state', '=', 'ignored')]).mapped('fingerprint'))
+        vals_list = []
+        for members, score in clusters:
+            fingerprint = ','.join('%s%d' % key for key in sorted(members))
+            if fingerprint in ignored:
+                continue
+            representative = signatures[members[0]]
+            vals_list.append({
+                'name': previews[members[0]],
+                'similarity': score * 100,
+                'item_count': len(members),
+                'fingerprint': fingerprint,
+                'item_ids': [(0, 0, {
+                    'question_id': key[1] if key[0] == 'q' else False,
+                    'sub_question_id': key[1] if key[0] == 's' else False,
+                    'quiz_id': quizzes[key],
+                    'preview': previews[key],
+                    'similarity': similarity(representative, signatures[key]) * 100,
+                    'is_master': index == 0,
+                }) for index, key in enumerate(members)],
+            })
+        self.create(vals_list)
+        _logger.info("Duplicate detection: %d items, %d clusters", len(signatures), len(vals_list))
+        return len(vals_list)
+
+    @api.model
+    def _cron_detect_duplicates(self):
+        return self._detect_duplicates()
+
+    @api.model
+    def action_detect_duplicates(self):
+        self._detect_duplicates()
+        return self.env['ir.actions.act_window']._for_xml_id('quiz_engine_pro.action_quiz_duplicate_cluster')
+
+    def action_ignore(self):
+        self.write({'state': 'ignored'})
+
+    def action_merge(self):
+        """Keep the master item of each cluster and delete the other items that have no answers yet.
+
+        Questions with responses, and sub-questions of passages with
+        responses, are kept: deleting them would delete those answers. The
+        last sub-question of a passage is kept too, a passage needs one, and
+        so is anything outside the master's quiz.
+        """
+        Response = self.env['quiz.response']
+        for cluster in self:
+            master = cluster.item_ids.filtered('is_master')[:1] or cluster.item_ids[:1]
+            kept = []
+            for item in cluster.item_ids - master:
+                record = item.question_id or item.sub_question_id
+                if not record:
+                    continue
+                question = item.question_id or item.sub_question_id.passage_id.question_id
+                if question.quiz_id != master.quiz_id:
+                    kept.append(item.preview or str(record.id))
+                    continue
+                if Response.search_count([('question_id', '=', question.id)], limit=1):
+                    kept.append(item.preview or str(record.id))
+                    continue
+                if item.sub_question_id and len(item.sub_question_id.passage_id.sub_question_ids) == 1:
+                    kept.append(item.preview or str(record.id))
+                    continue
+                record.unlink()
+            cluster.write({
+                'state': 'merged',
+                'note': _("Kept because they have answers, are the only question of their passage "
+                          "or belong to another quiz than the kept one: %s",
+                          ', '.join(kept)) if kept else False,
+            })
+
+
+class QuizDuplicateItem(models.Model):
+    _name = 'quiz.duplicate.item'
+    _description = 'Near-Duplicate Question'
+    _order = 'is_master desc, similarity desc, id'
+
+    cluster_id = fields.Many2one('quiz.duplicate.cluster', string='Cluster', required=True, ondelete='cascade',
+                                 index=True)
+    question_id = fields.Many2one('quiz.question', string='Question', ondelete='cascade')
+    sub_question_id = fields.Many2one('quiz.passage.sub.question', string='Passage Sub-question', ondelete='cascade')
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', readonly=True, index=True, ondelete='cascade')
+    preview = fields.Char(string='Text', readonly=True)
+    similarity = fields.Float(string='Similarity (%)', readonly=True, digits=(5, 1))
+    is_master = fields.Boolean(string='Keep', help='The item kept when the cluster is merged')
+
+    def action_set_master(self):
+        self.ensure_one()
+        self.cluster_id.item_ids.write({'is_master': False})
+        self.is_master = True
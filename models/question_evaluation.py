@@ -1,4 +1,6 @@
 from odoo import models
+from .graders import grade
+from .text_matcher import get_matcher, normalize_text, split_keywords
 import json
 
 class QuestionEvaluation(models.Model):
@@ -185,13 +187,9 @@ class QuestionEvaluation(models.Model):
         if not answer_data or not self.correct_text_answer:
             return 0.0
         
-        user_answer = answer_data.strip()
-        correct_answer = self.correct_text_answer.strip()
-        
-        # Apply case sensitivity
-        if not self.case_sensitive:
-            user_answer = user_answer.lower()
-            correct_answer = correct_answer.lower()
+        # Normalize once (accents, punctuation, whitespace and case unless case sensitive)
+        user_answer = normalize_text(answer_data, self.case_sensitive)
+        correct_answer = normalize_text(self.correct_text_answer, self.case_sensitive)
         
         # Exact match
         if user_answer == correct_answer:
@@ -199,19 +197,16 @@ class QuestionEvaluation(models.Model):
         
         # Partial match if allowed
         if self.allow_partial_match:
-            if self.keywords:
-                keywords = [k.strip() for k in self.keywords.split(',')]
-                # Convert to lowercase if not case sensitive
-                if not self.case_sensitive:
-                    keywords = [k.lower() for k in keywords]
-                
-                # Check if all keywords are present
-                keywords_found = sum(1 for k in keywords if k in user_answer)
+            keywords = split_keywords(self.keywords, self.case_sensitive)
+            if keywords:
+                # Single pass over the answer with the compiled keyword automaton
+                keywords_found = get_matcher(keywords, self.fuzzy_max_distance).count(user_answer)
                 if keywords_found > 0:
                     return (keywords_found / len(keywords)) * self.points
-            else:
+            elif correct_answer:
                 # Simple partial match calculation if no specific keywords
-                ratio = len(set(user_answer.split()) & set(correct_answer.split())) / len(set(correct_answer.split()))
+                correct_words = set(correct_answer.split())
+                ratio = len(set(user_answer.split()) & correct_words) / len(correct_words)
                 if ratio > 0.5:  # More than half the words match
                     return ratio * self.points
         
@@ -254,11 +249,12 @@ class QuestionEvaluation(models.Model):
             return 0.0
         
         correct_count = 0
+        correct_cells = {(cell.row_id.id, cell.column_id.id) for cell in self.matrix_cell_ids if cell.is_correct}
         
         for row in self.matrix_row_ids:
             for col in self.matrix_column_ids:
                 cell_key = f"cell_{row.id}_{col.id}"
-                expected_value = self._get_matrix_correct_value(row, col)
+                expected_value = (row.id, col.id) in correct_cells
                 
                 if cell_key in answers and answers[cell_key] == expected_value:
                     correct_count += 1
@@ -350,105 +346,13 @@ class QuestionEvaluation(models.Model):
         return correct_count
         
     def _evaluate_passage(self, answer_data):
-        """Evaluate reading passage with multiple questions"""
-        if not answer_data:
-            return 0.0
-        
-        try:
-            answers = json.loads(answer_data) if isinstance(answer_data, str) else answer_data
-        except Exception:
-            return 0.0
-        
-        # Get all passages and sub-questions
-        if not self.passage_ids:
-            return 0.0
-            
-        passage = self.passage_ids[0]  # Currently supporting one passage per question
-        sub_questions = passage.sub_question_ids
-        
-        if not sub_questions:
-            return 0.0
-        
-        # Calculate total possible points from all sub-questions
-        total_points = sum(q.points for q in sub_questions)
-        if total_points == 0:
-            return 0.0
-        
-        # Calculate earned points
-        earned_points = 0.0
-        
-        for sub_q in sub_questions:
-            # Accept keys either as raw id ("123") or prefixed ("sub_q_123")
-            sub_q_id = str(sub_q.id)
-            pref_key = f"sub_q_{sub_q_id}"
-            key = sub_q_id if sub_q_id in answers else (pref_key if pref_key in answers else None)
-            if not key:
-                continue
-            sub_answer = answers[key]
-            
-            # Evaluate based on sub-question type
-            if sub_q.question_type == 'mcq_single':
-                earned_points += self._evaluate_passage_mcq_single(sub_q, sub_answer)
-            elif sub_q.question_type == 'mcq_multiple':
-                earned_points += self._evaluate_passage_mcq_multiple(sub_q, sub_answer)
-            elif sub_q.question_type in ['text_short', 'text_long']:
-                earned_points += self._evaluate_passage_text(sub_q, sub_answer)
-        
-        # Scale the points to the question's total points
-        return (earned_points / total_points) * self.points
-    
-    def _evaluate_passage_mcq_single(self, sub_q, answer_data):
-        """Evaluate single choice MCQ within a passage"""
-        if not answer_data:
-            return 0.0
-        
-        selected_choice_id = int(answer_data)
-        correct_choice = sub_q.choice_ids.filtered('is_correct')
-        
-        if correct_choice and selected_choice_id == correct_choice[0].id:
-            return sub_q.points
-        return 0.0
-    
-    def _evaluate_passage_mcq_multiple(self, sub_q, answer_data):
-        """Evaluate multiple choice MCQ within a passage"""
-        if not answer_data:
-            return 0.0
-        
-        selected_ids = [int(x) for x in answer_data if x]
-        correct_ids = sub_q.choice_ids.filtered('is_correct').ids
-        
-        if set(selected_ids) == set(correct_ids):
-            return sub_q.points
-        return 0.0
-    
-    def _evaluate_passage_text(self, sub_q, answer_data):
-        """Evaluate text answer within a passage"""
-        if not answer_data or not sub_q.correct_answer:
-            return 0.0
-        
-        user_answer = answer_data.strip().lower()
-        correct_answer = sub_q.correct_answer.strip().lower()
-        
-        # For short answers, check for exact match or keyword presence
-        if sub_q.question_type == 'text_short':
-            if user_answer == correct_answer:
-                return sub_q.points
-                
-            # Check for keywords
-            keywords = [k.strip().lower() for k in correct_answer.split(',')]
-            for keyword in keywords:
-                if keyword in user_answer:
-                    return sub_q.points
-        
-        # For long answers, do a more lenient check based on keyword presence
-        elif sub_q.question_type == 'text_long':
-            keywords = [k.strip().lower() for k in correct_answer.split(',')]
-            if not keywords:
-                return 0.0
-                
-            # Calculate how many keywords are present
-            keywords_found = sum(1 for k in keywords if k in user_answer)
-            if keywords_found > 0:
-                return (keywords_found / len(keywords)) * sub_q.points
-        
-        return 0.0
+        """Evaluate reading passage with multiple questions.
+
+        Grades against the flattened sub-question key table compiled (and cached
+        per quiz content version) by _get_answer_key, so no sub-question or
+        choice records are read here.
+        """
+        key = self._get_answer_key()
+        if not key:
+            return 0.0
+        return grade(key, answer_data)
@@ -13,6 +13,8 @@ class QuizQuestion(models.Model):
     case_sensitive = fields.Boolean(string="Case Sensitive", default=False)
     allow_partial_match = fields.Boolean(string="Allow Partial Match", default=False)
     keywords = fields.Text(string="Keywords for Partial Match")
+    fuzzy_max_distance = fields.Integer(string="Fuzzy Match Distance", default=0,
+                                        help="Accept keywords misspelled by up to this many edits (0 = exact keywords only)")
     
     # Fields for numerical answers
     numerical_exact_value = fields.Float(string="Exact Value")
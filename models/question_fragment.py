@@ -0,0 +1,60 @@
+from odoo import models, fields, tools
+
+BODY_TEMPLATE = 'quiz_engine_pro.quiz_question_body'
+
+
+class Question(models.Model):
+    _inherit = 'quiz.question'
+
+    def _get_type_field_diagnostics(self):
+        """Technical details of the type field and its look-alikes, shown in the passage debug block"""
+        self.ensure_one()
+        model_fields = self._fields
+        field_names = list(model_fields.keys())
+        type_field = model_fields.get('type')
+        type_field_info = {
+            'name': 'type',
+            'type': type_field.type if type_field else 'not found',
+            'selection': dict(type_field.selection) if type_field and hasattr(type_field, 'selection') else {},
+            'stored': type_field.store if type_field else False,
+            'required': type_field.required if type_field else False,
+        }
+        alt_fields = []
+        for name in field_names:
+            if name != 'type' and ('type' in name or name.endswith('_type')):
+                field = model_fields.get(name)
+                alt_fields.append({
+                    'name': name,
+                    'type': field.type if field else 'unknown',
+                    'selection': dict(field.selection) if field and hasattr(field, 'selection') else {},
+                    'value': getattr(self, name, None),
+                })
+        type_value = getattr(self, 'type', 'not accessible')
+        return {
+            'field_info': type_field_info,
+            'field_value': type_value,
+            'field_value_type': type(type_value).__name__,
+            'alternative_fields': alt_fields,
+            'all_fields': field_names[:30],  # Just show first 30 fields
+            'model_name': self._name,
+            'record_id': self.id,
+        }
+
+    def _get_body_fragment(self):
+        """Rendered answer inputs of the question, shared by every session.
+
+        The key covers the question's own write_date and its quiz's
+        content_version, which moves on any change to child records
+        (choices, blanks, tokens...), so an edit simply misses the cache.
+        """
+        self.ensure_one()
+        version = (fields.Datetime.to_string(self.write_date), self.quiz_id.content_version)
+        return self.sudo()._render_body_fragment(self.id, version, self.env.lang or 'en_US')
+
+    @tools.ormcache('question_id', 'version', 'lang')
+    def _render_body_fragment(self, question_id, version, lang):
+        question = self.with_context(lang=lang).browse(question_id)
+        return self.env['ir.qweb'].with_context(lang=lang)._render(BODY_TEMPLATE, {
+            'question': question,
+            'field_diagnostics': question._get_type_field_diagnostics(),
+        })
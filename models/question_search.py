@@ -0,0 +1,98 @@
+"""Full-text search over the question bank.
+
+Every question stores the plain text of its question, choices, items,
+explanations and passages in ``search_text``. The column has a trigram index,
+used by the ORM for ``ilike`` (the backend search view, name search), and a
+GIN index on its ``simple`` tsvector for word queries with ranking
+(``content_search`` and ``_search_fulltext``).
+"""
+from odoo import models, fields, api, tools, _
+from odoo.exceptions import UserError
+from odoo.osv import expression
+import html
+import re
+
+TS_CONFIG = 'simple'
+FTS_INDEX = 'quiz_question_search_text_fts_idx'
+
+_TAG_RE = re.compile(r'<[^>]*>')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def html_to_text(value):
+    """Plain text of an HTML fragment: tags dropped, entities decoded, whitespace collapsed"""
+    if not value:
+        return ''
+    return _SPACE_RE.sub(' ', html.unescape(_TAG_RE.sub(' ', value))).strip()
+
+
+class QuizQuestion(models.Model):
+    _inherit = 'quiz.question'
+    _rec_names_search = ['name', 'search_text']
+
+    search_text = fields.Text(string='Searchable Text', compute='_compute_search_text', store=True,
+                              index='trigram', readonly=True)
+    content_search = fields.Char(string='Content', compute='_compute_content_search', search='_search_content',
+                                 help='Word search over the question, its choices, explanation and passages')
+
+    def init(self):
+        super().init()
+        tools.create_index(
+            self.env.cr, FTS_INDEX, self._table,
+            ["to_tsvector('%s', coalesce(search_text, ''))" % TS_CONFIG], method='gin')
+
+    @api.depends(
+        'question_html', 'text_template', 'explanation', 'rationale_html',
+        'choice_ids.text', 'match_pair_ids.left_text', 'match_pair_ids.right_text', 'drag_token_ids.text',
+        'sequence_item_ids.label', 'sequence_item_ids.content',
+        'passage_ids.name', 'passage_ids.passage_content', 'passage_ids.sub_question_ids.question_text',
+        'passage_ids.sub_question_ids.choice_ids.text',
+    )
+    def _compute_search_text(self):
+        for question in self:
+            parts = [
+                html_to_text(question.question_html),
+                html_to_text(question.text_template),
+                ' '.join(question.choice_ids.mapped('text')),
+                ' '.join(question.match_pair_ids.mapped('left_text') + question.match_pair_ids.mapped('right_text')),
+                ' '.join(question.drag_token_ids.mapped('text')),
+                ' '.join(question.sequence_item_ids.mapped('label')),
+                ' '.join(filter(None, question.sequence_item_ids.mapped('content'))),
+                html_to_text(question.explanation),
+                html_to_text(question.rationale_html),
+            ]
+            for passage in question.passage_ids:
+                parts += [passage.name or '', html_to_text(passage.passage_content)]
+                for sub in passage.sub_question_ids:
+                    parts += [html_to_text(sub.question_text), ' '.join(sub.choice_ids.mapped('text'))]
+            question.search_text = ' '.join(part for part in parts if part)
+
+    def _compute_content_search(self):
+        self.content_search = False
+
+    def _search_content(self, operator, value):
+        """Word query (web search syntax: quotes, OR, -word) against the tsvector index"""
+        if operator not in ('=', 'ilike', 'like') or not isinstance(value, str):
+            raise UserError(_("Content search does not support the %s operator.", operator))
+        if not value.strip():
+            return expression.TRUE_DOMAIN
+        query = self._search([])
+        query.add_where(
+            "to_tsvector('%s', coalesce(\"%s\".\"search_text\", '')) @@ websearch_to_tsquery('%s', %%s)"
+            % (TS_CONFIG, query.table, TS_CONFIG), [value])
+        return [('id', 'in', query)]
+
+    @api.model
+    def _search_fulltext(self, text, domain=None, limit=80):
+        """Questions matching the word query ``text`` within ``domain``, best match first"""
+        query = self._search(expression.AND([domain or [], [('content_search', '=', text)]]))
+        self.env.cr.execute(tools.SQL(
+            """
+            SELECT id
+              FROM quiz_question
+             WHERE id IN %s
+          ORDER BY ts_rank(to_tsvector(%s::regconfig, coalesce(search_text, '')),
+                           websearch_to_tsquery(%s::regconfig, %s)) DESC, id
+             LIMIT %s
+            """, query.subselect(), TS_CONFIG, TS_CONFIG, text, limit))
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
@@ -13,7 +13,7 @@ class Quiz(models.Model):
     published = fields.Boolean(string='Published', default=False)
     randomize_questions = fields.Boolean(string='Randomize Questions', default=False)
     time_limit = fields.Integer(string='Time Limit (minutes)', default=0, help='0 = No time limit')
-    max_attempts = fields.Integer(string='Maximum Attempts', default=1)
+    max_attempts = fields.Integer(string='Maximum Attempts', default=0, help='0 = Unlimited attempts')
     show_results = fields.Boolean(string='Show Results After Completion', default=True)
     passing_score = fields.Float(string='Passing Score (%)', default=60.0)
     question_limit = fields.Integer(string='Question Limit', default=0,
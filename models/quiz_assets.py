@@ -0,0 +1,48 @@
+"""Front-end asset bundles of the quiz pages.
+
+Quiz code is not part of ``web.assets_frontend``: quiz pages load the core
+bundle plus one bundle per question type family present in the question
+plan, so other website pages ship none of it and a quiz only ships the
+widgets it uses.
+"""
+from odoo import models
+
+CORE_BUNDLE = 'quiz_engine_pro.assets_quiz'
+TYPE_BUNDLES = {
+    'fill_blank': 'quiz_engine_pro.assets_quiz_fill_blanks',
+    'match': 'quiz_engine_pro.assets_quiz_drag_drop',
+    'drag_text': 'quiz_engine_pro.assets_quiz_drag_drop',
+    'drag_zone': 'quiz_engine_pro.assets_quiz_drag_drop',
+    'dropdown_blank': 'quiz_engine_pro.assets_quiz_dropdown',
+    'step_sequence': 'quiz_engine_pro.assets_quiz_sequence',
+    'sentence_completion': 'quiz_engine_pro.assets_quiz_sentence_completion',
+    'matrix': 'quiz_engine_pro.assets_quiz_matrix',
+    'passage': 'quiz_engine_pro.assets_quiz_passage',
+}
+
+
+def asset_bundles(types):
+    """Bundles a page showing questions of ``types`` needs, core bundle first"""
+    return [CORE_BUNDLE] + sorted({TYPE_BUNDLES[t] for t in types if t in TYPE_BUNDLES})
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    def _get_asset_bundles(self, questions=None):
+        """Bundles of a page showing ``questions`` (all questions of the quiz by default)"""
+        self.ensure_one()
+        if questions is None:
+            questions = self.question_ids
+        return asset_bundles(set(questions.mapped('type')))
+
+
+class QuizSession(models.Model):
+    _inherit = 'quiz.session'
+
+    def _get_asset_bundles(self):
+        """Bundles of the whole question plan, so moving to the next question never loads new code"""
+        self.ensure_one()
+        plan = [int(x) for x in (self.question_order or '').split(',') if x]
+        questions = self.env['quiz.question'].browse(plan).exists() if plan else self.quiz_id.question_ids
+        return asset_bundles(set(questions.mapped('type')))
@@ -0,0 +1,176 @@
+"""Bulk deep copy of quizzes and questions in SQL.
+
+A question tree spans fourteen tables. Copying it through the ORM creates
+every record one by one (and matrix rows/columns regenerate their cells on
+create). Instead, every table of ``CLONE_TREE`` is copied with two
+multi-row statements, whatever the size of the tree:
+
+1. ids are allocated for the copies, from the table's sequence, into the
+   temporary ``quiz_clone_map`` (table, old id, new id);
+2. ``INSERT ... SELECT`` copies the stored columns of the rows, every
+   many2one to a copied table is remapped through ``quiz_clone_map``.
+
+Many2many relations of copied records get one more statement each. Stored
+computed fields are copied as they are: the content is the same.
+"""
+from odoo import models, api, _
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# (model, field linking it to its parent), parents first
+CLONE_TREE = (
+    ('quiz.question', 'quiz_id'),
+    ('quiz.choice', 'question_id'),
+    ('quiz.match.pair', 'question_id'),
+    ('quiz.drag.token', 'question_id'),
+    ('quiz.fill.blank.answer', 'question_id'),
+    ('quiz.blank', 'question_id'),
+    ('quiz.option', 'blank_id'),
+    ('quiz.sequence.item', 'question_id'),
+    ('quiz.matrix.row', 'question_id'),
+    ('quiz.matrix.column', 'question_id'),
+    ('quiz.matrix.cell', 'row_id'),
+    ('quiz.passage', 'question_id'),
+    ('quiz.passage.sub.question', 'passage_id'),
+    ('quiz.passage.choice', 'sub_question_id'),
+)
+
+
+class QuizCloneMixin(models.AbstractModel):
+    _name = 'quiz.clone.mixin'
+    _description = 'Bulk Question Tree Copy'
+
+    @api.model
+    def _clone_tree(self, quiz_map, question_ids=None):
+        """Copy the questions of the quizzes in ``quiz_map`` ({source quiz id: target quiz id}).
+
+        Only the questions in ``question_ids`` are copied when given. Returns
+        the new quiz.question ids.
+        """
+        cr = self.env.cr
+        self.env.flush_all()
+        cr.execute("""
+            CREATE TEMPORARY TABLE IF NOT EXISTS quiz_clone_map (
+                tbl varchar NOT NULL,
+                old_id integer NOT NULL,
+                new_id integer NOT NULL,
+                PRIMARY KEY (tbl, old_id)
+            ) ON COMMIT DROP
+        """)
+        cr.execute("TRUNCATE quiz_clone_map")
+        cr.execute("""
+            INSERT INTO quiz_clone_map (tbl, old_id, new_id)
+            SELECT 'quiz_quiz', pair.old_id, pair.new_id
+              FROM unnest(%s::integer[], %s::integer[]) AS pair (old_id, new_id)
+        """, [list(quiz_map), list(quiz_map.values())])
+        cloned = {'quiz_quiz'} | {self.env[name]._table for name, _parent in CLONE_TREE}
+        for model_name, parent_field in CLONE_TREE:
+            restrict = question_ids if model_name == 'quiz.question' else None
+            self._clone_table(self.env[model_name], parent_field, cloned, restrict)
+        cr.execute("SELECT new_id FROM quiz_clone_map WHERE tbl = 'quiz_question' ORDER BY new_id")
+        new_question_ids = [row[0] for row in cr.fetchall()]
+        self.env.invalidate_all()
+        _logger.info("Cloned %d questions into quizzes %s", len(new_question_ids), list(quiz_map.values()))
+        return new_question_ids
+
+    @api.model
+    def _clone_table(self, model, parent_field, cloned, restrict=None):
+        cr = self.env.cr
+        table = model._table
+        parent_table = self.env[model._fields[parent_field].comodel_name]._table
+        where = "AND t.id IN %(restrict)s" if restrict else ""
+        # Ids are drawn in the order of the originals, so ties on the model's order are kept
+        cr.execute("""
+            INSERT INTO quiz_clone_map (tbl, old_id, new_id)
+            SELECT %%(table)s, t.id, nextval(%%(sequence)s)
+              FROM "%(table)s" t
+              JOIN quiz_clone_map p ON p.tbl = %%(parent_table)s AND p.old_id = t."%(parent)s"
+             WHERE TRUE %(where)s
+          ORDER BY t.id
+        """ % {'table': table, 'parent': parent_field, 'where': where}, {
+            'table': table,
+            'sequence': '%s_id_seq' % table,
+            'parent_table': parent_table,
+            'restrict': tuple(restrict or ()),
+        })
+        if not cr.rowcount:
+            return 0
+        columns, values, joins = ['id'], ['m.new_id'], []
+        for name, field in model._fields.items():
+            if not field.store or not field.column_type or name == 'id':
+                continue
+            columns.append('"%s"' % name)
+            if name in ('create_uid', 'write_uid'):
+                values.append('%(uid)s')
+            elif name in ('create_date', 'write_date'):
+                values.append("(now() at time zone 'UTC')")
+            elif field.type == 'many2one' and self.env[field.comodel_name]._table in cloned:
+                alias = 'm_%s' % name
+                joins.append('LEFT JOIN quiz_clone_map %s ON %s.tbl = \'%s\' AND %s.old_id = t."%s"' % (
+                    alias, alias, self.env[field.comodel_name]._table, alias, name))
+                values.append('COALESCE(%s.new_id, t."%s")' % (alias, name))
+            else:
+                values.append('t."%s"' % name)
+        cr.execute("""
+            INSERT INTO "%(table)s" (%(columns)s)
+            SELECT %(values)s
+              FROM "%(table)s" t
+              JOIN quiz_clone_map m ON m.tbl = %%(table)s AND m.old_id = t.id
+              %(joins)s
+        """ % {'table': table, 'columns': ', '.join(columns), 'values': ', '.join(values), 'joins': '\n'.join(joins)},
+            {'table': table, 'uid': self.env.uid})
+        count = cr.rowcount
+        for field in model._fields.values():
+            if field.type == 'many2many' and field.store and field.copy:
+                cr.execute("""
+                    INSERT INTO "%(relation)s" ("%(column1)s", "%(column2)s")
+                    SELECT m.new_id, r."%(column2)s"
+                      FROM "%(relation)s" r
+                      JOIN quiz_clone_map m ON m.tbl = %%s AND m.old_id = r."%(column1)s"
+                """ % {'relation': field.relation, 'column1': field.column1, 'column2': field.column2}, [table])
+        return count
+
+
+class Quiz(models.Model):
+    _name = 'quiz.quiz'
+    _inherit = ['quiz.quiz', 'quiz.clone.mixin']
+
+    def _get_copy_slug(self):
+        self.ensure_one()
+        base = '%s-copy' % self.slug
+        slug, index = base, 1
+        while self.search_count([('slug', '=', slug)], limit=1):
+            index += 1
+            slug = '%s-%d' % (base, index)
+        return slug
+
+    def copy_data(self, default=None):
+        default = dict(default or {})
+        vals_list = super().copy_data(default)
+        for quiz, vals in zip(self, vals_list):
+            if 'name' not in default:
+                vals['name'] = _('%s (copy)', quiz.name)
+            if 'slug' not in default:
+                vals['slug'] = quiz._get_copy_slug()
+            vals['published'] = default.get('published', False)
+        return vals_list
+
+    def copy(self, default=None):
+        """Copy the quiz with its whole question tree, see ``_clone_tree``"""
+        new = super().copy(default)
+        self._clone_tree({self.id: new.id})
+        return new
+
+
+class QuizQuestion(models.Model):
+    _name = 'quiz.question'
+    _inherit = ['quiz.question', 'quiz.clone.mixin']
+
+    def _copy_to_quiz(self, quiz):
+        """Bulk copy these questions, with their choices, items and passages, into ``quiz``"""
+        if not self:
+            return self.browse()
+        question_ids = self._clone_tree(dict.fromkeys(self.mapped('quiz_id').ids, quiz.id), self.ids)
+        quiz._bump_content_version()
+        return self.browse(question_ids)
@@ -0,0 +1,238 @@
+from odoo import models, fields, api, _
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools import html_escape
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+import runpy
+from psycopg2.extras import execute_values
+from .answer_codec import decode_answer
+from .graders import regrade_rows
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Max number of changed responses listed in the report
+REPORT_LIMIT = 200
+MODELS_PACKAGE = __name__.rpartition('.')[0]
+ADDON_PACKAGE = MODELS_PACKAGE.rpartition('.')[0]
+MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(MODELS_DIR)
+WORKER_BOOTSTRAP = os.path.join(ADDON_DIR, 'scripts', 'grading_worker.py')
+
+
+class QuizRegradeWizard(models.TransientModel):
+    """Re-score stored responses after an answer key correction"""
+    _name = 'quiz.regrade.wizard'
+    _description = 'Re-grade Quiz Responses'
+
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz')
+    question_ids = fields.Many2many('quiz.question', string='Questions',
+                                    help='Questions whose responses are re-graded. Leave empty to re-grade the whole quiz.')
+    dry_run = fields.Boolean(string='Dry Run', default=True,
+                             help='Only report the score changes, do not write them.')
+    chunk_size = fields.Integer(string='Chunk Size', default=5000)
+    workers = fields.Integer(string='Worker Processes', default=1,
+                             help='Number of processes grading chunks in parallel. 1 = grade in the current process.')
+    state = fields.Selection([('draft', 'Draft'), ('done', 'Done')], default='draft')
+    response_count = fields.Integer(string='Responses Checked', readonly=True)
+    changed_count = fields.Integer(string='Scores Changed', readonly=True)
+    session_count = fields.Integer(string='Sessions Affected', readonly=True)
+    report_html = fields.Html(string='Report', readonly=True, sanitize=False)
+
+    @api.constrains('workers')
+    def _check_workers(self):
+        limit = os.cpu_count() or 1
+        for wizard in self:
+            if not 1 <= wizard.workers <= limit:
+                raise ValidationError(_('Worker processes must be between 1 and %s.', limit))
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        if self.env.context.get('active_model') == 'quiz.question' and self.env.context.get('active_ids'):
+            res['question_ids'] = [(6, 0, self.env.context['active_ids'])]
+        return res
+
+    def action_regrade(self):
+        self.ensure_one()
+        questions = self.question_ids or self.quiz_id.question_ids
+        if not questions:
+            raise UserError(_('Select a quiz or at least one question to re-grade.'))
+        result = self._regrade(questions, dry_run=self.dry_run, chunk_size=self.chunk_size, workers=self.workers)
+        self.write({
+            'state': 'done',
+            'response_count': result['responses'],
+            'changed_count': len(result['changes']),
+            'session_count': len(result['session_ids']),
+            'report_html': self._render_report(result),
+        })
+        return {
+            'type': 'ir.actions.act_window',
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    @api.model
+    def _regrade(self, questions, dry_run=True, chunk_size=5000, workers=1):
+        """Re-score every stored response of the given questions.
+
+        Usable from an Odoo shell:
+            env['quiz.regrade.wizard']._regrade(env['quiz.question'].browse(ids), dry_run=False)
+        Responses are read in id-ordered chunks. Sessions pinned to a
+        snapshot are graded against the key frozen in it, the others against
+        the live questions. Compiled keys are applied by the pure graders
+        (across ``workers`` processes when > 1, at most one per CPU), the
+        questions without one by ``evaluate_answer``. Changed scores are
+        written with one UPDATE per chunk, then session totals and pass flags
+        are refreshed in one statement.
+        """
+        self.env.flush_all()
+        questions = questions.sudo()
+        # Key references: (snapshot id, question id), snapshot 0 for the live questions
+        keys = {(0, qid): key for qid, key in questions._compile_answer_keys().items()}
+        loaded_snapshots = set()
+        live_questions = {q.id: q for q in questions}
+        cr = self.env.cr
+        chunk_size = max(chunk_size or 5000, 1)
+        total = self.env['quiz.response'].sudo().search_count([('question_id', 'in', questions.ids)])
+        changes = []
+        session_ids = set()
+        last_id = 0
+        done = 0
+        started = time.time()
+        workers = min(workers or 1, os.cpu_count() or 1)
+        # Spawned children start from a fresh interpreter: a forked Odoo worker would carry its
+        # registry, cursor and sockets along. The bootstrap makes the pure graders importable
+        # there without the addons path, and without loading the rest of the addon.
+        pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=runpy.run_path,
+            initargs=(WORKER_BOOTSTRAP, {'PACKAGES': [
+                ('odoo', None), ('odoo.addons', None), (ADDON_PACKAGE, ADDON_DIR), (MODELS_PACKAGE, MODELS_DIR),
+            ]}),
+        ) if workers > 1 else None
+        try:
+            while True:
+                cr.execute("""
+                    SELECT r.id, r.question_id, r.answer_value, r.score, r.session_id, s.snapshot_id
+                      FROM quiz_response r
+                      JOIN quiz_session s ON s.id = r.session_id
+                     WHERE r.question_id IN %s AND r.id > %s
+                  ORDER BY r.id
+                     LIMIT %s
+                """, [tuple(questions.ids), last_id, chunk_size])
+                rows = cr.fetchall()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                sessions = {row[0]: row[4] for row in rows}
+                # Pinned sessions are re-graded against the key they were delivered with
+                for snapshot in self.env['quiz.snapshot'].sudo().browse(
+                        list({row[5] for row in rows if row[5]} - loaded_snapshots)):
+                    keys.update(((snapshot.id, qid), key) for qid, key in snapshot._get_answer_keys().items()
+                                if qid in live_questions)
+                    loaded_snapshots.add(snapshot.id)
+                keyed, unkeyed = [], []
+                for rid, qid, stored, old_score, _session_id, snapshot_id in rows:
+                    ref = (snapshot_id, qid) if (snapshot_id, qid) in keys else (0, qid)
+                    if ref in keys:
+                        keyed.append((rid, qid, ref, stored, old_score))
+                    else:
+                        unkeyed.append((rid, qid, stored, old_score))
+                graded = []
+                if keyed:
+                    if pool:
+                        step = max(len(keyed) // workers, 1)
+                        parts = [keyed[i:i + step] for i in range(0, len(keyed), step)]
+                        part_keys = [{row[2]: keys[row[2]] for row in part} for part in parts]
+                        for part in pool.map(regrade_rows, part_keys, parts):
+                            graded.extend(part)
+                    else:
+                        graded.extend(regrade_rows(keys, keyed))
+                for rid, qid, stored, old_score in unkeyed:
+                    question = live_questions[qid]
+                    new_score = float(question.evaluate_answer(decode_answer(question.type, stored)) or 0.0)
+                    graded.append((rid, qid, old_score, new_score))
+                chunk_changes = [(rid, qid, old or 0.0, new) for rid, qid, old, new in graded
+                                 if abs((old or 0.0) - new) > 1e-6]
+                if chunk_changes and not dry_run:
+                    execute_values(cr, """
+                        UPDATE quiz_response r
+                           SET score = v.score,
+                               is_correct = (q.points > 0 AND v.score >= q.points)
+                          FROM (VALUES %s) AS v(id, score), quiz_question q
+                         WHERE r.id = v.id AND q.id = r.question_id
+                    """, [(rid, new) for rid, _qid, _old, new in chunk_changes])
+                changes.extend(chunk_changes)
+                session_ids.update(sessions[rid] for rid, _qid, _old, _new in chunk_changes)
+                done += len(rows)
+                _logger.info("Re-grade: %d/%d responses checked, %d changed (%.1fs)",
+                             done, total, len(changes), time.time() - started)
+        finally:
+            if pool:
+                pool.shutdown()
+        if session_ids and not dry_run:
+            self._refresh_session_totals(list(session_ids))
+            for quiz in self.env['quiz.session'].sudo().browse(list(session_ids)).quiz_id:
+                self.env['quiz.leaderboard'].sudo()._rebuild_for_quiz(quiz.id)
+        return {'responses': done, 'changes': changes, 'session_ids': session_ids}
+
+    @api.model
+    def _refresh_session_totals(self, session_ids):
+        """Recompute total_score, percentage and passed of the given sessions in SQL"""
+        self.env.cr.execute("""
+            UPDATE quiz_session s
+               SET total_score = agg.total,
+                   max_score = COALESCE(NULLIF(s.max_score, 0), qp.total_points, 0),
+                   percentage = CASE WHEN COALESCE(NULLIF(s.max_score, 0), qp.total_points, 0) > 0
+                                     THEN agg.total / COALESCE(NULLIF(s.max_score, 0), qp.total_points) * 100
+                                     ELSE 0 END
+              FROM (SELECT session_id, COALESCE(SUM(score), 0) AS total
+                      FROM quiz_response
+                     WHERE session_id IN %s
+                  GROUP BY session_id) agg
+              JOIN quiz_session s2 ON s2.id = agg.session_id
+              LEFT JOIN (SELECT quiz_id, SUM(points) AS total_points
+                           FROM quiz_question
+                       GROUP BY quiz_id) qp ON qp.quiz_id = s2.quiz_id
+             WHERE s.id = agg.session_id
+        """, [tuple(session_ids)])
+        self.env.cr.execute("""
+            UPDATE quiz_session s
+               SET passed = s.percentage >= COALESCE(q.passing_score, 0)
+              FROM quiz_quiz q
+             WHERE q.id = s.quiz_id AND s.id IN %s
+        """, [tuple(session_ids)])
+        self.env['quiz.response'].invalidate_model(['score', 'is_correct'])
+        self.env['quiz.session'].invalidate_model(['total_score', 'max_score', 'percentage', 'passed'])
+
+    def _render_report(self, result):
+        changes = result['changes']
+        if not changes:
+            return '<p>%s</p>' % html_escape(_('No score changed.'))
+        response_ids = [rid for rid, _qid, _old, _new in changes[:REPORT_LIMIT]]
+        responses = {r.id: r for r in self.env['quiz.response'].sudo().browse(response_ids)}
+        lines = []
+        for rid, _qid, old, new in changes[:REPORT_LIMIT]:
+            response = responses[rid]
+            lines.append('<tr><td>%s</td><td>%s</td><td>%.2f</td><td>%.2f</td></tr>' % (
+                html_escape(response.session_id.participant_name or ''),
+                html_escape(response.question_id.name or ''),
+                old, new))
+        header = '<p>%s</p>' % html_escape(
+            _('%(changed)s of %(total)s responses change score (%(sessions)s sessions).',
+              changed=len(changes), total=result['responses'], sessions=len(result['session_ids'])))
+        table = ('<table class="table table-sm"><thead><tr><th>%s</th><th>%s</th><th>%s</th><th>%s</th></tr></thead>'
+                 '<tbody>%s</tbody></table>') % (
+            html_escape(_('Participant')), html_escape(_('Question')),
+            html_escape(_('Old Score')), html_escape(_('New Score')), ''.join(lines))
+        if len(changes) > REPORT_LIMIT:
+            table += '<p class="text-muted">%s</p>' % html_escape(
+                _('Only the first %s changes are listed.', REPORT_LIMIT))
+        return header + table
+
@@ -1,4 +1,5 @@
 from odoo import models, fields, api, _
+from .answer_codec import decode_answer, encode_answer, parse_answer
 import json
 
 
@@ -8,12 +9,30 @@ class QuizResponse(models.Model):
 
     session_id = fields.Many2one('quiz.session', required=True, ondelete='cascade')
     question_id = fields.Many2one('quiz.question', required=True, ondelete='cascade')
-    answer_data = fields.Text(string='Answer Data')
+    # Typed compact answer envelope, see answer_codec
+    answer_value = fields.Json(string='Answer Value')
+    answer_data = fields.Text(string='Answer Data', compute='_compute_answer_data',
+                              inverse='_inverse_answer_data')
     score = fields.Float(string='Score', default=0.0)
     is_correct = fields.Boolean(string='Is Correct', compute='_compute_is_correct', store=True)
 
     # Score is now set by the controller at creation/update. No automatic recomputation here to avoid recursion.
 
+    @api.depends('answer_value', 'question_id.type')
+    def _compute_answer_data(self):
+        for record in self:
+            value = record._get_answer()
+            record.answer_data = json.dumps(value) if value is not None else False
+
+    def _inverse_answer_data(self):
+        for record in self:
+            record.answer_value = encode_answer(record.question_id.type, parse_answer(record.answer_data))
+
+    def _get_answer(self):
+        """Decoded answer value, as posted by the quiz front-end"""
+        self.ensure_one()
+        return decode_answer(self.question_id.type, self.answer_value)
+
     @api.depends('score', 'question_id.points')
     def _compute_is_correct(self):
         for record in self:
@@ -0,0 +1,189 @@
+from odoo import models, fields, api, tools, _
+from odoo.exceptions import UserError
+from markupsafe import Markup
+from .graders import grade
+from .delivery import _dumps
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class QuizSnapshot(models.Model):
+    _name = 'quiz.snapshot'
+    _description = 'Published Quiz Snapshot'
+    _order = 'quiz_id, version desc'
+
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', required=True, ondelete='cascade', index=True)
+    version = fields.Integer(string='Content Version', required=True, readonly=True)
+    question_count = fields.Integer(string='Questions', readonly=True)
+    payload = fields.Text(string='Delivery Payload', readonly=True,
+                          help='Compact JSON of the delivered questions (answer keys stripped).')
+    answer_key = fields.Text(string='Answer Key', readonly=True,
+                             help='Compact JSON of the compiled answer keys, by question id.')
+    body_html = fields.Text(string='Question Pages', readonly=True,
+                            help='Rendered answer inputs of the questions, by language and question id.')
+    session_count = fields.Integer(string='Sessions', compute='_compute_session_count')
+
+    _sql_constraints = [
+        ('quiz_version_unique', 'unique(quiz_id, version)', 'A quiz can only have one snapshot per content version.'),
+    ]
+
+    def _compute_session_count(self):
+        data = self.env['quiz.session'].sudo()._read_group(
+            [('snapshot_id', 'in', self.ids)], ['snapshot_id'], ['__count'])
+        counts = {snapshot.id: count for snapshot, count in data}
+        for snapshot in self:
+            snapshot.session_count = counts.get(snapshot.id, 0)
+
+    def write(self, vals):
+        raise UserError(_('Quiz snapshots are immutable. Edit the quiz and publish a new version instead.'))
+
+    def unlink(self):
+        if self.env['quiz.session'].sudo().search_count([('snapshot_id', 'in', self.ids)], limit=1):
+            raise UserError(_('Snapshots used by quiz sessions cannot be deleted.'))
+        return super().unlink()
+
+    @api.model
+    def _create_for_quiz(self, quiz):
+        """Freeze the quiz's current content into a new snapshot"""
+        quiz = quiz.sudo()
+        fragments = quiz._get_delivery_fragments()
+        payload = '{"quiz":%s,"questions":{%s}}' % (
+            fragments['quiz'],
+            ','.join('"%d":%s' % (qid, frag) for qid, frag in fragments['questions'].items()),
+        )
+        keys = quiz.question_ids._compile_answer_keys()
+        # The question pages are frozen too: what a pinned session shows must match the key it is graded by
+        bodies = {
+            lang: {question.id: str(question._get_body_fragment())
+                   for question in quiz.question_ids.with_context(lang=lang)}
+            for lang, _name in self.env['res.lang'].get_installed()
+        }
+        # Concurrent starts of a freshly published version all try to freeze it: the first
+        # insert wins, the others wait on the unique index and then read its row (under
+        # REPEATABLE READ they fail to serialize instead, and the request is retried)
+        self.env.cr.execute("""
+            INSERT INTO quiz_snapshot (quiz_id, version, question_count, payload, answer_key, body_html,
+                                       create_uid, create_date, write_uid, write_date)
+            VALUES (%(quiz)s, %(version)s, %(count)s, %(payload)s, %(key)s, %(bodies)s,
+                    %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC')
+            ON CONFLICT (quiz_id, version) DO NOTHING
+         RETURNING id
+        """, {
+            'quiz': quiz.id,
+            'version': quiz.content_version,
+            'count': len(fragments['questions']),
+            'payload': payload,
+            'key': _dumps(keys),
+            'bodies': _dumps(bodies),
+            'uid': self.env.uid,
+        })
+        row = self.env.cr.fetchone()
+        quiz.invalidate_recordset(['snapshot_ids'])
+        if row:
+            return self.sudo().browse(row[0])
+        return self.sudo().search([('quiz_id', '=', quiz.id), ('version', '=', quiz.content_version)], limit=1)
+
+    def _get_delivery_fragments(self):
+        """Same shape as quiz.quiz._get_delivery_fragments, read from the frozen payload"""
+        self.ensure_one()
+        return self._load_fragments(self.id)
+
+    @tools.ormcache('snapshot_id')
+    def _load_fragments(self, snapshot_id):
+        # Snapshots never change: cache forever (until the registry cache is cleared)
+        payload = json.loads(self.browse(snapshot_id).sudo().payload)
+        return {
+            'quiz': _dumps(payload['quiz']),
+            'questions': {int(qid): _dumps(data) for qid, data in payload['questions'].items()},
+        }
+
+    @tools.ormcache('self.id')
+    def _get_answer_keys(self):
+        self.ensure_one()
+        return {int(qid): key for qid, key in json.loads(self.sudo().answer_key or '{}').items()}
+
+    @tools.ormcache('self.id', 'lang')
+    def _get_question_bodies(self, lang):
+        """Frozen answer inputs of the questions in ``lang``: {question id: html}, empty if not rendered"""
+        self.ensure_one()
+        bodies = json.loads(self.sudo().body_html or '{}').get(lang) or {}
+        return {int(qid): Markup(html) for qid, html in bodies.items()}
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    snapshot_ids = fields.One2many('quiz.snapshot', 'quiz_id', string='Snapshots')
+    current_snapshot_id = fields.Many2one('quiz.snapshot', string='Current Snapshot',
+                                          compute='_compute_current_snapshot')
+
+    @api.depends('snapshot_ids', 'content_version')
+    def _compute_current_snapshot(self):
+        for quiz in self:
+            quiz.current_snapshot_id = quiz.snapshot_ids.filtered(lambda s: s.version == quiz.content_version)[:1]
+
+    def write(self, vals):
+        res = super().write(vals)
+        if vals.get('published'):
+            for quiz in self:
+                quiz._get_current_snapshot()
+        return res
+
+    def _get_current_snapshot(self):
+        """Return the snapshot of the current content version, creating it if the quiz is published"""
+        self.ensure_one()
+        snapshot = self.env['quiz.snapshot'].sudo().search(
+            [('quiz_id', '=', self.id), ('version', '=', self.content_version)], limit=1)
+        if not snapshot and self.published:
+            snapshot = self.env['quiz.snapshot']._create_for_quiz(self)
+            _logger.info("Created snapshot v%s for quiz %s", snapshot.version, self.id)
+        return snapshot
+
+
+class QuizSession(models.Model):
+    _inherit = 'quiz.session'
+
+    snapshot_id = fields.Many2one('quiz.snapshot', string='Snapshot', ondelete='set null', readonly=True,
+                                  help='Published quiz version this session is delivered and graded against.')
+
+    def _get_delivery_fragments(self):
+        self.ensure_one()
+        if self.snapshot_id:
+            return self.snapshot_id._get_delivery_fragments()
+        return super()._get_delivery_fragments()
+
+    def _get_question_display(self, question):
+        """Stem, points and answer inputs of ``question`` as this session delivers them.
+
+        Pinned sessions read them from their snapshot, so an edit made during
+        the exam never shows content the session is not graded against. The
+        live question is only used when it is still the snapshot's version;
+        otherwise ``body`` is None and the page refuses to show it.
+        """
+        self.ensure_one()
+        snapshot = self.snapshot_id
+        if not snapshot:
+            return {'html': question.question_html, 'points': question.points, 'body': question._get_body_fragment()}
+        live = snapshot.version == self.quiz_id.content_version
+        fragment = snapshot._get_delivery_fragments()['questions'].get(question.id)
+        data = json.loads(fragment) if fragment else {}
+        body = snapshot._get_question_bodies(self.env.lang or 'en_US').get(question.id)
+        if body is None and live:
+            body = question._get_body_fragment()
+        return {
+            'html': Markup(data['html']) if data else question.question_html,
+            'points': data['points'] if data else question.points,
+            'body': body,
+        }
+
+    def _grade_from_snapshot(self, question, answer_data):
+        """Grade against the pinned snapshot key, or return None when there is none to use"""
+        self.ensure_one()
+        if not self.snapshot_id:
+            return None
+        key = self.snapshot_id._get_answer_keys().get(question.id)
+        if key is None:
+            return None
+        return grade(key, answer_data)
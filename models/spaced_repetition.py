@@ -0,0 +1,207 @@
+"""Spaced-repetition scheduling of the questions a user practices in Tutor mode.
+
+Every user × question pair answered in a tutor session has one
+``quiz.review.item`` row holding its SM-2 state (repetitions, interval, ease)
+and the date it is due again. Graded answers move the rows with a single
+UPSERT per batch; a tutor session then starts with the user's due questions,
+read with one query on the (user, quiz, due date) index, topped up with
+questions the user has never seen.
+"""
+from odoo import models, fields, api, tools
+from datetime import timedelta
+
+REVIEW_MODE_KEY = 'tutor'
+DUE_INDEX = 'quiz_review_item_due_idx'
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+# SM-2 answer quality of a correct and a wrong answer (0-5 scale)
+CORRECT_QUALITY = 4
+WRONG_QUALITY = 1
+DEFAULT_SESSION_LENGTH = 20
+
+
+def sm2(repetitions, interval, ease, correct):
+    """Next SM-2 state ``(repetitions, interval in days, ease)`` after an answer"""
+    quality = CORRECT_QUALITY if correct else WRONG_QUALITY
+    if correct:
+        if repetitions == 0:
+            interval = 1
+        elif repetitions == 1:
+            interval = 6
+        else:
+            interval = max(1, round(interval * ease))
+        repetitions += 1
+    else:
+        repetitions, interval = 0, 1
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return repetitions, interval, ease
+
+
+class QuizReviewItem(models.Model):
+    _name = 'quiz.review.item'
+    _description = 'Spaced Repetition Review Item'
+    _order = 'due_date, id'
+
+    user_id = fields.Many2one('res.users', string='User', required=True, ondelete='cascade', readonly=True)
+    question_id = fields.Many2one('quiz.question', string='Question', required=True, ondelete='cascade',
+                                  readonly=True)
+    quiz_id = fields.Many2one('quiz.quiz', string='Quiz', required=True, ondelete='cascade', readonly=True)
+    repetitions = fields.Integer(string='Repetitions', readonly=True,
+                                 help='Correct answers in a row since the last lapse')
+    interval_days = fields.Integer(string='Interval (days)', readonly=True)
+    ease = fields.Float(string='Ease', default=DEFAULT_EASE, readonly=True, digits=(3, 2))
+    lapses = fields.Integer(string='Lapses', readonly=True)
+    due_date = fields.Date(string='Due', required=True, readonly=True)
+    last_review = fields.Datetime(string='Last Review', readonly=True)
+    # Regrading an answer already counted must not reschedule the question again
+    last_response_id = fields.Integer(string='Last Response', readonly=True)
+
+    _sql_constraints = [
+        ('user_question_unique', 'unique(user_id, question_id)', 'One review item per user and question.'),
+    ]
+
+    def init(self):
+        super().init()
+        tools.create_index(self.env.cr, DUE_INDEX, self._table, ['user_id', 'quiz_id', 'due_date'])
+
+    @api.model
+    def _record_answers(self, user, responses):
+        """Move the review items of ``user`` with the graded ``responses`` (latest answer per question wins)"""
+        latest = {}
+        for response in responses.sorted('id'):
+            latest[response.question_id.id] = response
+        if not latest:
+            return 0
+        cr = self.env.cr
+        self.flush_model()
+        cr.execute("""
+            SELECT question_id, repetitions, interval_days, ease, lapses, last_response_id
+              FROM quiz_review_item
+             WHERE user_id = %s AND question_id IN %s
+               FOR UPDATE
+        """, [user.id, tuple(latest)])
+        states = {row[0]: row[1:] for row in cr.fetchall()}
+        today = fields.Date.context_today(self.with_context(tz=user.tz))
+        rows = []
+        for question_id, response in latest.items():
+            repetitions, interval, ease, lapses, last_response_id = states.get(
+                question_id, (0, 0, DEFAULT_EASE, 0, 0))
+            if last_response_id and last_response_id >= response.id:
+                continue
+            repetitions, interval, ease = sm2(repetitions, interval, ease, response.is_correct)
+            rows.append((question_id, response.question_id.quiz_id.id, repetitions, interval, ease,
+                         lapses + (0 if response.is_correct else 1), today + timedelta(days=interval), response.id))
+        if not rows:
+            return 0
+        columns = list(zip(*rows))
+        cr.execute("""
+            INSERT INTO quiz_review_item (user_id, question_id, quiz_id, repetitions, interval_days, ease, lapses,
+                                          due_date, last_response_id, last_review,
+                                          create_uid, create_date, write_uid, write_date)
+            SELECT %(user)s, item.question_id, item.quiz_id, item.repetitions, item.interval_days, item.ease,
+                   item.lapses, item.due_date, item.response_id, now() at time zone 'UTC',
+                   %(uid)s, now() at time zone 'UTC', %(uid)s, now() at time zone 'UTC'
+              FROM unnest(%(questions)s::integer[], %(quizzes)s::integer[], %(repetitions)s::integer[],
+                          %(intervals)s::integer[], %(eases)s::float8[], %(lapses)s::integer[],
+                          %(dues)s::date[], %(responses)s::integer[])
+                   AS item (question_id, quiz_id, repetitions, interval_days, ease, lapses, due_date, response_id)
+            ON CONFLICT (user_id, question_id) DO UPDATE
+               SET quiz_id = EXCLUDED.quiz_id,
+                   repetitions = EXCLUDED.repetitions,
+                   interval_days = EXCLUDED.interval_days,
+                   ease = EXCLUDED.ease,
+                   lapses = EXCLUDED.lapses,
+                   due_date = EXCLUDED.due_date,
+                   last_response_id = EXCLUDED.last_response_id,
+                   last_review = EXCLUDED.last_review,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+        """, {
+            'user': user.id,
+            'uid': self.env.uid,
+            'questions': list(columns[0]),
+            'quizzes': list(columns[1]),
+            'repetitions': list(columns[2]),
+            'intervals': list(columns[3]),
+            'eases': list(columns[4]),
+            'lapses': list(columns[5]),
+            'dues': list(columns[6]),
+            'responses': list(columns[7]),
+        })
+        self.invalidate_model()
+        return len(rows)
+
+    @api.model
+    def _get_due_question_ids(self, user, quiz, limit):
+        """Questions of ``quiz`` due for ``user`` today, most overdue first: one query on the due index"""
+        self.flush_model()
+        self.env.cr.execute("""
+            SELECT question_id
+              FROM quiz_review_item
+             WHERE user_id = %s AND quiz_id = %s AND due_date <= %s
+          ORDER BY due_date, id
+             LIMIT %s
+        """, [user.id, quiz.id, fields.Date.context_today(self.with_context(tz=user.tz)), limit])
+        return [row[0] for row in self.env.cr.fetchall()]
+
+
+class Quiz(models.Model):
+    _inherit = 'quiz.quiz'
+
+    def _get_review_question_ids(self, user, limit=None):
+        """Plan of a tutor session of ``user``: due questions, then questions never reviewed, in quiz order.
+
+        Empty when nothing is due and everything was seen; the session then
+        practices the quiz as usual.
+        """
+        self.ensure_one()
+        limit = limit or self.question_limit or DEFAULT_SESSION_LENGTH
+        question_ids = set(self.question_ids.ids)
+        due = [qid for qid in self.env['quiz.review.item'].sudo()._get_due_question_ids(user, self, limit)
+               if qid in question_ids]
+        if len(due) < limit:
+            self.env.cr.execute("""
+                SELECT q.id
+                  FROM quiz_question q
+                 WHERE q.quiz_id = %s
+                   AND NOT EXISTS (SELECT 1 FROM quiz_review_item i WHERE i.user_id = %s AND i.question_id = q.id)
+              ORDER BY q.sequence, q.id
+                 LIMIT %s
+            """, [self.id, user.id, limit - len(due)])
+            due += [row[0] for row in self.env.cr.fetchall()]
+        return due
+
+
+class QuizSession(models.Model):
+    _inherit = 'quiz.session'
+
+    def _is_review_session(self):
+        """Whether the answers of the session feed the user's spaced-repetition schedule"""
+        self.ensure_one()
+        return bool(self.user_id and not self.user_id._is_public() and self.mode_id.key == REVIEW_MODE_KEY)
+
+
+class QuizResponse(models.Model):
+    _inherit = 'quiz.response'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        responses = super().create(vals_list)
+        responses.browse([r.id for r, vals in zip(responses, vals_list) if 'score' in vals])._schedule_reviews()
+        return responses
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'score' in vals:
+            self._schedule_reviews()
+        return res
+
+    def _schedule_reviews(self):
+        """Feed the graded responses of tutor sessions into the review schedules of their users"""
+        by_user = {}
+        for response in self:
+            if response.session_id._is_review_session():
+                by_user.setdefault(response.session_id.user_id, self.browse())
+                by_user[response.session_id.user_id] |= response
+        for user, responses in by_user.items():
+            self.env['quiz.review.item'].sudo()._record_answers(user, responses)
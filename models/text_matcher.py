@@ -0,0 +1,168 @@
+"""Normalization and keyword matching for free-text answers.
+
+Keywords are compiled once into an Aho-Corasick automaton, so finding every
+keyword in an answer costs a single pass over the normalized text whatever
+the number of keywords. Optional fuzzy matching accepts answer words within a
+bounded edit distance of a keyword for keywords that were not found exactly.
+"""
+from collections import deque
+from functools import lru_cache
+import re
+import unicodedata
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]+', re.UNICODE)
+_WHITESPACE_RE = re.compile(r'\s+', re.UNICODE)
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+def _strip_punctuation(match):
+    """Replacement of a punctuation run: a space, except for symbols that are part of a token.
+
+    Kept: ``+``/``#`` right after a word (c++, c#), ``.`` between two word
+    characters (3.14) and a minus sign starting a number (-5).
+    """
+    text, run = match.string, match.group()
+    start, end = match.span()
+    before = text[start - 1] if start else ''
+    after = text[end] if end < len(text) else ''
+    word_before = _is_word_char(before)
+    if word_before:
+        suffix = run.lstrip('+#')
+        if len(suffix) < len(run):
+            return run[:len(run) - len(suffix)] + (' ' if suffix else '')
+        if run == '.' and _is_word_char(after):
+            return run
+    if run[-1] == '-' and after.isdigit() and (len(run) > 1 or not word_before):
+        return ' ' * (len(run) > 1) + '-'
+    return ' '
+
+
+def normalize_text(text, case_sensitive=False):
+    """Strip accents and punctuation, collapse whitespace and (by default) casefold.
+
+    Symbols significant inside a token survive (see ``_strip_punctuation``),
+    so "C++", "-5" and "3.14" do not shrink to "c", "5" and "3 14".
+    """
+    if not text:
+        return ''
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    if not case_sensitive:
+        text = text.casefold()
+    text = _PUNCTUATION_RE.sub(_strip_punctuation, text)
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+def split_keywords(keywords, case_sensitive=False):
+    """Normalize a comma-separated keyword string into a tuple of unique, non-empty keywords"""
+    seen = []
+    for keyword in (keywords or '').split(','):
+        keyword = normalize_text(keyword, case_sensitive)
+        if keyword and keyword not in seen:
+            seen.append(keyword)
+    return tuple(seen)
+
+
+def bounded_edit_distance(a, b, max_distance):
+    """Levenshtein distance between a and b, or max_distance + 1 as soon as it is exceeded"""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    if len(a) > len(b):
+        a, b = b, a
+    previous = list(range(len(a) + 1))
+    for i, cb in enumerate(b, 1):
+        current = [i]
+        row_min = i
+        for j, ca in enumerate(a, 1):
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            current.append(value)
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over a fixed tuple of normalized keywords"""
+
+    __slots__ = ('keywords', 'max_distance', '_goto', '_fail', '_out', '_word_counts')
+
+    def __init__(self, keywords, max_distance=0):
+        self.keywords = tuple(keywords)
+        self.max_distance = max_distance
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [0]
+        for index, keyword in enumerate(self.keywords):
+            node = 0
+            for ch in keyword:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(0)
+                node = nxt
+            self._out[node] |= 1 << index
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] |= self._out[self._fail[nxt]]
+        self._word_counts = tuple(len(keyword.split(' ')) for keyword in self.keywords)
+
+    def found_mask(self, text):
+        """Bitmask of the keywords occurring (as substrings) in the normalized text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        mask = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            mask |= out[node]
+        if self.max_distance and mask != (1 << len(self.keywords)) - 1:
+            mask |= self._fuzzy_mask(text, mask)
+        return mask
+
+    def _fuzzy_mask(self, text, mask):
+        words = text.split(' ')
+        fuzzy = 0
+        for index, keyword in enumerate(self.keywords):
+            if mask & (1 << index):
+                continue
+            size = self._word_counts[index]
+            # Very short keywords would match almost anything within the threshold
+            if len(keyword) <= self.max_distance:
+                continue
+            for start in range(0, max(len(words) - size + 1, 0)):
+                candidate = ' '.join(words[start:start + size])
+                if bounded_edit_distance(candidate, keyword, self.max_distance) <= self.max_distance:
+                    fuzzy |= 1 << index
+                    break
+        return fuzzy
+
+    def count(self, text):
+        """Number of distinct keywords found in the normalized text"""
+        return bin(self.found_mask(text)).count('1')
+
+    def any(self, text):
+        return bool(self.found_mask(text))
+
+
+@lru_cache(maxsize=4096)
+def get_matcher(keywords, max_distance=0):
+    """Shared compiled matcher for a tuple of normalized keywords"""
+    return KeywordMatcher(keywords, max_distance)
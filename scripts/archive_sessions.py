@@ -0,0 +1,37 @@
+"""Archive finished quiz sessions in bounded batches.
+
+From an Odoo shell:
+    from odoo.addons.quiz_engine_pro.scripts.archive_sessions import archive_sessions
+    archive_sessions(env, batch_size=1000, max_batches=10)
+
+Or standalone:
+    python archive_sessions.py -c /etc/odoo/odoo.conf -d mydb --batch-size 1000 --max-batches 10
+"""
+import argparse
+
+
+def archive_sessions(env, batch_size=1000, max_batches=None):
+    """Archive due sessions, committing after every batch; returns the number archived"""
+    return env['quiz.session.archive'].sudo()._archive_sessions(
+        batch_size=batch_size, max_batches=max_batches, commit=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-c', '--config', required=True, help='Odoo configuration file')
+    parser.add_argument('-d', '--database', required=True)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--max-batches', type=int, default=None)
+    args = parser.parse_args()
+
+    import odoo
+    from odoo import SUPERUSER_ID, api
+    odoo.tools.config.parse_config(['-c', args.config])
+    with odoo.registry(args.database).cursor() as cr:
+        env = api.Environment(cr, SUPERUSER_ID, {})
+        count = archive_sessions(env, args.batch_size, args.max_batches)
+        print("Archived %d sessions" % count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""Start-up of a spawned re-grade worker process, run with ``runpy.run_path``.
+
+A spawned interpreter knows nothing of the addons path, and importing the
+addon package would load all its models and controllers. The packages
+named in ``PACKAGES`` ((name, directory) pairs, set by the caller through
+``init_globals``) are registered as bare packages instead, so unpickling a
+grading function imports the pure grading modules alone. See
+``quiz.regrade.wizard._regrade``.
+"""
+import sys
+import types
+
+
+def register_package(name, path=None):
+    module = sys.modules.get(name)
+    if module is None:
+        module = types.ModuleType(name)
+        module.__path__ = []
+        sys.modules[name] = module
+        parent, _dot, child = name.rpartition('.')
+        if parent:
+            setattr(sys.modules[parent], child, module)
+    if path and path not in module.__path__:
+        module.__path__.append(path)
+    return module
+
+
+for package_name, package_path in globals().get('PACKAGES', ()):
+    register_package(package_name, package_path)
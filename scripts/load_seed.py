@@ -0,0 +1,175 @@
+"""Synthetic question banks for load tests and benchmarks.
+
+From an Odoo shell:
+    from odoo.addons.quiz_engine_pro.scripts.load_seed import seed_quiz
+    quiz = seed_quiz(env, 'load-test', per_type=5, size=4)
+    env.cr.commit()
+
+``size`` scales every question: choices, blanks, tokens, matrix rows and
+columns, passage sub-questions. ``random_answer`` builds an answer in the
+format posted by the quiz front-end from a question's delivery data (see
+quiz.quiz._get_delivery_fragments), so answers can be generated without
+knowing the answer key.
+"""
+import json
+import random
+
+QUESTION_TYPES = (
+    'mcq_single', 'mcq_multiple', 'fill_blank', 'match', 'drag_text', 'drag_zone',
+    'dropdown_blank', 'step_sequence', 'sentence_completion', 'matrix', 'passage',
+)
+
+WORDS = ('alpha beta gamma delta epsilon zeta theta kappa lambda sigma omega '
+         'river mountain forest desert ocean valley island canyon glacier meadow').split()
+
+
+def _words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def question_vals(quiz_id, question_type, size=4, rng=None):
+    """Create values for one question of the given type; child records inline"""
+    rng = rng or random.Random()
+    size = max(size, 2)
+    vals = {
+        'quiz_id': quiz_id,
+        'type': question_type,
+        'points': float(size),
+        'question_html': '<p>%s?</p>' % _words(rng, 8),
+    }
+    if question_type in ('mcq_single', 'mcq_multiple'):
+        correct = {0} if question_type == 'mcq_single' else set(rng.sample(range(size), max(size // 2, 1)))
+        vals['choice_ids'] = [(0, 0, {'text': _words(rng, 3), 'is_correct': i in correct}) for i in range(size)]
+    elif question_type == 'fill_blank':
+        vals['question_html'] = '<p>%s</p>' % ' '.join('%s {{%d}}' % (_words(rng, 4), i + 1) for i in range(size))
+        vals['fill_blank_answer_ids'] = [(0, 0, {'blank_number': i + 1, 'answer_text': rng.choice(WORDS)})
+                                         for i in range(size)]
+    elif question_type == 'match':
+        vals['match_pair_ids'] = [(0, 0, {'left_text': '%s %d' % (rng.choice(WORDS), i),
+                                          'right_text': '%s %d' % (rng.choice(WORDS), i)}) for i in range(size)]
+    elif question_type in ('drag_text', 'drag_zone', 'sentence_completion'):
+        if question_type == 'sentence_completion':
+            vals['question_html'] = '<p>%s</p>' % ' '.join('%s {blank}' % _words(rng, 3) for _ in range(size))
+        vals['drag_token_ids'] = [(0, 0, {'text': '%s %d' % (rng.choice(WORDS), i), 'is_correct': True,
+                                          'correct_position': i}) for i in range(size)]
+    elif question_type == 'dropdown_blank':
+        vals['text_template'] = '<p>%s</p>' % ' '.join('%s {{%d}}' % (_words(rng, 3), i + 1) for i in range(size))
+        vals['question_html'] = vals['text_template']
+        vals['blank_ids'] = [(0, 0, {
+            'blank_number': i + 1,
+            'input_type': 'dropdown',
+            'option_ids': [(0, 0, {'label': '%s %d' % (rng.choice(WORDS), j), 'is_correct': j == 0})
+                           for j in range(3)],
+        }) for i in range(size)]
+    elif question_type == 'step_sequence':
+        vals['sequence_item_ids'] = [(0, 0, {'label': 'Step %d' % (i + 1), 'sequence': i, 'correct_position': i})
+                                     for i in range(size)]
+    elif question_type == 'matrix':
+        vals['matrix_row_ids'] = [(0, 0, {'name': 'Row %d' % (i + 1), 'sequence': i}) for i in range(size)]
+        vals['matrix_column_ids'] = [(0, 0, {'name': 'Column %d' % (i + 1), 'sequence': i}) for i in range(size)]
+    elif question_type == 'passage':
+        subs = []
+        for i in range(size):
+            if i % 2:
+                subs.append((0, 0, {
+                    'question_text': '<p>%s?</p>' % _words(rng, 6),
+                    'question_type': 'text_long',
+                    'points': 1.0,
+                    'correct_answer': ', '.join(rng.sample(WORDS, 3)),
+                }))
+            else:
+                subs.append((0, 0, {
+                    'question_text': '<p>%s?</p>' % _words(rng, 6),
+                    'question_type': 'mcq_single',
+                    'points': 1.0,
+                    'choice_ids': [(0, 0, {'text': _words(rng, 2), 'is_correct': j == 0}) for j in range(4)],
+                }))
+        vals['passage_ids'] = [(0, 0, {
+            'name': 'Passage',
+            'passage_content': '<p>%s</p>' % _words(rng, 40 * size),
+            'sub_question_ids': subs,
+        })]
+    return vals
+
+
+def create_question(env, quiz, question_type, size=4, rng=None):
+    rng = rng or random.Random()
+    question = env['quiz.question'].create(question_vals(quiz.id, question_type, size, rng))
+    if question_type == 'matrix':
+        # One correct cell per row
+        cells = []
+        for row in question.matrix_row_ids:
+            correct = rng.choice(question.matrix_column_ids)
+            cells += [{'row_id': row.id, 'column_id': col.id, 'is_correct': col == correct}
+                      for col in question.matrix_column_ids]
+        env['quiz.matrix.cell'].create(cells)
+    return question
+
+
+def seed_quiz(env, slug, per_type=5, size=4, types=QUESTION_TYPES, seed=42):
+    """Create (or replace) a published public quiz with ``per_type`` questions of each type"""
+    rng = random.Random(seed)
+    env['quiz.quiz'].search([('slug', '=', slug)]).unlink()
+    quiz = env['quiz.quiz'].create({
+        'name': 'Load Test %s' % slug,
+        'slug': slug,
+        'access_mode': 'public',
+    })
+    for question_type in types:
+        for _i in range(per_type):
+            create_question(env, quiz, question_type, size, rng)
+    quiz.published = True
+    return quiz
+
+
+def random_answer(question, rng=None):
+    """Plausible answer for a question given as delivery data (a dict or its JSON)"""
+    rng = rng or random.Random()
+    if isinstance(question, str):
+        question = json.loads(question)
+    question_type = question['type']
+    if question_type == 'mcq_single':
+        return str(rng.choice(question['choices'])['id'])
+    if question_type == 'mcq_multiple':
+        choices = question['choices']
+        return [str(c['id']) for c in rng.sample(choices, rng.randint(1, len(choices)))]
+    if question_type == 'fill_blank':
+        return {str(number): rng.choice(WORDS) for number in question.get('blanks', [])}
+    if question_type == 'match':
+        right = [r['id'] for r in question['pairs']['right']]
+        rng.shuffle(right)
+        return [{'left_id': left['id'], 'right_id': right_id}
+                for left, right_id in zip(question['pairs']['left'], right)]
+    if question_type in ('drag_text', 'drag_zone'):
+        tokens = [t['id'] for t in question.get('tokens', [])]
+        rng.shuffle(tokens)
+        return [{'zone': position, 'token_id': token_id} for position, token_id in enumerate(tokens)]
+    if question_type == 'sentence_completion':
+        tokens = [t['id'] for t in question.get('tokens', [])]
+        rng.shuffle(tokens)
+        return [{'zone_id': 'blank_%d' % position, 'token_id': token_id} for position, token_id in enumerate(tokens)]
+    if question_type == 'dropdown_blank':
+        return [{'blank_id': blank['id'], 'option_id': rng.choice(blank['options'])['id']}
+                for blank in question.get('dropdowns', []) if blank['options']]
+    if question_type == 'step_sequence':
+        steps = [s['id'] for s in question.get('steps', [])]
+        rng.shuffle(steps)
+        return [{'step_id': step_id, 'position': position} for position, step_id in enumerate(steps)]
+    if question_type == 'matrix':
+        matrix = question.get('matrix', {'rows': [], 'columns': []})
+        answer = {}
+        for row in matrix['rows']:
+            chosen = rng.choice(matrix['columns'])['id'] if matrix['columns'] else None
+            for col in matrix['columns']:
+                answer['cell_%d_%d' % (row['id'], col['id'])] = col['id'] == chosen
+        return answer
+    if question_type == 'passage':
+        answer = {}
+        for passage in question.get('passages', [])[:1]:
+            for sub in passage['sub_questions']:
+                if sub.get('choices'):
+                    answer['sub_q_%d' % sub['id']] = str(rng.choice(sub['choices'])['id'])
+                else:
+                    answer[str(sub['id'])] = _words(rng, 12)
+        return answer
+    return None
@@ -0,0 +1,154 @@
+"""Load test of the public quiz flow against a running Odoo server.
+
+Seed a bank first (Odoo shell, see load_seed.py), then:
+    python load_test.py --url http://localhost:8069 --slug load-test --users 50 --iterations 4 \\
+        --dsn "dbname=mydb user=odoo"
+
+Every virtual user walks the real routes: quiz list, quiz page, start,
+payload, each question page (GET then POST), results; with ``--flow
+one-page`` the answers are posted at once to /quiz/<slug>/submit instead.
+Reports p50/p95/p99 latency per route, throughput and, when ``--dsn`` points
+at the Odoo database with pg_stat_statements enabled, SQL queries per request.
+Requires the ``requests`` package.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+try:
+    from .load_seed import random_answer
+except ImportError:
+    from load_seed import random_answer
+
+CSRF_RE = re.compile(r'name="csrf_token"\s+value="([^"]+)"')
+SESSION_RE = re.compile(r'[?&]session=([\w-]+)')
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.timings = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def request(self, http, label, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = http.request(method, url, timeout=60, **kwargs)
+        except requests.RequestException:
+            with self.lock:
+                self.errors[label] += 1
+            return None
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.timings[label].append(elapsed)
+            if response.status_code >= 400:
+                self.errors[label] += 1
+        return response
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(int(round(pct / 100.0 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def run_user(base, slug, flow, iterations, recorder, seed):
+    rng = random.Random(seed)
+    http = requests.Session()
+    for _i in range(iterations):
+        recorder.request(http, 'list', 'GET', f'{base}/quiz')
+        page = recorder.request(http, 'quiz', 'GET', f'{base}/quiz/{slug}')
+        if page is None:
+            continue
+        if flow == 'one-page':
+            run_one_page(http, base, slug, page, recorder, rng)
+        else:
+            run_per_question(http, base, slug, recorder, rng)
+
+
+def run_per_question(http, base, slug, recorder, rng):
+    start = recorder.request(http, 'start', 'POST', f'{base}/quiz/{slug}/start',
+                             data={'participant_name': 'Load User'}, allow_redirects=False)
+    match = start is not None and SESSION_RE.search(start.headers.get('Location', ''))
+    if not match:
+        return
+    token = match.group(1)
+    payload = recorder.request(http, 'payload', 'GET', f'{base}/quiz/session/{token}/payload')
+    if payload is None or payload.status_code != 200:
+        return
+    questions = payload.json()['questions']
+    for number, question in enumerate(questions, 1):
+        url = f'{base}/quiz/{slug}/question/{number}?session={token}'
+        recorder.request(http, 'question_get', 'GET', url)
+        answer = random_answer(question, rng)
+        recorder.request(http, 'question_post', 'POST', url, allow_redirects=False,
+                         data={'answer_data': answer if isinstance(answer, str) else json.dumps(answer)})
+    recorder.request(http, 'results', 'GET', f'{base}/quiz/session/{token}/results')
+
+
+def run_one_page(http, base, slug, page, recorder, rng):
+    csrf = CSRF_RE.search(page.text)
+    question_ids = sorted(set(int(qid) for qid in re.findall(r'name="question_(\d+)"', page.text)))
+    data = [('csrf_token', csrf.group(1) if csrf else '')]
+    for qid in question_ids:
+        # Without the delivery data, answer with the first option rendered for the question
+        option = re.search(r'name="question_%d"[^>]*value="([^"]*)"' % qid, page.text)
+        data.append(('question_%d' % qid, option.group(1) if option else ''))
+    submit = recorder.request(http, 'submit', 'POST', f'{base}/quiz/{slug}/submit', data=data, allow_redirects=False)
+    location = submit.headers.get('Location') if submit is not None else None
+    if location:
+        recorder.request(http, 'results', 'GET', requests.compat.urljoin(base, location))
+
+
+def query_count(dsn):
+    import psycopg2
+    with psycopg2.connect(dsn) as conn, conn.cursor() as cr:
+        cr.execute("""
+            SELECT COALESCE(sum(calls), 0)
+              FROM pg_stat_statements
+             WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+        """)
+        return cr.fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:8069')
+    parser.add_argument('--slug', default='load-test')
+    parser.add_argument('--users', type=int, default=10, help='Concurrent virtual users')
+    parser.add_argument('--iterations', type=int, default=1, help='Quiz attempts per virtual user')
+    parser.add_argument('--flow', choices=('per-question', 'one-page'), default='per-question')
+    parser.add_argument('--dsn', help='libpq DSN of the Odoo database, to count queries through pg_stat_statements')
+    args = parser.parse_args()
+
+    recorder = Recorder()
+    queries_before = query_count(args.dsn) if args.dsn else None
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        for user in range(args.users):
+            pool.submit(run_user, args.url.rstrip('/'), args.slug, args.flow, args.iterations, recorder, user)
+    duration = time.perf_counter() - started
+    total = sum(len(t) for t in recorder.timings.values())
+
+    print("%-14s %8s %8s %8s %8s %8s" % ('route', 'count', 'errors', 'p50 ms', 'p95 ms', 'p99 ms'))
+    for label, timings in sorted(recorder.timings.items()):
+        print("%-14s %8d %8d %8.1f %8.1f %8.1f" % (
+            label, len(timings), recorder.errors[label],
+            percentile(timings, 50) * 1000, percentile(timings, 95) * 1000, percentile(timings, 99) * 1000))
+    print("\n%d requests in %.1fs: %.1f req/s" % (total, duration, total / duration if duration else 0))
+    if queries_before is not None and total:
+        queries = query_count(args.dsn) - queries_before
+        print("%d SQL statements: %.1f per request" % (queries, queries / total))
+
+
+if __name__ == '__main__':
+    main()
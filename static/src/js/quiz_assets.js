@@ -0,0 +1,59 @@
+// Loads quiz asset bundles after the page was rendered, e.g. for questions
+// rendered client-side. Pages rendered by the server already include the
+// bundles of their question plan.
+(function () {
+    "use strict";
+
+    var loaded = {};
+
+    function addNode(item) {
+        return new Promise(function (resolve, reject) {
+            var node;
+            if (item.type === 'link') {
+                node = document.createElement('link');
+                node.rel = 'stylesheet';
+                node.href = item.src;
+            } else if (item.type === 'script' && item.src) {
+                node = document.createElement('script');
+                node.src = item.src;
+                node.async = false;
+            } else {
+                resolve();
+                return;
+            }
+            node.onload = function () { resolve(); };
+            node.onerror = function () { reject(new Error('Could not load ' + item.src)); };
+            document.head.appendChild(node);
+        });
+    }
+
+    function loadBundle(name) {
+        if (!loaded[name]) {
+            loaded[name] = fetch('/web/bundle/' + encodeURIComponent(name))
+                .then(function (response) { return response.json(); })
+                .then(function (items) { return Promise.all(items.map(addNode)); })
+                .catch(function (error) {
+                    delete loaded[name];
+                    throw error;
+                });
+        }
+        return loaded[name];
+    }
+
+    function markPresent() {
+        document.querySelectorAll('[data-quiz-asset-bundles]').forEach(function (el) {
+            el.getAttribute('data-quiz-asset-bundles').split(',').forEach(function (name) {
+                if (name) {
+                    loaded[name] = Promise.resolve();
+                }
+            });
+        });
+    }
+
+    window.QuizAssets = {
+        load: function (names) {
+            markPresent();
+            return Promise.all((names || []).map(loadBundle));
+        },
+    };
+})();
@@ -0,0 +1,460 @@
+// Offline quiz player.
+//
+// Downloads the session's question plan once, renders one question at a
+// time, keeps the answers in localStorage and submits them as one bundle
+// signed with HMAC-SHA256 under the session key from the payload. A failed
+// submission (no network, server unreachable) is retried until it gets an
+// answer; reloading the page resumes from the stored state.
+(function () {
+    "use strict";
+
+    var RETRY_DELAYS = [2000, 5000, 10000, 30000];
+
+    function storageKey(token) {
+        return 'quiz_offline:' + token;
+    }
+
+    function loadState(token) {
+        try {
+            return JSON.parse(window.localStorage.getItem(storageKey(token)) || 'null');
+        } catch (e) {
+            return null;
+        }
+    }
+
+    function saveState(token, state) {
+        try {
+            window.localStorage.setItem(storageKey(token), JSON.stringify(state));
+        } catch (e) {
+            // Storage full or disabled: answers stay in memory for this page
+        }
+    }
+
+    function el(tag, attrs, text) {
+        var node = document.createElement(tag);
+        Object.keys(attrs || {}).forEach(function (name) {
+            node.setAttribute(name, attrs[name]);
+        });
+        if (text !== undefined && text !== null) {
+            node.textContent = text;
+        }
+        return node;
+    }
+
+    function select(options, value, placeholder) {
+        var node = el('select', {'class': 'form-select form-select-sm d-inline-block w-auto'});
+        node.appendChild(el('option', {value: ''}, placeholder || '—'));
+        options.forEach(function (option) {
+            var opt = el('option', {value: String(option.id)}, option.text);
+            if (String(option.id) === String(value)) {
+                opt.selected = true;
+            }
+            node.appendChild(opt);
+        });
+        return node;
+    }
+
+    // Renderers: build the inputs of a question and call save(answer) on every change.
+    // Answers have the shape the one-page and per-question forms post.
+    var RENDERERS = {
+        mcq_single: function (q, answer, save) {
+            var box = el('div');
+            (q.choices || []).forEach(function (choice) {
+                var label = el('label', {'class': 'form-check d-block'});
+                var input = el('input', {type: 'radio', name: 'q' + q.id, 'class': 'form-check-input', value: String(choice.id)});
+                input.checked = String(answer) === String(choice.id);
+                input.addEventListener('change', function () { save(String(choice.id)); });
+                label.appendChild(input);
+                label.appendChild(el('span', {'class': 'form-check-label'}, choice.text));
+                box.appendChild(label);
+            });
+            return box;
+        },
+        mcq_multiple: function (q, answer, save) {
+            var box = el('div');
+            var chosen = (answer || []).map(String);
+            (q.choices || []).forEach(function (choice) {
+                var label = el('label', {'class': 'form-check d-block'});
+                var input = el('input', {type: 'checkbox', 'class': 'form-check-input', value: String(choice.id)});
+                input.checked = chosen.indexOf(String(choice.id)) !== -1;
+                input.addEventListener('change', function () {
+                    save(Array.prototype.map.call(box.querySelectorAll('input:checked'), function (i) { return i.value; }));
+                });
+                label.appendChild(input);
+                label.appendChild(el('span', {'class': 'form-check-label'}, choice.text));
+                box.appendChild(label);
+            });
+            return box;
+        },
+        fill_blank: function (q, answer, save) {
+            var box = el('div');
+            var value = Object.assign({}, answer || {});
+            (q.blanks || []).forEach(function (number) {
+                var row = el('div', {'class': 'mb-2'});
+                row.appendChild(el('label', {'class': 'me-2'}, 'Blank ' + number));
+                var input = el('input', {type: 'text', 'class': 'form-control form-control-sm d-inline-block w-auto'});
+                input.value = value[String(number)] || '';
+                input.addEventListener('input', function () {
+                    value[String(number)] = input.value;
+                    save(value);
+                });
+                row.appendChild(input);
+                box.appendChild(row);
+            });
+            return box;
+        },
+        match: function (q, answer, save) {
+            var box = el('div');
+            var pairs = q.pairs || {left: [], right: []};
+            var current = {};
+            (answer || []).forEach(function (a) { current[a.left_id] = a.right_id; });
+            pairs.left.forEach(function (left) {
+                var row = el('div', {'class': 'mb-2'});
+                row.appendChild(el('span', {'class': 'me-2'}, left.text));
+                var input = select(pairs.right, current[left.id]);
+                input.addEventListener('change', function () {
+                    if (input.value) {
+                        current[left.id] = parseInt(input.value, 10);
+                    } else {
+                        delete current[left.id];
+                    }
+                    save(Object.keys(current).map(function (l) { return {left_id: parseInt(l, 10), right_id: current[l]}; }));
+                });
+                row.appendChild(input);
+                box.appendChild(row);
+            });
+            return box;
+        },
+        dropdown_blank: function (q, answer, save) {
+            var box = el('div');
+            if (q.text_template) {
+                box.appendChild(el('div', {'class': 'mb-2'})).innerHTML = q.text_template;
+            }
+            var current = {};
+            (answer || []).forEach(function (a) { current[a.blank_id] = a.option_id; });
+            (q.dropdowns || []).forEach(function (blank) {
+                var row = el('div', {'class': 'mb-2'});
+                row.appendChild(el('span', {'class': 'me-2'}, '{{' + blank.number + '}}'));
+                var input = select(blank.options.map(function (o) { return {id: o.id, text: o.label}; }), current[blank.id]);
+                input.addEventListener('change', function () {
+                    if (input.value) {
+                        current[blank.id] = parseInt(input.value, 10);
+                    } else {
+                        delete current[blank.id];
+                    }
+                    save(Object.keys(current).map(function (b) { return {blank_id: parseInt(b, 10), option_id: current[b]}; }));
+                });
+                row.appendChild(input);
+                box.appendChild(row);
+            });
+            return box;
+        },
+        step_sequence: function (q, answer, save) {
+            var box = el('ol', {'class': 'list-group list-group-numbered'});
+            var steps = (q.steps || []).slice();
+            if (answer && answer.length) {
+                var position = {};
+                answer.forEach(function (a) { position[a.step_id] = a.position; });
+                steps.sort(function (a, b) { return position[a.id] - position[b.id]; });
+            }
+            function emit() {
+                save(steps.map(function (s, i) { return {step_id: s.id, position: i}; }));
+            }
+            function draw() {
+                box.innerHTML = '';
+                steps.forEach(function (step, i) {
+                    var item = el('li', {'class': 'list-group-item d-flex justify-content-between align-items-center'});
+                    item.appendChild(el('span', {}, step.label || step.content));
+                    var buttons = el('span');
+                    [['↑', -1], ['↓', 1]].forEach(function (move) {
+                        var button = el('button', {type: 'button', 'class': 'btn btn-sm btn-outline-secondary ms-1'}, move[0]);
+                        button.disabled = i + move[1] < 0 || i + move[1] >= steps.length;
+                        button.addEventListener('click', function () {
+                            var other = steps[i + move[1]];
+                            steps[i + move[1]] = step;
+                            steps[i] = other;
+                            draw();
+                            emit();
+                        });
+                        buttons.appendChild(button);
+                    });
+                    item.appendChild(buttons);
+                    box.appendChild(item);
+                });
+            }
+            draw();
+            return box;
+        },
+        matrix: function (q, answer, save) {
+            var matrix = q.matrix || {rows: [], columns: []};
+            var value = Object.assign({}, answer || {});
+            var table = el('table', {'class': 'table table-sm'});
+            var head = el('tr');
+            head.appendChild(el('th'));
+            matrix.columns.forEach(function (col) { head.appendChild(el('th', {}, col.name)); });
+            table.appendChild(head);
+            matrix.rows.forEach(function (row) {
+                var tr = el('tr');
+                tr.appendChild(el('th', {}, row.name));
+                matrix.columns.forEach(function (col) {
+                    var td = el('td');
+                    var input = el('input', {type: 'radio', name: 'q' + q.id + '_' + row.id, 'class': 'form-check-input'});
+                    input.checked = !!value['cell_' + row.id + '_' + col.id];
+                    input.addEventListener('change', function () {
+                        matrix.columns.forEach(function (c) { value['cell_' + row.id + '_' + c.id] = c.id === col.id; });
+                        save(value);
+                    });
+                    td.appendChild(input);
+                    tr.appendChild(td);
+                });
+                table.appendChild(tr);
+            });
+            return table;
+        },
+        passage: function (q, answer, save) {
+            var box = el('div');
+            var value = Object.assign({}, answer || {});
+            (q.passages || []).slice(0, 1).forEach(function (passage) {
+                box.appendChild(el('h4', {}, passage.name));
+                box.appendChild(el('div', {'class': 'passage-content mb-3'})).innerHTML = passage.content;
+                passage.sub_questions.forEach(function (sub) {
+                    var block = el('div', {'class': 'mb-3'});
+                    block.appendChild(el('div')).innerHTML = sub.html;
+                    if (sub.choices) {
+                        var key = 'sub_q_' + sub.id;
+                        block.appendChild(RENDERERS.mcq_single({id: q.id + '_' + sub.id, choices: sub.choices}, value[key], function (v) {
+                            value[key] = v;
+                            save(value);
+                        }));
+                    } else {
+                        var text = el('textarea', {'class': 'form-control', rows: '3'});
+                        text.value = value[String(sub.id)] || '';
+                        text.addEventListener('input', function () {
+                            value[String(sub.id)] = text.value;
+                            save(value);
+                        });
+                        block.appendChild(text);
+                    }
+                    box.appendChild(block);
+                });
+            });
+            return box;
+        },
+    };
+
+    // Token placement types: one select per position, filled with the tokens
+    function tokenRenderer(zoneKey, zoneId) {
+        return function (q, answer, save) {
+            var box = el('div');
+            var tokens = q.tokens || [];
+            var current = {};
+            tokens.forEach(function (_token, position) {
+                (answer || []).forEach(function (a) {
+                    if (a[zoneKey] === zoneId(position)) {
+                        current[position] = a.token_id;
+                    }
+                });
+            });
+            tokens.forEach(function (_token, position) {
+                var row = el('div', {'class': 'mb-2'});
+                row.appendChild(el('span', {'class': 'me-2'}, '#' + (position + 1)));
+                var input = select(tokens, current[position]);
+                input.addEventListener('change', function () {
+                    if (input.value) {
+                        current[position] = parseInt(input.value, 10);
+                    } else {
+                        delete current[position];
+                    }
+                    save(Object.keys(current).map(function (p) {
+                        var entry = {token_id: current[p]};
+                        entry[zoneKey] = zoneId(parseInt(p, 10));
+                        return entry;
+                    }));
+                });
+                row.appendChild(input);
+                box.appendChild(row);
+            });
+            return box;
+        };
+    }
+    RENDERERS.drag_text = tokenRenderer('zone', function (p) { return p; });
+    RENDERERS.drag_zone = RENDERERS.drag_text;
+    RENDERERS.sentence_completion = tokenRenderer('zone_id', function (p) { return 'blank_' + p; });
+
+    function hex(buffer) {
+        return Array.prototype.map.call(new Uint8Array(buffer), function (b) {
+            return ('0' + b.toString(16)).slice(-2);
+        }).join('');
+    }
+
+    function sign(key, body) {
+        var encoder = new TextEncoder();
+        return window.crypto.subtle.importKey('raw', encoder.encode(key), {name: 'HMAC', hash: 'SHA-256'}, false, ['sign'])
+            .then(function (cryptoKey) { return window.crypto.subtle.sign('HMAC', cryptoKey, encoder.encode(body)); })
+            .then(hex);
+    }
+
+    function Player(root) {
+        this.root = root;
+        this.token = root.getAttribute('data-session');
+        this.status = root.querySelector('.quiz-offline-status');
+        this.container = root.querySelector('.quiz-offline-question');
+        this.progress = root.querySelector('.quiz-offline-progress');
+        this.prev = root.querySelector('.quiz-offline-prev');
+        this.next = root.querySelector('.quiz-offline-next');
+        this.submit = root.querySelector('.quiz-offline-submit');
+        this.retry = 0;
+        this.state = loadState(this.token);
+    }
+
+    Player.prototype.setStatus = function (text, kind) {
+        this.status.className = 'quiz-offline-status alert small alert-' + (kind || 'info');
+        this.status.textContent = text;
+        this.status.style.display = text ? '' : 'none';
+    };
+
+    Player.prototype.start = function () {
+        var self = this;
+        this.prev.addEventListener('click', function () { self.show(self.state.index - 1); });
+        this.next.addEventListener('click', function () { self.show(self.state.index + 1); });
+        this.submit.addEventListener('click', function () { self.send(); });
+        window.addEventListener('online', function () {
+            if (self.state && self.state.submitting) {
+                self.send();
+            }
+        });
+        if (this.state && this.state.payload) {
+            return this.ready();
+        }
+        fetch(this.root.getAttribute('data-payload-url'), {credentials: 'same-origin'})
+            .then(function (response) {
+                if (!response.ok) {
+                    throw new Error(response.status);
+                }
+                return response.json();
+            })
+            .then(function (payload) {
+                self.state = {
+                    payload: payload,
+                    answers: {},
+                    index: 0,
+                    bundle_id: self.token + ':' + Date.now().toString(36) + Math.random().toString(36).slice(2, 8),
+                };
+                saveState(self.token, self.state);
+                self.ready();
+            })
+            .catch(function () {
+                self.setStatus('The questions could not be downloaded. Check your connection and reload the page.', 'danger');
+            });
+    };
+
+    Player.prototype.ready = function () {
+        var self = this;
+        var bundles = this.state.payload.offline.bundles || [];
+        var loading = window.QuizAssets ? window.QuizAssets.load(bundles) : Promise.resolve();
+        loading.catch(function () {}).then(function () {
+            self.setStatus('');
+            self.show(self.state.index || 0);
+            if (self.state.submitting) {
+                self.send();
+            }
+        });
+    };
+
+    Player.prototype.show = function (index) {
+        var questions = this.state.payload.questions;
+        if (index < 0 || index >= questions.length) {
+            return;
+        }
+        var self = this;
+        var q = questions[index];
+        this.state.index = index;
+        saveState(this.token, this.state);
+        this.container.innerHTML = '';
+        this.container.appendChild(el('div', {'class': 'question-text mb-3'})).innerHTML = q.html;
+        var render = RENDERERS[q.type];
+        if (render) {
+            this.container.appendChild(render(q, this.state.answers[q.id], function (answer) {
+                self.state.answers[q.id] = answer;
+                saveState(self.token, self.state);
+            }));
+        }
+        this.progress.textContent = 'Question ' + (index + 1) + ' of ' + questions.length;
+        this.prev.disabled = index === 0;
+        this.next.style.display = index === questions.length - 1 ? 'none' : '';
+        this.submit.style.display = index === questions.length - 1 ? '' : 'none';
+    };
+
+    Player.prototype.send = function () {
+        var self = this;
+        if (this.sending) {
+            return;
+        }
+        this.sending = true;
+        var offline = this.state.payload.offline;
+        var body = JSON.stringify({
+            session: this.token,
+            plan: offline.plan,
+            bundle_id: this.state.bundle_id,
+            answers: this.state.answers,
+        });
+        this.state.submitting = true;
+        saveState(this.token, this.state);
+        this.submit.disabled = true;
+        this.setStatus('Submitting your answers…');
+        sign(offline.key, body)
+            .then(function (signature) {
+                return fetch(offline.submit_url, {
+                    method: 'POST',
+                    credentials: 'same-origin',
+                    headers: {'Content-Type': 'application/json', 'X-Quiz-Signature': signature},
+                    body: body,
+                });
+            })
+            .then(function (response) {
+                if (response.status >= 500) {
+                    throw new Error(response.status);
+                }
+                return response.json()
+                    .catch(function () { return {error: String(response.status)}; })
+                    .then(function (data) { return {ok: response.ok, data: data}; });
+            })
+            .then(function (result) {
+                self.sending = false;
+                if (result.ok) {
+                    window.localStorage.removeItem(storageKey(self.token));
+                    window.location.href = result.data.results_url;
+                    return;
+                }
+                // Refused by the server: retrying the same bundle cannot help
+                self.state.submitting = false;
+                saveState(self.token, self.state);
+                self.setStatus(result.data.error === 'closed'
+                    ? 'This session is closed and no longer accepts answers.'
+                    : 'Your answers were refused (' + result.data.error + ').', 'danger');
+            })
+            .catch(function () {
+                self.sending = false;
+                var delay = RETRY_DELAYS[Math.min(self.retry++, RETRY_DELAYS.length - 1)];
+                self.setStatus('You seem to be offline. Your answers are saved on this device and will be sent '
+                    + 'as soon as the connection is back.', 'warning');
+                window.setTimeout(function () {
+                    if (self.state.submitting) {
+                        self.send();
+                    }
+                }, delay);
+            });
+    };
+
+    function init() {
+        document.querySelectorAll('.quiz-offline').forEach(function (root) {
+            new Player(root).start();
+        });
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
@@ -2,8 +2,7 @@
 (function() {
     "use strict";
 
-    // Run when DOM is loaded
-    document.addEventListener('DOMContentLoaded', function() {
+    function init() {
     const DEBUG = false; if(DEBUG) console.log('Sequence buttons initialized');
         
         // Setup the buttons
@@ -11,7 +10,14 @@
         
         // Randomize on first load
         randomizeAllItems();
-    });
+    }
+
+    // Run when DOM is loaded (or right away when the bundle was loaded later)
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
     
     function setupButtons() {
         // Setup up buttons
@@ -0,0 +1,80 @@
+/** @odoo-module **/
+
+import { Component, onWillStart, onWillUnmount, useState } from "@odoo/owl";
+import { registry } from "@web/core/registry";
+import { useService } from "@web/core/utils/hooks";
+
+const NOTIFICATION_TYPE = "quiz_proctor/progress";
+const STATE_ORDER = { in_progress: 0, expired: 1, completed: 2 };
+
+/**
+ * Live progress of the sessions of one quiz.
+ *
+ * The dashboard loads a snapshot once, then applies the batched progress
+ * notifications of the quiz's proctor channel; it never polls the server.
+ */
+export class ProctorDashboard extends Component {
+    static template = "quiz_engine_pro.ProctorDashboard";
+    static props = ["*"];
+
+    setup() {
+        this.orm = useService("orm");
+        this.busService = this.env.services.bus_service;
+        this.quizId = this.props.action.params?.quiz_id || this.props.action.context?.active_id;
+        this.state = useState({ name: "", sessions: {} });
+        this.onProgress = this.onProgress.bind(this);
+
+        onWillStart(async () => {
+            // Subscribe first: updates racing the snapshot are merged by time
+            this.busService.subscribe(NOTIFICATION_TYPE, this.onProgress);
+            const snapshot = await this.orm.call("quiz.quiz", "get_proctor_snapshot", [[this.quizId]]);
+            this.channel = snapshot.channel;
+            this.state.name = snapshot.name;
+            this.merge(snapshot.sessions);
+            this.busService.addChannel(this.channel);
+        });
+        onWillUnmount(() => {
+            this.busService.unsubscribe(NOTIFICATION_TYPE, this.onProgress);
+            if (this.channel) {
+                this.busService.deleteChannel(this.channel);
+            }
+        });
+    }
+
+    onProgress(payload) {
+        if (payload.quiz_id === this.quizId) {
+            this.merge(payload.sessions);
+        }
+    }
+
+    merge(entries) {
+        for (const entry of entries) {
+            const current = this.state.sessions[entry.id];
+            if (!current || current.time <= entry.time) {
+                this.state.sessions[entry.id] = entry;
+            }
+        }
+    }
+
+    get rows() {
+        return Object.values(this.state.sessions).sort(
+            (a, b) => STATE_ORDER[a.state] - STATE_ORDER[b.state] || b.id - a.id
+        );
+    }
+
+    get counts() {
+        const counts = { in_progress: 0, completed: 0, expired: 0 };
+        for (const entry of Object.values(this.state.sessions)) {
+            if (entry.state in counts) {
+                counts[entry.state]++;
+            }
+        }
+        return counts;
+    }
+
+    progress(entry) {
+        return entry.total ? Math.round((entry.answered / entry.total) * 100) : 0;
+    }
+}
+
+registry.category("actions").add("quiz_engine_pro.proctor_dashboard", ProctorDashboard);
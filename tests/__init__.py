@@ -1 +1,27 @@
 from . import test_matrix_question
+from . import test_delivery
+from . import test_snapshot
+from . import test_answer_key
+from . import test_text_matcher
+from . import test_regrade
+from . import test_answer_codec
+from . import test_archive
+from . import test_analytics
+from . import test_leaderboard
+from . import test_load_seed
+from . import test_perf
+from . import test_grading_benchmark
+from . import test_query_count
+from . import test_question_fragment
+from . import test_option_shuffle
+from . import test_attempt_ledger
+from . import test_grading_queue
+from . import test_cache_bus
+from . import test_proctor
+from . import test_quiz_assets
+from . import test_asset_benchmark
+from . import test_offline_delivery
+from . import test_question_search
+from . import test_question_dedup
+from . import test_quiz_clone
+from . import test_spaced_repetition
@@ -0,0 +1,32 @@
+from odoo.tests.common import TransactionCase
+
+
+class TestQuizAnalytics(TransactionCase):
+    def test_refresh_and_read(self):
+        quiz = self.env['quiz.quiz'].create({'name': 'Analytics Quiz', 'slug': 'analytics-quiz'})
+        question = self.env['quiz.question'].create({
+            'quiz_id': quiz.id,
+            'type': 'mcq_single',
+            'question_html': '<p>Pick one</p>',
+            'points': 1.0,
+            'choice_ids': [(0, 0, {'text': 'A', 'is_correct': True})],
+        })
+        for token, score in (('a-token', 1.0), ('b-token', 0.0)):
+            session = self.env['quiz.session'].create({
+                'quiz_id': quiz.id,
+                'session_token': token,
+                'state': 'completed',
+            })
+            self.env['quiz.response'].create({
+                'session_id': session.id,
+                'question_id': question.id,
+                'score': score,
+            })
+        self.env.flush_all()
+        quiz._cron_refresh_analytics()
+        analytics = quiz._get_analytics()
+        self.assertEqual(analytics['summary']['attempts'], 2)
+        self.assertEqual(analytics['summary']['pass_rate'], 50.0)
+        self.assertEqual(analytics['histogram'][0], 1)
+        self.assertEqual(analytics['histogram'][-1], 1)
+        self.assertEqual(analytics['questions'][0]['correct_rate'], 50.0)
@@ -0,0 +1,86 @@
+from odoo.tests.common import TransactionCase
+from odoo.addons.quiz_engine_pro.models.answer_codec import decode_answer, encode_answer, parse_answer
+import json
+
+
+class TestAnswerCodec(TransactionCase):
+    def test_compact_round_trip(self):
+        cases = [
+            ('mcq_single', '12', {'c': 12}),
+            ('mcq_multiple', ['3', '1'], {'c': [3, 1]}),
+            ('step_sequence', [{'step_id': 4, 'position': 1}, {'step_id': 5, 'position': 2}],
+             {'c': [[4, 1], [5, 2]]}),
+            ('dropdown_blank', [{'blank_id': 1, 'option_id': '7'}], {'c': [[1, '7']]}),
+        ]
+        for question_type, value, stored in cases:
+            self.assertEqual(encode_answer(question_type, value), stored)
+            self.assertEqual(decode_answer(question_type, stored), value)
+
+    def test_irregular_answers_kept_verbatim(self):
+        for question_type, value in [
+            ('mcq_single', 12),
+            ('mcq_multiple', ['3', '']),
+            ('step_sequence', [{'step_id': 4, 'position': 1, 'text': 'First'}]),
+            ('matrix', {'1_2': 'yes'}),
+            ('text_long', 'Some free text'),
+        ]:
+            stored = encode_answer(question_type, value)
+            self.assertEqual(stored, {'v': value})
+            self.assertEqual(decode_answer(question_type, stored), value)
+        self.assertIsNone(encode_answer('mcq_single', None))
+
+    def test_parse_decodes_once(self):
+        self.assertEqual(parse_answer(json.dumps([{'zone_id': 1, 'token_id': 2}])), [{'zone_id': 1, 'token_id': 2}])
+        self.assertEqual(parse_answer(json.dumps('[1]')), '[1]')
+        self.assertEqual(parse_answer(json.dumps('"x"')), '"x"')
+        self.assertEqual(parse_answer(json.dumps('12')), '12')
+        self.assertEqual(parse_answer('not json'), 'not json')
+        self.assertEqual(encode_answer('text_long', parse_answer('not json')), {'v': 'not json'})
+
+    def test_response_answer_data(self):
+        quiz = self.env['quiz.quiz'].create({'name': 'Codec Quiz', 'slug': 'codec-quiz'})
+        question = self.env['quiz.question'].create({
+            'quiz_id': quiz.id,
+            'type': 'mcq_multiple',
+            'question_html': '<p>Pick some</p>',
+            'choice_ids': [
+                (0, 0, {'text': 'A', 'is_correct': True}),
+                (0, 0, {'text': 'B', 'is_correct': True}),
+            ],
+        })
+        session = self.env['quiz.session'].create({'quiz_id': quiz.id, 'session_token': 'codec-token'})
+        ids = [str(i) for i in question.choice_ids.ids]
+        response = self.env['quiz.response'].create({
+            'session_id': session.id,
+            'question_id': question.id,
+            'answer_data': json.dumps(ids),
+        })
+        self.assertEqual(response.answer_value, {'c': [int(i) for i in ids]})
+        self.assertEqual(response._get_answer(), ids)
+        self.assertEqual(json.loads(response.answer_data), ids)
+
+    def test_answer_data_round_trip(self):
+        """Writing back the answer_data that was read keeps the answer unchanged"""
+        quiz = self.env['quiz.quiz'].create({'name': 'Round Trip Quiz', 'slug': 'round-trip-quiz'})
+        session = self.env['quiz.session'].create({'quiz_id': quiz.id, 'session_token': 'round-trip-token'})
+        for question_type, value in [
+            ('fill_blank', '[1]'),
+            ('fill_blank', '"x"'),
+            ('fill_blank', 'plain text'),
+            ('mcq_single', '12'),
+            ('mcq_multiple', ['3', '1']),
+            ('match', [{'left_id': 1, 'right_id': 2}]),
+            ('match', '[{"left_id": 1, "right_id": 2}]'),
+        ]:
+            question = self.env['quiz.question'].create({
+                'quiz_id': quiz.id, 'type': question_type, 'question_html': '<p>Answer</p>'})
+            response = self.env['quiz.response'].create({
+                'session_id': session.id,
+                'question_id': question.id,
+                'answer_data': json.dumps(value),
+            })
+            self.assertEqual(response._get_answer(), value)
+            stored = response.answer_value
+            response.answer_data = response.answer_data
+            self.assertEqual(response.answer_value, stored)
+            self.assertEqual(response._get_answer(), value)
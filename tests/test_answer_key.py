@@ -0,0 +1,60 @@
+from odoo.tests.common import TransactionCase
+import json
+
+
+class TestPassageAnswerKey(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({
+            'name': 'Passage Quiz',
+            'slug': 'passage-quiz',
+        })
+        self.question = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'passage',
+            'question_html': '<p>Read the passage</p>',
+            'points': 4.0,
+            'passage_ids': [(0, 0, {
+                'name': 'Passage',
+                'passage_content': '<p>The quick brown fox.</p>',
+                'sub_question_ids': [
+                    (0, 0, {
+                        'question_text': '<p>Colour?</p>',
+                        'question_type': 'mcq_single',
+                        'points': 1.0,
+                        'choice_ids': [
+                            (0, 0, {'text': 'Brown', 'is_correct': True}),
+                            (0, 0, {'text': 'Red', 'is_correct': False}),
+                        ],
+                    }),
+                    (0, 0, {
+                        'question_text': '<p>Describe it</p>',
+                        'question_type': 'text_long',
+                        'points': 1.0,
+                        'correct_answer': 'quick, fox',
+                    }),
+                ],
+            })],
+        })
+        self.passage = self.question.passage_ids
+        self.mcq, self.text = self.passage.sub_question_ids
+        self.brown = self.mcq.choice_ids.filtered('is_correct')
+
+    def test_passage_key_table(self):
+        key = self.question._get_answer_key()
+        self.assertEqual(key['total'], 2.0)
+        self.assertEqual(key['subs'][str(self.mcq.id)], ['mcq_single', 1.0, self.brown.id])
+        self.assertEqual(key['subs'][str(self.text.id)][2]['keywords'], ['quick', 'fox'])
+
+    def test_passage_grading(self):
+        answer = json.dumps({
+            f'sub_q_{self.mcq.id}': str(self.brown.id),
+            str(self.text.id): 'A quick animal',
+        })
+        # 1 point for the choice + half of the keywords, scaled from 2 to 4 points
+        self.assertEqual(self.question.evaluate_answer(answer), 3.0)
+
+    def test_key_follows_edits(self):
+        self.text.correct_answer = 'quick'
+        answer = json.dumps({str(self.text.id): 'A quick animal'})
+        self.assertEqual(self.question.evaluate_answer(answer), 2.0)
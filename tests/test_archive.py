@@ -0,0 +1,85 @@
+from odoo.tests.common import TransactionCase
+from datetime import timedelta
+from odoo import fields
+
+
+class TestSessionArchive(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({'name': 'Archive Quiz', 'slug': 'archive-quiz'})
+        self.question = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'question_html': '<p>Pick one</p>',
+            'points': 1.0,
+            'choice_ids': [(0, 0, {'text': 'A', 'is_correct': True})],
+        })
+        old = fields.Datetime.now() - timedelta(days=400)
+        self.old_session = self._create_session('old-token', old)
+        self.recent_session = self._create_session('recent-token', fields.Datetime.now())
+
+    def _create_session(self, token, end_time):
+        session = self.env['quiz.session'].create({
+            'quiz_id': self.quiz.id,
+            'session_token': token,
+            'state': 'completed',
+            'end_time': end_time,
+        })
+        self.env['quiz.response'].create({
+            'session_id': session.id,
+            'question_id': self.question.id,
+            'answer_value': {'c': self.question.choice_ids.id},
+            'score': 1.0,
+        })
+        return session
+
+    def test_archive_moves_old_sessions(self):
+        self.quiz.published = True
+        old_id = self.old_session.id
+        count = self.env['quiz.session.archive']._archive_sessions(batch_size=1)
+        self.assertEqual(count, 1)
+        self.assertFalse(self.env['quiz.session'].browse(old_id).exists())
+        self.assertTrue(self.recent_session.exists())
+        archived = self.env['quiz.session.archive'].search([('session_ref', '=', old_id)])
+        self.assertEqual(archived.total_score, 1.0)
+        self.assertEqual(archived.response_ids._get_answer(), str(self.question.choice_ids.id))
+        self.assertEqual(self.quiz.archived_session_count, 1)
+        history = self.env['quiz.session.history'].search([('quiz_id', '=', self.quiz.id)])
+        self.assertEqual(sorted(history.mapped('archived')), [False, True])
+
+    def test_archive_keeps_leaderboard_and_analytics(self):
+        (self.old_session | self.recent_session)._update_leaderboard()
+        self.env.flush_all()
+        self.quiz._cron_refresh_analytics()
+        analytics = self.quiz._get_analytics()
+        board = self.env['quiz.leaderboard'].search([('quiz_id', '=', self.quiz.id)])
+        counts = (board.session_count, board.bucket_counts)
+        old_id = self.old_session.id
+        self.env['quiz.session.archive']._archive_sessions()
+        archived = self.env['quiz.session.archive'].search([('session_ref', '=', old_id)])
+        self.assertEqual((board.session_count, board.bucket_counts), counts)
+        self.assertIn(-archived.id, [e['session_id'] for e in board.top_entries])
+        self.assertNotIn(old_id, [e['session_id'] for e in board.top_entries])
+        incremental = board.top_entries
+        self.env['quiz.leaderboard']._rebuild_for_quiz(self.quiz.id)
+        self.assertEqual((board.session_count, board.bucket_counts, board.top_entries), counts + (incremental,))
+        self.quiz._cron_refresh_analytics()
+        self.assertEqual(self.quiz._get_analytics()['summary'], analytics['summary'])
+        self.assertEqual(self.quiz._get_analytics()['histogram'], analytics['histogram'])
+
+    def test_archive_in_batches(self):
+        old = fields.Datetime.now() - timedelta(days=400)
+        sessions = self.old_session | self._create_session('older-token', old) | self._create_session('oldest-token', old)
+        queued = self._create_session('queued-token', old)
+        self.env['quiz.leaderboard.delta'].create({'quiz_id': self.quiz.id, 'session_id': queued.id})
+        Archive = self.env['quiz.session.archive']
+        self.assertEqual(Archive._archive_sessions(batch_size=2, max_batches=1), 2)
+        self.assertEqual(len(sessions.exists()), 1)
+        self.assertEqual(Archive._archive_sessions(batch_size=2), 1)
+        self.assertFalse(sessions.exists())
+        self.assertEqual(Archive.search_count([('quiz_id', '=', self.quiz.id)]), 3)
+        # A session still queued for the leaderboard waits until it is ranked
+        self.assertTrue(queued.exists())
+        self.env['quiz.leaderboard']._cron_fold_deltas()
+        self.assertEqual(Archive._archive_sessions(), 1)
+        self.assertFalse(queued.exists())
@@ -0,0 +1,46 @@
+from odoo.tests.common import TransactionCase, tagged
+from odoo.addons.quiz_engine_pro.models.quiz_assets import CORE_BUNDLE, TYPE_BUNDLES, asset_bundles
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+# A multiple choice page may ship at most this share of what every quiz page used to ship
+MAX_MCQ_SHARE = 0.5
+
+
+@tagged('-standard', 'quiz_benchmark')
+class BenchmarkAssets(TransactionCase):
+    """Run with --test-tags quiz_benchmark
+
+    Reports, per page profile, the bytes of quiz CSS/JS a page ships before
+    and after minification and the time the server takes to build them.
+    Browser parse time follows the minified size.
+    """
+
+    def _measure(self, bundle_name):
+        bundle = self.env['ir.qweb']._get_asset_bundle(bundle_name)
+        raw = sum(len((asset.content or '').encode()) for asset in bundle.stylesheets + bundle.javascripts)
+        start = time.perf_counter()
+        minified = 0
+        if bundle.stylesheets:
+            minified += sum(len(attachment.raw or b'') for attachment in bundle.css())
+        if bundle.javascripts:
+            minified += len(bundle.js().raw or b'')
+        return raw, minified, time.perf_counter() - start
+
+    def test_bundle_sizes(self):
+        sizes = {name: self._measure(name) for name in {CORE_BUNDLE, *TYPE_BUNDLES.values()}}
+        for name, (raw, minified, elapsed) in sorted(sizes.items()):
+            _logger.info("Bundle %-48s %7d bytes raw, %7d minified, built in %6.1f ms",
+                         name, raw, minified, elapsed * 1000)
+
+        def page(types):
+            return sum(sizes[name][1] for name in asset_bundles(types))
+
+        everything = page(set(TYPE_BUNDLES))
+        mcq_only = page({'mcq_single'})
+        _logger.info("Page with every question type: %d bytes; multiple choice only: %d bytes", everything, mcq_only)
+        for question_type in sorted(TYPE_BUNDLES):
+            _logger.info("Page with %-20s questions: %7d bytes", question_type, page({question_type}))
+        self.assertLessEqual(mcq_only, everything * MAX_MCQ_SHARE)
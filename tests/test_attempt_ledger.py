@@ -0,0 +1,71 @@
+from odoo.tests.common import HttpCase, TransactionCase, tagged
+from odoo.addons.quiz_engine_pro.models.attempt_ledger import attempt_identity
+
+
+class TestAttemptLedger(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({
+            'name': 'Ledger Quiz',
+            'slug': 'ledger-quiz',
+            'max_attempts': 2,
+        })
+        self.ledger = self.env['quiz.attempt.ledger']
+
+    def test_identity(self):
+        public = self.env.ref('base.public_user')
+        self.assertEqual(attempt_identity(self.env.user), 'user:%d' % self.env.user.id)
+        self.assertEqual(attempt_identity(public, ' Ada@Example.com '), 'email:ada@example.com')
+        self.assertIsNone(attempt_identity(public, ''))
+
+    def test_max_attempts_enforced(self):
+        self.assertTrue(self.ledger._claim_attempt(self.quiz, 'email:ada@example.com'))
+        self.assertTrue(self.ledger._claim_attempt(self.quiz, 'email:ada@example.com'))
+        self.assertFalse(self.ledger._claim_attempt(self.quiz, 'email:ada@example.com'))
+        self.assertEqual(self.ledger._get_attempt_count(self.quiz, 'email:ada@example.com'), 2)
+        # Other participants have their own counter
+        self.assertTrue(self.ledger._claim_attempt(self.quiz, 'email:bob@example.com'))
+
+    def test_unlimited_and_anonymous(self):
+        self.quiz.max_attempts = 0
+        for _i in range(5):
+            self.assertTrue(self.ledger._claim_attempt(self.quiz, 'user:1'))
+        self.assertEqual(self.ledger._get_attempt_count(self.quiz, 'user:1'), 5)
+        self.assertTrue(self.ledger._claim_attempt(self.quiz, None))
+
+    def test_new_quiz_unlimited_by_default(self):
+        quiz = self.env['quiz.quiz'].create({'name': 'Default Quiz', 'slug': 'default-ledger-quiz'})
+        self.assertEqual(quiz.max_attempts, 0)
+        for _i in range(3):
+            self.assertTrue(self.ledger._claim_attempt(quiz, 'user:1'))
+
+    def test_submission_key_replay(self):
+        keys = self.env['quiz.submission.key']
+        claimed, previous = keys._claim(self.quiz, 'key-1')
+        self.assertTrue(claimed)
+        self.assertFalse(previous)
+        session = self.env['quiz.session'].create({'quiz_id': self.quiz.id, 'session_token': 'ledger-token'})
+        keys._bind(self.quiz, 'key-1', session)
+        claimed, previous = keys._claim(self.quiz, 'key-1')
+        self.assertFalse(claimed)
+        self.assertEqual(previous, session)
+        # No key: every request is a new one
+        self.assertTrue(keys._claim(self.quiz, None)[0])
+
+
+@tagged('post_install', '-at_install')
+class TestStartReplay(HttpCase):
+    def test_replayed_start_creates_one_session(self):
+        quiz = self.env['quiz.quiz'].create({
+            'name': 'Start Replay Quiz',
+            'slug': 'start-replay-quiz',
+            'access_mode': 'public',
+            'max_attempts': 3,
+        })
+        quiz.published = True
+        data = {'participant_name': 'Ada', 'participant_email': 'ada@example.com', 'idempotency_key': 'start-key-1'}
+        first = self.url_open('/quiz/%s/start' % quiz.slug, data=data, allow_redirects=False)
+        second = self.url_open('/quiz/%s/start' % quiz.slug, data=data, allow_redirects=False)
+        self.assertEqual(first.headers['Location'], second.headers['Location'])
+        self.assertEqual(self.env['quiz.session'].search_count([('quiz_id', '=', quiz.id)]), 1)
+        self.assertEqual(self.env['quiz.attempt.ledger']._get_attempt_count(quiz, 'email:ada@example.com'), 1)
@@ -0,0 +1,60 @@
+from odoo.tests.common import TransactionCase
+from odoo.addons.quiz_engine_pro.models.cache_bus import HotCache, hot_cache
+
+
+class TestCacheBus(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({'name': 'Bus Quiz', 'slug': 'bus-quiz'})
+        self.category = self.env['quiz.question.category'].create({'name': 'Bus Public', 'access_mode': 'public'})
+        self.public_q = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id, 'type': 'mcq_single', 'question_html': '<p>A</p>', 'access_mode': 'public',
+        })
+        self.inherit_q = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id, 'type': 'mcq_single', 'question_html': '<p>B</p>',
+            'access_mode': 'inherit', 'category_id': self.category.id,
+        })
+        self.portal_q = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id, 'type': 'mcq_single', 'question_html': '<p>C</p>', 'access_mode': 'portal',
+        })
+
+    def test_versioned_entries(self):
+        cache = HotCache()
+        cache.set('db', 'visibility', (1, 'public'), {1}, version=3, quiz_id=1)
+        self.assertEqual(cache.get('db', 'visibility', (1, 'public'), 3), {1})
+        self.assertIsNone(cache.get('db', 'visibility', (1, 'public'), 2))
+        cache.apply('db', 'quiz.quiz', [1], {'1': 4})
+        self.assertIsNone(cache.get('db', 'visibility', (1, 'public'), 3))
+        # A worker still reading version 3 must not put it back
+        cache.set('db', 'visibility', (1, 'public'), {1}, version=3, quiz_id=1)
+        self.assertIsNone(cache.get('db', 'visibility', (1, 'public'), 3))
+        cache.set('db', 'visibility', (1, 'public'), {1, 2}, version=4, quiz_id=1)
+        self.assertEqual(cache.get('db', 'visibility', (1, 'public'), 4), {1, 2})
+
+    def test_namespace_events(self):
+        cache = HotCache()
+        cache.set('db', 'mode', 'exam', 7)
+        cache.set('db', 'visibility', (1, 'public'), {1}, version=1, quiz_id=1)
+        cache.apply('db', 'quiz.mode', [7])
+        self.assertIsNone(cache.get('db', 'mode', 'exam'))
+        self.assertEqual(cache.get('db', 'visibility', (1, 'public'), 1), {1})
+        cache.apply('db', 'quiz.question.category', [3])
+        self.assertIsNone(cache.get('db', 'visibility', (1, 'public'), 1))
+
+    def test_content_change_invalidates_locally(self):
+        dbname = self.env.cr.dbname
+        key = (self.quiz.id, 'public')
+        version = self.quiz.content_version
+        hot_cache.set(dbname, 'visibility', key, frozenset(), version, self.quiz.id)
+        self.public_q.question_html = '<p>A2</p>'
+        # Other transactions still read the committed version until this one commits
+        self.assertEqual(hot_cache.get(dbname, 'visibility', key, version), frozenset())
+        self.env.cr.postcommit.run()
+        self.assertIsNone(hot_cache.get(dbname, 'visibility', key, version))
+
+    def test_visible_questions(self):
+        self.assertEqual(self.quiz._get_visible_question_ids('public'), {self.public_q.id, self.inherit_q.id})
+        self.assertEqual(self.quiz._get_visible_question_ids('portal'),
+                         {self.public_q.id, self.inherit_q.id, self.portal_q.id})
+        self.category.access_mode = 'internal'
+        self.assertEqual(self.quiz._get_visible_question_ids('public'), {self.public_q.id})
@@ -0,0 +1,60 @@
+from odoo.tests.common import TransactionCase
+import json
+
+
+class TestDeliveryPayload(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({
+            'name': 'Delivery Quiz',
+            'slug': 'delivery-quiz',
+        })
+        self.question = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'question_html': '<p>Pick one</p>',
+            'choice_ids': [
+                (0, 0, {'text': 'Right', 'is_correct': True}),
+                (0, 0, {'text': 'Wrong', 'is_correct': False}),
+            ],
+        })
+        self.session = self.env['quiz.session'].create({
+            'quiz_id': self.quiz.id,
+            'session_token': 'delivery-token',
+            'state': 'in_progress',
+            'question_order': str(self.question.id),
+        })
+
+    def test_payload_strips_answer_keys(self):
+        """Choices are delivered without their is_correct flag"""
+        payload = json.loads(self.session._get_delivery_payload())
+        self.assertEqual(len(payload['questions']), 1)
+        choices = payload['questions'][0]['choices']
+        self.assertEqual([c['text'] for c in choices], ['Right', 'Wrong'])
+        for choice in choices:
+            self.assertEqual(set(choice), {'id', 'text'})
+
+    def test_content_version_invalidates_payload(self):
+        """Editing a child record bumps the version and refreshes the payload"""
+        version = self.quiz.content_version
+        self.question.choice_ids[0].text = 'Renamed'
+        self.assertGreater(self.quiz.content_version, version)
+        payload = json.loads(self.session._get_delivery_payload())
+        self.assertEqual(payload['quiz']['version'], self.quiz.content_version)
+        self.assertEqual(payload['questions'][0]['choices'][0]['text'], 'Renamed')
+
+    def test_settings_keep_content_version(self):
+        """Only fields that reach the delivered content bump the version"""
+        version = self.quiz.content_version
+        self.quiz.write({'published': not self.quiz.published, 'max_attempts': 3, 'async_grading': True})
+        self.assertEqual(self.quiz.content_version, version)
+        self.quiz.time_limit = 45
+        self.assertGreater(self.quiz.content_version, version)
+
+    def test_question_settings_keep_content_version(self):
+        """Access settings of a question are not content, its text is"""
+        version = self.quiz.content_version
+        self.question.write({'difficulty_level': 'hard', 'access_mode': 'internal'})
+        self.assertEqual(self.quiz.content_version, version)
+        self.question.question_html = '<p>Pick the right one</p>'
+        self.assertGreater(self.quiz.content_version, version)
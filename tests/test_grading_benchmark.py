@@ -0,0 +1,69 @@
+from odoo.tests.common import TransactionCase, tagged
+from odoo.addons.quiz_engine_pro.models.graders import grade
+from odoo.addons.quiz_engine_pro.scripts.load_seed import QUESTION_TYPES, create_question, random_answer
+import json
+import logging
+import os
+import random
+import time
+
+_logger = logging.getLogger(__name__)
+
+# Question sizes: choices, blanks, tokens, matrix rows/columns, passage sub-questions
+SIZES = (2, 8, 32)
+# Answers graded per (type, size); scale with QUIZ_BENCHMARK_SCALE for longer runs
+ANSWERS = int(200 * float(os.environ.get('QUIZ_BENCHMARK_SCALE', 1)))
+# Minimum answers per second at size 8, well below what a laptop does, to catch
+# order-of-magnitude regressions (an extra query per answer, a quadratic loop)
+# rather than noise. The ORM evaluators run against warm record caches.
+MIN_COMPILED_RATE = 5000
+MIN_EVALUATE_RATE = 200
+
+
+@tagged('-standard', 'quiz_benchmark')
+class BenchmarkGrading(TransactionCase):
+    """Run with --test-tags quiz_benchmark"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        rng = random.Random(7)
+        cls.quiz = cls.env['quiz.quiz'].create({'name': 'Grading Benchmark', 'slug': 'grading-benchmark'})
+        cls.questions = {}
+        for question_type in QUESTION_TYPES:
+            for size in SIZES:
+                cls.questions[question_type, size] = create_question(cls.env, cls.quiz, question_type, size, rng)
+
+    def _answers(self, question, rng):
+        fragment = self.quiz._get_delivery_fragments()['questions'][question.id]
+        return [random_answer(fragment, rng) for _ in range(ANSWERS)]
+
+    def _rate(self, func, answers):
+        start = time.perf_counter()
+        for answer in answers:
+            func(answer)
+        elapsed = time.perf_counter() - start
+        return len(answers) / elapsed if elapsed else float('inf')
+
+    def test_grading_throughput(self):
+        rng = random.Random(11)
+        keys = self.quiz.question_ids._compile_answer_keys()
+        results = []
+        for (question_type, size), question in sorted(self.questions.items()):
+            answers = self._answers(question, rng)
+            posted = [a if isinstance(a, str) else json.dumps(a) for a in answers]
+            key = keys[question.id]
+            # Warm the record caches so the evaluator timing excludes the first fetch
+            question.evaluate_answer(posted[0])
+            evaluate_rate = self._rate(question.evaluate_answer, posted)
+            compiled_rate = self._rate(lambda a: grade(key, a), posted)
+            results.append((question_type, size, evaluate_rate, compiled_rate))
+            _logger.info("Grading %-20s size %2d: evaluate_answer %9.0f/s, compiled key %9.0f/s",
+                         question_type, size, evaluate_rate, compiled_rate)
+
+        for question_type, size, evaluate_rate, compiled_rate in results:
+            if size != 8:
+                continue
+            with self.subTest(question_type=question_type):
+                self.assertGreater(compiled_rate, MIN_COMPILED_RATE)
+                self.assertGreater(evaluate_rate, MIN_EVALUATE_RATE)
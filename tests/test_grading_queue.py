@@ -0,0 +1,67 @@
+from odoo.tests.common import TransactionCase
+from odoo.addons.quiz_engine_pro.models.answer_codec import encode_answer
+
+
+class TestGradingQueue(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({
+            'name': 'Async Quiz',
+            'slug': 'async-quiz',
+            'async_grading': True,
+        })
+        self.question = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'points': 2.0,
+            'question_html': '<p>Pick one</p>',
+            'choice_ids': [(0, 0, {'text': 'Right', 'is_correct': True}),
+                           (0, 0, {'text': 'Wrong'})],
+        })
+        self.right = self.question.choice_ids.filtered('is_correct')
+
+    def _submit(self, token, choice):
+        session = self.env['quiz.session'].create({
+            'quiz_id': self.quiz.id,
+            'session_token': token,
+            'state': 'completed',
+            'grading_state': 'pending',
+            'max_score': 2.0,
+        })
+        self.env['quiz.response'].create({
+            'session_id': session.id,
+            'question_id': self.question.id,
+            'answer_value': encode_answer('mcq_single', str(choice.id)),
+        })
+        self.env['quiz.grading.job']._enqueue(session)
+        return session
+
+    def test_jobs_grade_sessions(self):
+        good = self._submit('async-good', self.right)
+        bad = self._submit('async-bad', self.question.choice_ids - self.right)
+        self.assertEqual(good._get_grading_status(), {'grading_state': 'pending'})
+        self.assertEqual(self.env['quiz.grading.job']._process_jobs(), 2)
+        self.assertEqual(good.grading_state, 'done')
+        self.assertEqual(good.total_score, 2.0)
+        self.assertEqual(good.percentage, 100.0)
+        self.assertEqual(bad.total_score, 0.0)
+        self.assertEqual(good._get_grading_status()['percentage'], 100.0)
+        jobs = self.env['quiz.grading.job'].search([('session_id', 'in', (good | bad).ids)])
+        self.assertEqual(set(jobs.mapped('state')), {'done'})
+
+    def test_queue_drains_once(self):
+        self._submit('async-once', self.right)
+        self.assertEqual(self.env['quiz.grading.job']._process_jobs(), 1)
+        self.assertEqual(self.env['quiz.grading.job']._process_jobs(), 0)
+
+    def test_latest_response_per_question_counts(self):
+        session = self._submit('async-reposted', self.question.choice_ids - self.right)
+        reposted = self.env['quiz.response'].create({
+            'session_id': session.id,
+            'question_id': self.question.id,
+            'answer_value': encode_answer('mcq_single', str(self.right.id)),
+        })
+        self.env['quiz.grading.job']._process_jobs()
+        self.assertEqual(session.response_ids, reposted)
+        self.assertEqual(reposted.score, 2.0)
+        self.assertEqual(session.total_score, 2.0)
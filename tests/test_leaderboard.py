@@ -0,0 +1,74 @@
+from odoo.tests.common import TransactionCase
+
+
+class TestLeaderboard(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({
+            'name': 'Ranked Quiz',
+            'slug': 'ranked-quiz',
+            'public_leaderboard': True,
+            'leaderboard_show_names': True,
+        })
+        self.question = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'question_html': '<p>Pick one</p>',
+            'points': 4.0,
+            'choice_ids': [(0, 0, {'text': 'A', 'is_correct': True})],
+        })
+        self.sessions = self.env['quiz.session']
+        for name, score in (('Ann', 4.0), ('Bob', 1.0), ('Cid', 3.0), ('Dee', 2.0)):
+            session = self.env['quiz.session'].create({
+                'quiz_id': self.quiz.id,
+                'session_token': name.lower(),
+                'participant_name': name,
+                'state': 'completed',
+            })
+            self.env['quiz.response'].create({
+                'session_id': session.id,
+                'question_id': self.question.id,
+                'score': score,
+            })
+            self.sessions |= session
+
+    def test_incremental_ranking(self):
+        self.sessions._update_leaderboard()
+        data = self.quiz._get_leaderboard_data()
+        self.assertEqual(data['session_count'], 4)
+        self.assertEqual([e['name'] for e in data['top']], ['Ann', 'Cid', 'Dee', 'Bob'])
+        ann, bob, cid, dee = self.sessions
+        self.assertEqual(ann._get_leaderboard_rank(), 25)
+        self.assertEqual(bob._get_leaderboard_rank(), 100)
+        # Ranking is idempotent
+        self.sessions._update_leaderboard()
+        self.assertEqual(self.quiz._get_leaderboard_data()['session_count'], 4)
+
+    def test_rebuild_matches_incremental(self):
+        self.sessions._update_leaderboard()
+        board = self.env['quiz.leaderboard'].search([('quiz_id', '=', self.quiz.id)])
+        incremental = (board.session_count, board.bucket_counts, board.top_entries)
+        self.env['quiz.leaderboard']._rebuild_for_quiz(self.quiz.id)
+        self.assertEqual((board.session_count, board.bucket_counts, board.top_entries), incremental)
+
+    def test_completions_are_queued_and_folded(self):
+        Delta = self.env['quiz.leaderboard.delta']
+        ann = self.sessions[0]
+        Delta.create({'quiz_id': self.quiz.id, 'session_id': ann.id})
+        self.assertEqual(ann.leaderboard_bucket, -1)
+        self.env['quiz.leaderboard']._cron_fold_deltas()
+        self.assertEqual(ann.leaderboard_bucket, 100)
+        self.assertEqual(self.quiz._get_leaderboard_data()['session_count'], 1)
+        self.sessions._update_leaderboard()
+        self.assertFalse(Delta.search([('quiz_id', '=', self.quiz.id)]))
+        self.assertEqual(self.quiz._get_leaderboard_data()['session_count'], 4)
+
+    def test_names_hidden_unless_published(self):
+        self.sessions._update_leaderboard()
+        self.quiz.leaderboard_show_names = False
+        self.assertEqual([e['name'] for e in self.quiz._get_leaderboard_data()['top']],
+                         ['Participant 1', 'Participant 2', 'Participant 3', 'Participant 4'])
+        self.quiz.public_leaderboard = False
+        data = self.quiz._get_leaderboard_data()
+        self.assertEqual(data['session_count'], 4)
+        self.assertEqual(data['top'], [])
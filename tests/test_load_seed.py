@@ -0,0 +1,18 @@
+from odoo.tests.common import TransactionCase
+from odoo.addons.quiz_engine_pro.models.graders import grade
+from odoo.addons.quiz_engine_pro.scripts.load_seed import QUESTION_TYPES, random_answer, seed_quiz
+import random
+
+
+class TestLoadSeed(TransactionCase):
+    def test_seed_covers_every_type(self):
+        quiz = seed_quiz(self.env, 'seed-test', per_type=1, size=3)
+        self.assertTrue(quiz.published)
+        self.assertEqual(sorted(quiz.question_ids.mapped('type')), sorted(QUESTION_TYPES))
+        fragments = quiz._get_delivery_fragments()['questions']
+        keys = quiz.question_ids._compile_answer_keys()
+        rng = random.Random(1)
+        for question in quiz.question_ids:
+            answer = random_answer(fragments[question.id], rng)
+            self.assertIsNotNone(answer, question.type)
+            self.assertLessEqual(grade(keys[question.id], answer), question.points)
@@ -0,0 +1,73 @@
+from datetime import timedelta
+import hashlib
+import hmac
+import json
+
+from odoo import fields
+from odoo.exceptions import AccessError, ValidationError
+from odoo.tests.common import TransactionCase
+
+
+class TestOfflineDelivery(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({'name': 'Offline Quiz', 'slug': 'offline-quiz', 'offline_mode': True})
+        self.question = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'points': 1.0,
+            'question_html': '<p>Pick one</p>',
+            'choice_ids': [(0, 0, {'text': 'Right', 'is_correct': True}),
+                           (0, 0, {'text': 'Wrong'})],
+        })
+        self.right = self.question.choice_ids.filtered('is_correct')
+        self.session = self.env['quiz.session'].create({
+            'quiz_id': self.quiz.id,
+            'session_token': 'offline-token',
+            'state': 'in_progress',
+            'question_order': str(self.question.id),
+        })
+        self.plan = [self.question.id]
+
+    def _bundle(self, answers, bundle_id='b-1', session='offline-token'):
+        payload = json.loads(self.session._get_offline_payload(self.plan))
+        body = json.dumps({'session': session, 'plan': payload['offline']['plan'],
+                           'bundle_id': bundle_id, 'answers': answers}).encode()
+        signature = hmac.new(payload['offline']['key'].encode(), body, hashlib.sha256).hexdigest()
+        return body, signature
+
+    def test_payload_strips_answer_keys(self):
+        payload = json.loads(self.session._get_offline_payload(self.plan))
+        self.assertEqual([q['id'] for q in payload['questions']], self.plan)
+        self.assertNotIn('is_correct', json.dumps(payload['questions']))
+        self.assertTrue(payload['offline']['key'])
+
+    def test_signed_bundle_graded(self):
+        body, signature = self._bundle({str(self.question.id): str(self.right.id)})
+        bundle = self.session._check_offline_bundle(body, signature, self.plan)
+        self.assertTrue(self.session._submit_offline_bundle(bundle, self.plan))
+        self.assertEqual(self.session.state, 'completed')
+        self.assertEqual(self.session.total_score, 1.0)
+        self.assertEqual(self.session.answered_count, 1)
+        # A retry of the same bundle is accepted again, another bundle is not
+        self.assertTrue(self.session._submit_offline_bundle(bundle, self.plan))
+        self.assertFalse(self.session._submit_offline_bundle(dict(bundle, bundle_id='b-2'), self.plan))
+        self.assertEqual(len(self.session.response_ids), 1)
+
+    def test_rejected_bundles(self):
+        body, signature = self._bundle({str(self.question.id): str(self.right.id)})
+        with self.assertRaises(AccessError):
+            self.session._check_offline_bundle(body.replace(b'b-1', b'b-9'), signature, self.plan)
+        with self.assertRaises(AccessError):
+            # The plan is part of the key: another plan does not verify
+            self.session._check_offline_bundle(body, signature, [])
+        body, signature = self._bundle({}, session='someone-else')
+        with self.assertRaises(ValidationError):
+            self.session._check_offline_bundle(body, signature, self.plan)
+
+    def test_expired_grace(self):
+        bundle = {'bundle_id': 'b-late', 'answers': {}}
+        self.session.write({'state': 'expired', 'time_limit_end': fields.Datetime.now() - timedelta(minutes=5)})
+        self.assertTrue(self.session._accepts_offline_bundle())
+        self.session.time_limit_end = fields.Datetime.now() - timedelta(hours=1)
+        self.assertFalse(self.session._submit_offline_bundle(bundle, self.plan))
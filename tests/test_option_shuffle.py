@@ -0,0 +1,58 @@
+from odoo.tests.common import TransactionCase
+from odoo.addons.quiz_engine_pro.models.option_shuffle import permuted
+import json
+
+
+class TestOptionShuffle(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({
+            'name': 'Shuffle Quiz',
+            'slug': 'shuffle-quiz',
+            'shuffle_options': True,
+        })
+        self.question = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'question_html': '<p>Pick one</p>',
+            'choice_ids': [(0, 0, {'text': 'Choice %d' % i, 'is_correct': i == 0}) for i in range(8)],
+        })
+
+    def _session(self, token, **vals):
+        return self.env['quiz.session'].create(dict({
+            'quiz_id': self.quiz.id,
+            'session_token': token,
+            'state': 'in_progress',
+            'question_order': str(self.question.id),
+        }, **vals))
+
+    def _choice_ids(self, session):
+        return [c['id'] for c in json.loads(session._get_delivery_payload())['questions'][0]['choices']]
+
+    def test_permuted_is_deterministic(self):
+        items = list(range(20))
+        self.assertEqual(permuted(items, 42, 'q'), permuted(items, 42, 'q'))
+        self.assertEqual(sorted(permuted(items, 42, 'q')), items)
+        self.assertEqual(items, list(range(20)), "the input list is left untouched")
+
+    def test_session_gets_seed(self):
+        self.assertTrue(self._session('shuffle-a').shuffle_seed)
+        self.quiz.shuffle_options = False
+        self.assertFalse(self._session('shuffle-b').shuffle_seed)
+
+    def test_order_is_stable_per_session(self):
+        session = self._session('shuffle-a', shuffle_seed=1)
+        order = self._choice_ids(session)
+        self.assertEqual(self._choice_ids(session), order)
+        self.assertEqual(sorted(order), sorted(self.question.choice_ids.ids))
+        self.assertEqual(session._get_option_order(self.question), order)
+
+    def test_sessions_get_their_own_order(self):
+        first = self._choice_ids(self._session('shuffle-a', shuffle_seed=1))
+        second = self._choice_ids(self._session('shuffle-b', shuffle_seed=2))
+        self.assertNotEqual(first, second)
+
+    def test_unshuffled_session_keeps_authoring_order(self):
+        session = self._session('shuffle-a', shuffle_seed=0)
+        self.assertEqual(self._choice_ids(session), self.question.choice_ids.ids)
+        self.assertEqual(session._get_option_order(self.question), [])
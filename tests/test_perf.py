@@ -0,0 +1,23 @@
+from odoo.tests.common import TransactionCase
+from odoo.addons.quiz_engine_pro.models import perf
+
+
+class TestPerfInstrumentation(TransactionCase):
+    def test_render_metrics(self):
+        perf.record_route('test_route', 0.03, 12, 0.01)
+        perf.record_grading('mcq_single', 0.001)
+        text = perf.render_metrics(self.env.cr.dbname)
+        self.assertIn('quiz_route_duration_seconds_bucket{route="test_route",le="0.05"}', text)
+        self.assertIn('quiz_route_sql_queries_total{route="test_route"}', text)
+        self.assertIn('quiz_grading_seconds_count{type="mcq_single"}', text)
+
+    def test_sampling(self):
+        params = self.env['ir.config_parameter'].sudo()
+        params.set_param('quiz_engine_pro.perf_sample_rate', '1')
+        self.env['quiz.perf.sample']._maybe_sample('test_route', 0.02, 5, 0.004)
+        sample = self.env['quiz.perf.sample'].search([('route', '=', 'test_route')])
+        self.assertEqual(sample.query_count, 5)
+        self.assertAlmostEqual(sample.duration_ms, 20.0)
+        params.set_param('quiz_engine_pro.perf_sample_rate', '0')
+        self.env['quiz.perf.sample']._maybe_sample('test_route', 0.02, 5, 0.004)
+        self.assertEqual(self.env['quiz.perf.sample'].search_count([('route', '=', 'test_route')]), 1)
@@ -0,0 +1,71 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.exceptions import AccessError
+from odoo.tests.common import TransactionCase, new_test_user
+from odoo.addons.quiz_engine_pro.models.proctor import ProctorOutbox, proctor_channel
+
+
+class TestProctor(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({'name': 'Proctor Quiz', 'slug': 'proctor-quiz'})
+        self.questions = self.env['quiz.question'].create([{
+            'quiz_id': self.quiz.id, 'type': 'mcq_single', 'question_html': '<p>Q%d</p>' % i,
+        } for i in range(3)])
+        self.session = self.env['quiz.session'].create({
+            'quiz_id': self.quiz.id,
+            'session_token': 'proctor-token',
+            'participant_name': 'Ada',
+            'state': 'in_progress',
+            'question_order': ','.join(str(q) for q in self.questions.ids),
+        })
+
+    def _answer(self, question):
+        response = self.env['quiz.response'].create({'session_id': self.session.id, 'question_id': question.id})
+        return self.session._proctor_record_answer(response)
+
+    def test_progress_counter(self):
+        self.assertEqual(self.session.question_count, 3)
+        self.assertTrue(self._answer(self.questions[0]))
+        self.assertTrue(self._answer(self.questions[1]))
+        # Going back to a question does not count it twice
+        self.assertFalse(self._answer(self.questions[0]))
+        self.assertEqual(self.session.answered_count, 2)
+        entry = self.session._proctor_entry('answered')
+        self.assertEqual((entry['event'], entry['answered'], entry['total']), ('answered', 2, 3))
+        self.session.write({'state': 'completed'})
+        self.assertEqual(self.session._proctor_entry('answered')['event'], 'submitted')
+
+    def test_outbox_coalesces(self):
+        outbox = ProctorOutbox(delay=None)
+        outbox.push('db', 1, {'id': 7, 'answered': 1})
+        outbox.push('db', 1, {'id': 7, 'answered': 2})
+        outbox.push('db', 1, {'id': 8, 'answered': 1})
+        outbox.push('db', 2, {'id': 9, 'answered': 1})
+        batch = outbox.drain('db')
+        self.assertEqual(sorted(e['answered'] for e in batch[1]), [1, 2])
+        self.assertEqual(len(batch[2]), 1)
+        self.assertEqual(outbox.drain('db'), {})
+
+    def test_send(self):
+        self.env['quiz.session']._proctor_send({self.quiz.id: [self.session._proctor_entry()]})
+        channel = self.env['bus.bus'].search([], order='id desc', limit=1).channel
+        self.assertIn(proctor_channel(self.quiz.id), channel)
+
+    def test_snapshot_and_channels(self):
+        master = new_test_user(self.env, login='proctor-master', groups='base.group_user,quiz_engine_pro.group_quiz_master')
+        snapshot = self.quiz.with_user(master).get_proctor_snapshot()
+        self.assertEqual(snapshot['channel'], proctor_channel(self.quiz.id))
+        self.assertEqual([e['id'] for e in snapshot['sessions']], self.session.ids)
+        user = new_test_user(self.env, login='proctor-outsider', groups='base.group_user')
+        with self.assertRaises(AccessError):
+            self.quiz.with_user(user).get_proctor_snapshot()
+        channels = [proctor_channel(self.quiz.id), 'broadcast']
+        self.assertEqual(self.env['ir.websocket'].with_user(user)._filter_proctor_channels(channels), ['broadcast'])
+        self.assertEqual(self.env['ir.websocket'].with_user(master)._filter_proctor_channels(channels), channels)
+
+    def test_expiry_cron(self):
+        self.session.time_limit_end = fields.Datetime.now() - timedelta(minutes=1)
+        self.assertEqual(self.env['quiz.session']._cron_expire_sessions(), 1)
+        self.assertEqual(self.session.state, 'expired')
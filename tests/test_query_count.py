@@ -0,0 +1,91 @@
+import random
+import re
+
+from odoo.tests.common import HttpCase, tagged
+from odoo.addons.quiz_engine_pro.scripts.load_seed import question_vals
+
+SIZES = (10, 100, 1000)
+TYPES = ('mcq_single', 'mcq_multiple', 'fill_blank', 'step_sequence')
+# Queries a route may gain between the smallest and the largest fixture (prefetch batch boundaries)
+SLACK = 3
+
+CSRF_RE = re.compile(r'name="csrf_token"\s+value="([^"]+)"')
+SESSION_RE = re.compile(r'[?&]session=([\w-]+)')
+
+
+@tagged('post_install', '-at_install')
+class TestRouteQueryCount(HttpCase):
+    """The quiz routes must run a number of queries independent of the number of questions"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        rng = random.Random(7)
+        cls.quizzes = {}
+        for size in SIZES:
+            quiz = cls.env['quiz.quiz'].create({
+                'name': 'Query Count %d' % size,
+                'slug': 'query-count-%d' % size,
+                'access_mode': 'public',
+            })
+            vals_list = []
+            for index in range(size):
+                vals = question_vals(quiz.id, TYPES[index % len(TYPES)], 3, rng)
+                vals.update(access_mode='public', sequence=index)
+                vals_list.append(vals)
+            cls.env['quiz.question'].create(vals_list)
+            quiz.published = True
+            cls.quizzes[size] = quiz
+
+    def _count(self, func):
+        """Queries run by ``func``, measured once caches and templates are warm"""
+        func()
+        before = self.cr.sql_log_count
+        func()
+        return self.cr.sql_log_count - before
+
+    def _start(self, quiz):
+        response = self.url_open('/quiz/%s/start' % quiz.slug, data={'participant_name': 'Counter'},
+                                 allow_redirects=False)
+        return SESSION_RE.search(response.headers['Location']).group(1)
+
+    def _submit_data(self, quiz):
+        page = self.url_open('/quiz/%s' % quiz.slug)
+        data = {'csrf_token': CSRF_RE.search(page.text).group(1)}
+        for question in quiz.question_ids.filtered(lambda q: q.type == 'mcq_single'):
+            data['question_%d' % question.id] = str(question.choice_ids[:1].id)
+        return data
+
+    def _assert_bounded(self, counts, route):
+        smallest = counts[SIZES[0]]
+        for size in SIZES[1:]:
+            self.assertLessEqual(
+                counts[size], smallest + SLACK,
+                "%s: %d queries for %d questions, %d for %d" % (route, counts[size], size, smallest, SIZES[0]))
+
+    def test_question_page(self):
+        counts = {}
+        for size, quiz in self.quizzes.items():
+            token = self._start(quiz)
+            counts[size] = self._count(lambda: self.url_open(
+                '/quiz/%s/question/%d?session=%s' % (quiz.slug, size, token), allow_redirects=False))
+        self._assert_bounded(counts, 'quiz_question')
+
+    def test_submit(self):
+        counts = {}
+        for size, quiz in self.quizzes.items():
+            data = self._submit_data(quiz)
+            counts[size] = self._count(lambda: self.url_open(
+                '/quiz/%s/submit' % quiz.slug, data=data, allow_redirects=False))
+            session = self.env['quiz.session'].search([('quiz_id', '=', quiz.id)], order='id desc', limit=1)
+            self.assertEqual(len(session.response_ids), size)
+        self._assert_bounded(counts, 'quiz_submit')
+
+    def test_results(self):
+        counts = {}
+        for size, quiz in self.quizzes.items():
+            response = self.url_open('/quiz/%s/submit' % quiz.slug, data=self._submit_data(quiz),
+                                     allow_redirects=False)
+            results_url = response.headers['Location']
+            counts[size] = self._count(lambda: self.url_open(results_url))
+        self._assert_bounded(counts, 'quiz_results')
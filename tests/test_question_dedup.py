@@ -0,0 +1,102 @@
+from odoo.tests.common import TransactionCase
+from odoo.addons.quiz_engine_pro.models.question_dedup import find_clusters, minhash, normalize, shingles, similarity
+
+CAPITAL = '<p>Which city is the capital of France and home of the Eiffel Tower?</p>'
+
+
+class TestQuestionDedup(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({'name': 'Dedup Quiz', 'slug': 'dedup-quiz'})
+        self.original = self._question(CAPITAL)
+        self.copy = self._question('<p>Which city is the <b>capital of France</b> and home of the Eiffel tower</p>')
+        self.other = self._question('<p>Which gas do plants absorb from the air during photosynthesis?</p>')
+        self.Cluster = self.env['quiz.duplicate.cluster']
+
+    def _question(self, html):
+        return self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'question_html': html,
+            'choice_ids': [(0, 0, {'text': 'Paris', 'is_correct': True}), (0, 0, {'text': 'Lyon'})],
+        })
+
+    def _cluster_of(self, question):
+        return self.Cluster.search([('state', '=', 'new'), ('item_ids.question_id', '=', question.id)])
+
+    def test_signatures(self):
+        self.assertEqual(normalize('<p>Hello, <b>World</b>!</p>'), ['hello', 'world'])
+        self.assertEqual(shingles(['a', 'b']), {'a b'})
+        words = normalize(CAPITAL)
+        self.assertEqual(similarity(minhash(shingles(words)), minhash(shingles(words))), 1.0)
+        signatures = {
+            1: minhash(shingles(words)),
+            2: minhash(shingles(words + ['paris'])),
+            3: minhash(shingles(normalize('Name the largest planet of the solar system'))),
+        }
+        self.assertEqual([members for members, score in find_clusters(signatures, 0.7)], [[1, 2]])
+
+    def test_detect(self):
+        self.Cluster._detect_duplicates(0.7)
+        cluster = self._cluster_of(self.original)
+        self.assertEqual(len(cluster), 1)
+        self.assertEqual(cluster.item_ids.question_id, self.original | self.copy)
+        self.assertFalse(self._cluster_of(self.other))
+        self.assertEqual(cluster.item_ids.filtered('is_master').question_id, self.original)
+
+    def test_ignored_cluster_not_proposed_again(self):
+        self.Cluster._detect_duplicates(0.7)
+        self._cluster_of(self.original).action_ignore()
+        self.Cluster._detect_duplicates(0.7)
+        self.assertFalse(self._cluster_of(self.original))
+
+    def test_merge_keeps_answered_questions(self):
+        third = self._question(CAPITAL)
+        session = self.env['quiz.session'].create({
+            'quiz_id': self.quiz.id, 'session_token': 'dedup-token', 'state': 'in_progress'})
+        self.env['quiz.response'].create({'session_id': session.id, 'question_id': third.id})
+        self.Cluster._detect_duplicates(0.7)
+        cluster = self._cluster_of(self.original)
+        cluster.item_ids.filtered(lambda i: i.question_id == self.copy).action_set_master()
+        cluster.action_merge()
+        self.assertEqual(cluster.state, 'merged')
+        self.assertFalse(self.original.exists())
+        self.assertTrue(self.copy.exists())
+        self.assertTrue(third.exists())
+        self.assertTrue(cluster.note)
+
+    def test_detects_across_quizzes_and_merges_inside_one(self):
+        exam = self.env['quiz.quiz'].create({'name': 'Dedup Exam', 'slug': 'dedup-exam'})
+        shared = self.env['quiz.question'].create({
+            'quiz_id': exam.id,
+            'type': 'mcq_single',
+            'question_html': '<p>Which city is the capital of France and home of the Eiffel Tower??</p>',
+            'choice_ids': [(0, 0, {'text': 'Paris', 'is_correct': True}), (0, 0, {'text': 'Lyon'})],
+        })
+        self.Cluster._detect_duplicates(0.7)
+        cluster = self._cluster_of(shared)
+        self.assertEqual(len(cluster), 1)
+        self.assertEqual(cluster.item_ids.question_id, self.original | self.copy | shared)
+        self.assertEqual(cluster.quiz_ids, self.quiz | exam)
+        self.assertEqual(cluster.item_ids.filtered(lambda i: i.question_id == shared).quiz_id, exam)
+        cluster.item_ids.filtered(lambda i: i.question_id == self.original).action_set_master()
+        cluster.action_merge()
+        self.assertTrue(self.original.exists())
+        self.assertFalse(self.copy.exists())
+        self.assertTrue(shared.exists())
+        self.assertIn('Eiffel', cluster.note)
+
+    def test_merge_of_copied_quiz_keeps_both_quizzes(self):
+        exam = self.quiz.copy()
+        self.assertEqual(len(exam.question_ids), 3)
+        self.Cluster._detect_duplicates(0.7)
+        clusters = self.Cluster.search([('state', '=', 'new')])
+        self.assertEqual(len(clusters), 2)
+        self.assertEqual(clusters.quiz_ids, self.quiz | exam)
+        for cluster in clusters:
+            cluster.item_ids.filtered(lambda i: i.question_id in self.original | self.other).action_set_master()
+        clusters.action_merge()
+        self.assertEqual(len(self.quiz.question_ids), 2)
+        self.assertEqual(len(exam.question_ids), 3)
+        self.assertTrue(self.original.exists())
+        self.assertTrue(self.other.exists())
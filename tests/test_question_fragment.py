@@ -0,0 +1,59 @@
+from odoo.tests.common import TransactionCase
+from odoo.addons.quiz_engine_pro.models.graders import grade
+import re
+
+
+class TestQuestionFragment(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({'name': 'Fragment Quiz', 'slug': 'fragment-quiz'})
+        self.question = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'question_html': '<p>Capital of France?</p>',
+            'choice_ids': [(0, 0, {'text': 'Paris', 'is_correct': True}),
+                           (0, 0, {'text': 'Lyon'})],
+        })
+
+    def test_fragment_renders_choices(self):
+        html = str(self.question._get_body_fragment())
+        self.assertIn('Paris', html)
+        self.assertIn('Lyon', html)
+
+    def test_fragment_is_reused(self):
+        first = self.question._get_body_fragment()
+        self.assertIs(self.question._get_body_fragment(), first)
+
+    def test_child_edit_invalidates(self):
+        first = self.question._get_body_fragment()
+        self.question.choice_ids.filtered(lambda c: c.text == 'Lyon').text = 'Marseille'
+        html = str(self.question._get_body_fragment())
+        self.assertIsNot(html, first)
+        self.assertIn('Marseille', html)
+        self.assertNotIn('Lyon', html)
+
+    def test_match_right_column_hides_pairing(self):
+        # Alphabetical in authoring order: sorting by text alone would line every answer up with its prompt
+        match = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'match',
+            'question_html': '<p>Match the capitals</p>',
+            'match_pair_ids': [(0, 0, {'left_text': 'France', 'right_text': 'Aparis', 'sequence': 1}),
+                               (0, 0, {'left_text': 'Italy', 'right_text': 'Brome', 'sequence': 2}),
+                               (0, 0, {'left_text': 'Spain', 'right_text': 'Cmadrid', 'sequence': 3})],
+        })
+        html = str(match._get_body_fragment())
+        left_ids = re.findall(r'data-left-id="([^"]+)"', html)
+        right_ids = re.findall(r'data-right-id="([^"]+)"', html)
+        self.assertEqual(left_ids, [str(pid) for pid in match.match_pair_ids.ids])
+        self.assertEqual(len(right_ids), 3)
+        self.assertFalse(set(left_ids) & set(right_ids))
+        right_texts = [t.strip() for t in re.findall(r'match-right-item"[^>]*>([^<]+)<', html)]
+        self.assertNotEqual(right_texts, match.match_pair_ids.mapped('right_text'))
+        # Posted opaque ids resolve back to pairs; a pair id posted as right id matches nothing
+        keys = match.match_pair_ids._get_right_keys()
+        key = match._compile_answer_keys()[match.id]
+        posted = [{'left_id': pid, 'right_id': keys[pid]} for pid in match.match_pair_ids.ids]
+        self.assertEqual(grade(key, match._resolve_client_answer(posted)), match.points)
+        forged = [{'left_id': pid, 'right_id': pid} for pid in match.match_pair_ids.ids]
+        self.assertEqual(grade(key, match._resolve_client_answer(forged)), 0.0)
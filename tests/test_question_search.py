@@ -0,0 +1,46 @@
+from odoo.tests.common import TransactionCase
+from odoo.addons.quiz_engine_pro.models.question_search import html_to_text
+
+
+class TestQuestionSearch(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({'name': 'Search Quiz', 'slug': 'search-quiz'})
+        Question = self.env['quiz.question']
+        self.photosynthesis = Question.create({
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'question_html': '<p>Which organelle hosts <b>photosynthesis</b>?</p>',
+            'explanation': '<p>Chlorophyll lives in the chloroplast &amp; absorbs light.</p>',
+            'choice_ids': [(0, 0, {'text': 'Chloroplast', 'is_correct': True}),
+                           (0, 0, {'text': 'Mitochondrion'})],
+        })
+        self.passage = Question.create({
+            'quiz_id': self.quiz.id,
+            'type': 'passage',
+            'question_html': '<p>Read the passage</p>',
+            'passage_ids': [(0, 0, {'name': 'Volcanoes', 'passage_content': '<p>Magma rises through the crust.</p>'})],
+        })
+
+    def test_html_to_text(self):
+        self.assertEqual(html_to_text('<p>A &amp;<br/>B</p>\n<p> C</p>'), 'A & B C')
+        self.assertEqual(html_to_text(False), '')
+
+    def test_search_text_follows_children(self):
+        self.assertIn('photosynthesis', self.photosynthesis.search_text)
+        self.assertIn('Mitochondrion', self.photosynthesis.search_text)
+        self.assertIn('chloroplast & absorbs', self.photosynthesis.search_text)
+        self.assertIn('Magma', self.passage.search_text)
+        self.photosynthesis.choice_ids[1].text = 'Ribosome'
+        self.assertIn('Ribosome', self.photosynthesis.search_text)
+
+    def test_fulltext(self):
+        Question = self.env['quiz.question']
+        self.assertEqual(Question.search([('content_search', 'ilike', 'mitochondrion')]), self.photosynthesis)
+        self.assertEqual(Question.search([('content_search', 'ilike', 'magma crust')]), self.passage)
+        self.assertFalse(Question.search([('content_search', 'ilike', 'magma -crust')]))
+        found = Question._search_fulltext('chloroplast OR magma', [('quiz_id', '=', self.quiz.id)])
+        # Two hits on chloroplast rank first
+        self.assertEqual(found, self.photosynthesis | self.passage)
+        self.assertEqual(found[0], self.photosynthesis)
+        self.assertEqual(Question.search([('search_text', 'ilike', 'organelle hosts')]), self.photosynthesis)
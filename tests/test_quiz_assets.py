@@ -0,0 +1,30 @@
+from odoo.tests.common import TransactionCase
+from odoo.addons.quiz_engine_pro.models.quiz_assets import CORE_BUNDLE, TYPE_BUNDLES, asset_bundles
+
+
+class TestQuizAssets(TransactionCase):
+    def test_bundles_per_type(self):
+        self.assertEqual(asset_bundles({'mcq_single', 'mcq_multiple'}), [CORE_BUNDLE])
+        self.assertEqual(asset_bundles({'match', 'drag_zone', 'mcq_single'}),
+                         [CORE_BUNDLE, 'quiz_engine_pro.assets_quiz_drag_drop'])
+
+    def test_frontend_ships_no_quiz_code(self):
+        paths = self.env['ir.asset']._get_asset_paths('web.assets_frontend', {})
+        self.assertFalse([path for path, *_rest in paths if path.startswith('/quiz_engine_pro/')])
+        for bundle in {CORE_BUNDLE, *TYPE_BUNDLES.values()}:
+            with self.subTest(bundle=bundle):
+                self.assertTrue(self.env['ir.asset']._get_asset_paths(bundle, {}))
+
+    def test_session_plan(self):
+        quiz = self.env['quiz.quiz'].create({'name': 'Assets Quiz', 'slug': 'assets-quiz'})
+        mcq, matrix, sequence = self.env['quiz.question'].create([
+            {'quiz_id': quiz.id, 'type': 'mcq_single', 'question_html': '<p>A</p>'},
+            {'quiz_id': quiz.id, 'type': 'matrix', 'question_html': '<p>B</p>'},
+            {'quiz_id': quiz.id, 'type': 'step_sequence', 'question_html': '<p>C</p>'},
+        ])
+        session = self.env['quiz.session'].create({
+            'quiz_id': quiz.id, 'session_token': 'assets-token', 'question_order': '%d,%d' % (mcq.id, matrix.id),
+        })
+        self.assertEqual(session._get_asset_bundles(), [CORE_BUNDLE, 'quiz_engine_pro.assets_quiz_matrix'])
+        self.assertEqual(quiz._get_asset_bundles(mcq | sequence),
+                         [CORE_BUNDLE, 'quiz_engine_pro.assets_quiz_sequence'])
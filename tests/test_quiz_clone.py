@@ -0,0 +1,61 @@
+from odoo.tests.common import TransactionCase
+from odoo.addons.quiz_engine_pro.scripts.load_seed import QUESTION_TYPES, create_question, seed_quiz
+import random
+
+
+class TestQuizClone(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = seed_quiz(self.env, 'clone-source', per_type=1, size=3)
+
+    def _tree(self, quiz):
+        questions = quiz.question_ids
+        return {
+            'questions': sorted(questions.mapped('type')),
+            'choices': sorted(questions.choice_ids.mapped('text')),
+            'options': sorted(questions.blank_ids.option_ids.mapped('label')),
+            'steps': sorted(questions.sequence_item_ids.mapped('label')),
+            'cells': self.env['quiz.matrix.cell'].search_count([('question_id', 'in', questions.ids)]),
+            'correct_cells': len(self.env['quiz.matrix.cell'].search(
+                [('question_id', 'in', questions.ids), ('is_correct', '=', True)])),
+            'sub_choices': sorted(questions.passage_ids.sub_question_ids.choice_ids.mapped('text')),
+        }
+
+    def test_copy_clones_whole_tree(self):
+        copy = self.quiz.copy()
+        self.assertEqual(copy.slug, 'clone-source-copy')
+        self.assertFalse(copy.published)
+        self.assertEqual(self._tree(copy), self._tree(self.quiz))
+        self.assertFalse(copy.question_ids & self.quiz.question_ids)
+        Cell = self.env['quiz.matrix.cell']
+        for cell in Cell.search([('question_id', 'in', copy.question_ids.ids)]):
+            self.assertEqual(cell.row_id.question_id, cell.question_id)
+            self.assertEqual(cell.column_id.question_id, cell.question_id)
+        self.assertEqual(copy.question_ids.blank_ids.option_ids.blank_id.question_id.quiz_id, copy)
+        self.assertEqual(copy.question_ids.passage_ids.sub_question_ids.passage_id.question_id.quiz_id, copy)
+        # A second copy gets its own slug, the original is untouched
+        self.assertEqual(self.quiz.copy().slug, 'clone-source-copy-2')
+        self.assertEqual(len(self.quiz.question_ids), len(QUESTION_TYPES))
+
+    def test_query_count_independent_of_size(self):
+        counts = []
+        for per_type in (1, 4):
+            quiz = seed_quiz(self.env, 'clone-size-%d' % per_type, per_type=per_type, size=3)
+            self.env.flush_all()
+            before = self.env.cr.sql_log_count
+            quiz._clone_tree({quiz.id: self.quiz.id})
+            counts.append(self.env.cr.sql_log_count - before)
+        self.assertEqual(counts[0], counts[1])
+
+    def test_copy_questions_to_quiz(self):
+        target = self.env['quiz.quiz'].create({'name': 'Clone Target', 'slug': 'clone-target'})
+        create_question(self.env, target, 'mcq_single', 3, random.Random(1))
+        version = target.content_version
+        source = self.quiz.question_ids.filtered(lambda q: q.type in ('dropdown_blank', 'passage'))
+        copies = source._copy_to_quiz(target)
+        self.assertEqual(len(copies), 2)
+        self.assertEqual(copies.quiz_id, target)
+        self.assertEqual(len(target.question_ids), 3)
+        self.assertEqual(sorted(copies.blank_ids.option_ids.mapped('label')),
+                         sorted(source.blank_ids.option_ids.mapped('label')))
+        self.assertGreater(target.content_version, version)
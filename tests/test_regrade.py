@@ -0,0 +1,89 @@
+from odoo.tests.common import TransactionCase
+from odoo.exceptions import ValidationError
+import json
+import os
+
+
+class TestRegrade(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({
+            'name': 'Regrade Quiz',
+            'slug': 'regrade-quiz',
+        })
+        self.question = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'question_html': '<p>Pick one</p>',
+            'points': 2.0,
+            'choice_ids': [
+                (0, 0, {'text': 'A', 'is_correct': True}),
+                (0, 0, {'text': 'B', 'is_correct': False}),
+            ],
+        })
+        self.choice_a, self.choice_b = self.question.choice_ids
+        self.session = self.env['quiz.session'].create({
+            'quiz_id': self.quiz.id,
+            'session_token': 'regrade-token',
+            'state': 'completed',
+        })
+        self.response = self.env['quiz.response'].create({
+            'session_id': self.session.id,
+            'question_id': self.question.id,
+            'answer_data': json.dumps(str(self.choice_b.id)),
+            'score': 0.0,
+            'is_correct': False,
+        })
+
+    def test_dry_run_reports_without_writing(self):
+        self.choice_a.is_correct = False
+        self.choice_b.is_correct = True
+        result = self.env['quiz.regrade.wizard']._regrade(self.question, dry_run=True)
+        self.assertEqual(result['responses'], 1)
+        self.assertEqual(result['changes'], [(self.response.id, self.question.id, 0.0, 2.0)])
+        self.assertEqual(self.response.score, 0.0)
+
+    def test_regrade_updates_scores_and_totals(self):
+        self.choice_a.is_correct = False
+        self.choice_b.is_correct = True
+        wizard = self.env['quiz.regrade.wizard'].create({'quiz_id': self.quiz.id, 'dry_run': False})
+        wizard.action_regrade()
+        self.assertEqual(wizard.changed_count, 1)
+        self.assertEqual(self.response.score, 2.0)
+        self.assertTrue(self.response.is_correct)
+        self.assertEqual(self.session.total_score, 2.0)
+
+    def test_workers_bounded_by_cpu_count(self):
+        with self.assertRaises(ValidationError):
+            self.env['quiz.regrade.wizard'].create({'quiz_id': self.quiz.id, 'workers': (os.cpu_count() or 1) + 1})
+        with self.assertRaises(ValidationError):
+            self.env['quiz.regrade.wizard'].create({'quiz_id': self.quiz.id, 'workers': 0})
+
+    def test_regrade_in_worker_processes(self):
+        self.choice_a.is_correct = False
+        self.choice_b.is_correct = True
+        result = self.env['quiz.regrade.wizard']._regrade(self.question, dry_run=False, chunk_size=1, workers=2)
+        self.assertEqual(len(result['changes']), 1)
+        self.assertEqual(self.response.score, 2.0)
+
+    def test_pinned_sessions_keep_their_snapshot_key(self):
+        snapshot = self.env['quiz.snapshot']._create_for_quiz(self.quiz)
+        pinned = self.env['quiz.session'].create({
+            'quiz_id': self.quiz.id,
+            'session_token': 'regrade-pinned',
+            'state': 'completed',
+            'snapshot_id': snapshot.id,
+        })
+        pinned_response = self.env['quiz.response'].create({
+            'session_id': pinned.id,
+            'question_id': self.question.id,
+            'answer_data': json.dumps(str(self.choice_a.id)),
+            'score': 2.0,
+            'is_correct': True,
+        })
+        self.choice_a.is_correct = False
+        self.choice_b.is_correct = True
+        result = self.env['quiz.regrade.wizard']._regrade(self.question, dry_run=False)
+        self.assertEqual([change[0] for change in result['changes']], [self.response.id])
+        self.assertEqual(pinned_response.score, 2.0)
+        self.assertEqual(self.response.score, 2.0)
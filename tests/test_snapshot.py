@@ -0,0 +1,70 @@
+from odoo.tests.common import TransactionCase
+from odoo.exceptions import UserError
+
+
+class TestQuizSnapshot(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.quiz = self.env['quiz.quiz'].create({
+            'name': 'Snapshot Quiz',
+            'slug': 'snapshot-quiz',
+        })
+        self.question = self.env['quiz.question'].create({
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'question_html': '<p>Pick one</p>',
+            'points': 2.0,
+            'choice_ids': [
+                (0, 0, {'text': 'A', 'is_correct': True}),
+                (0, 0, {'text': 'B', 'is_correct': False}),
+            ],
+        })
+        self.choice_a, self.choice_b = self.question.choice_ids
+
+    def test_publish_creates_snapshot(self):
+        self.quiz.published = True
+        snapshot = self.quiz.current_snapshot_id
+        self.assertTrue(snapshot)
+        self.assertEqual(snapshot.version, self.quiz.content_version)
+        with self.assertRaises(UserError):
+            snapshot.write({'question_count': 0})
+
+    def test_freeze_same_version_twice(self):
+        """A second start racing the first one reuses the snapshot instead of failing"""
+        self.quiz.published = True
+        snapshot = self.quiz.current_snapshot_id
+        self.assertEqual(self.env['quiz.snapshot']._create_for_quiz(self.quiz), snapshot)
+        self.assertEqual(len(self.quiz.snapshot_ids), 1)
+
+    def test_pinned_session_ignores_later_edits(self):
+        """Fixing the key mid-exam does not change grading of a pinned session"""
+        self.quiz.published = True
+        session = self.env['quiz.session'].create({
+            'quiz_id': self.quiz.id,
+            'session_token': 'snapshot-token',
+            'state': 'in_progress',
+            'snapshot_id': self.quiz._get_current_snapshot().id,
+        })
+        self.choice_a.is_correct = False
+        self.choice_b.is_correct = True
+        self.assertEqual(session._grade_from_snapshot(self.question, str(self.choice_a.id)), 2.0)
+        self.assertEqual(session._grade_from_snapshot(self.question, str(self.choice_b.id)), 0.0)
+        # A new session gets the new version
+        self.assertNotEqual(self.quiz._get_current_snapshot(), session.snapshot_id)
+
+    def test_pinned_session_page_shows_snapshot_content(self):
+        """The question page of a pinned session shows what it is graded against"""
+        self.quiz.published = True
+        session = self.env['quiz.session'].create({
+            'quiz_id': self.quiz.id,
+            'session_token': 'snapshot-page-token',
+            'state': 'in_progress',
+            'snapshot_id': self.quiz._get_current_snapshot().id,
+        })
+        self.question.write({'question_html': '<p>Pick two</p>', 'points': 5.0})
+        self.choice_b.text = 'B (revised)'
+        display = session._get_question_display(self.question)
+        self.assertIn('Pick one', display['html'])
+        self.assertEqual(display['points'], 2.0)
+        self.assertIn('>B<', str(display['body']).replace(' ', '').replace('\n', ''))
+        self.assertNotIn('revised', str(display['body']))
@@ -0,0 +1,77 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.tests.common import TransactionCase, new_test_user
+from odoo.addons.quiz_engine_pro.models.spaced_repetition import sm2
+
+
+class TestSpacedRepetition(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.user = new_test_user(self.env, login='tutor-student', groups='base.group_portal')
+        self.quiz = self.env['quiz.quiz'].create({'name': 'Tutor Quiz', 'slug': 'tutor-quiz'})
+        self.questions = self.env['quiz.question'].create([{
+            'quiz_id': self.quiz.id,
+            'type': 'mcq_single',
+            'sequence': index,
+            'question_html': '<p>Question %d</p>' % index,
+            'choice_ids': [(0, 0, {'text': 'Yes', 'is_correct': True}), (0, 0, {'text': 'No'})],
+        } for index in range(3)])
+        self.session = self.env['quiz.session'].create({
+            'quiz_id': self.quiz.id,
+            'session_token': 'tutor-token',
+            'state': 'in_progress',
+            'user_id': self.user.id,
+            'mode_id': self.env.ref('quiz_engine_pro.quiz_mode_tutor').id,
+        })
+        self.Item = self.env['quiz.review.item']
+        self.today = fields.Date.context_today(self.Item.with_context(tz=self.user.tz))
+
+    def _answer(self, question, correct, session=None):
+        return self.env['quiz.response'].create({
+            'session_id': (session or self.session).id,
+            'question_id': question.id,
+            'score': question.points if correct else 0.0,
+        })
+
+    def _item(self, question):
+        return self.Item.search([('user_id', '=', self.user.id), ('question_id', '=', question.id)])
+
+    def test_sm2(self):
+        state = (0, 0, 2.5)
+        intervals = []
+        for _i in range(3):
+            state = sm2(*state, True)
+            intervals.append(state[1])
+        self.assertEqual(intervals, [1, 6, 15])
+        repetitions, interval, ease = sm2(*state, False)
+        self.assertEqual((repetitions, interval), (0, 1))
+        self.assertAlmostEqual(ease, 1.96)
+        self.assertEqual(sm2(0, 1, 1.3, False)[2], 1.3)
+
+    def test_answers_schedule_items(self):
+        question = self.questions[0]
+        response = self._answer(question, True)
+        item = self._item(question)
+        self.assertEqual((item.repetitions, item.interval_days, item.lapses), (1, 1, 0))
+        self.assertEqual(item.due_date, self.today + timedelta(days=1))
+        # Regrading the same answer does not count it twice
+        response.score = 0.0
+        self.assertEqual(self._item(question).repetitions, 1)
+        self._answer(question, False)
+        item = self._item(question)
+        self.assertEqual((item.repetitions, item.interval_days, item.lapses), (0, 1, 1))
+
+    def test_other_modes_do_not_schedule(self):
+        session = self.session.copy({'session_token': 'exam-token', 'mode_id': False})
+        self._answer(self.questions[0], True, session)
+        self.assertFalse(self._item(self.questions[0]))
+
+    def test_review_plan(self):
+        first, second, third = self.questions
+        self._answer(first, True)
+        self._answer(second, False)
+        self._item(second).due_date = self.today - timedelta(days=2)
+        # Overdue questions first, then the ones never reviewed; first is not due yet
+        self.assertEqual(self.quiz._get_review_question_ids(self.user), [second.id, third.id])
+        self.assertEqual(self.quiz._get_review_question_ids(self.user, limit=1), [second.id])
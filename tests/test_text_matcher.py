@@ -0,0 +1,87 @@
+from odoo.tests.common import TransactionCase, tagged
+from odoo.addons.quiz_engine_pro.models.text_matcher import (
+    KeywordMatcher, bounded_edit_distance, get_matcher, normalize_text, split_keywords,
+)
+import logging
+import random
+import time
+
+_logger = logging.getLogger(__name__)
+
+WORDS = ('energy light plant leaf water carbon oxygen glucose cell sun chlorophyll root stem '
+         'membrane reaction enzyme molecule absorb release produce store transport').split()
+
+
+class TestTextMatcher(TransactionCase):
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text('  Crème   Brûlée, s\'il-vous-plaît! '), 'creme brulee s il vous plait')
+        self.assertEqual(normalize_text('Paris', case_sensitive=True), 'Paris')
+
+    def test_split_keywords(self):
+        self.assertEqual(split_keywords('Sun, sun,, Light '), ('sun', 'light'))
+
+    def test_significant_symbols(self):
+        self.assertEqual(split_keywords('C++, C#, -5, 3.14'), ('c++', 'c#', '-5', '3.14'))
+        self.assertEqual(normalize_text('x=-5, pi is 3.14.'), 'x -5 pi is 3.14')
+        matcher = get_matcher(split_keywords('C++, C#'))
+        self.assertEqual(matcher.count(normalize_text('I love cats and Java')), 0)
+        self.assertEqual(matcher.count(normalize_text('I write C++ and C#.')), 2)
+        self.assertNotEqual(normalize_text('5'), normalize_text('-5'))
+
+    def test_overlapping_keywords(self):
+        matcher = KeywordMatcher(('data', 'database', 'base'))
+        self.assertEqual(matcher.count('a database'), 3)
+        self.assertEqual(matcher.count('based'), 1)
+        self.assertFalse(matcher.any('nothing here'))
+
+    def test_fuzzy_matching(self):
+        keywords = split_keywords('photosynthesis, chlorophyll')
+        self.assertEqual(get_matcher(keywords).count('fotosynthesis and chlorofyll'), 0)
+        self.assertEqual(get_matcher(keywords, 2).count('fotosynthesis and chlorofyll'), 2)
+        self.assertEqual(bounded_edit_distance('kitten', 'sitting', 1), 2)
+        self.assertEqual(bounded_edit_distance('kitten', 'sitting', 5), 3)
+
+    def test_text_box_evaluation(self):
+        quiz = self.env['quiz.quiz'].create({'name': 'Text Quiz', 'slug': 'text-quiz'})
+        question = self.env['quiz.question'].new({
+            'quiz_id': quiz.id,
+            'type': 'mcq_single',
+            'points': 2.0,
+            'correct_text_answer': 'Plants make glucose.',
+            'allow_partial_match': True,
+            'keywords': 'glucose, sunlight',
+        })
+        self.assertEqual(question._evaluate_text_box('plants MAKE glucose'), 2.0)
+        self.assertEqual(question._evaluate_text_box('They produce Glucose!'), 1.0)
+        question.correct_text_answer = '-5'
+        self.assertEqual(question._evaluate_text_box('5'), 0.0)
+        self.assertEqual(question._evaluate_text_box(' -5 '), 2.0)
+
+
+@tagged('-standard', 'quiz_benchmark')
+class BenchmarkTextMatcher(TransactionCase):
+    """Run with --test-tags quiz_benchmark"""
+
+    def test_long_answer_benchmark(self):
+        rng = random.Random(42)
+        keywords = split_keywords(', '.join(rng.sample(WORDS, 15)))
+        answers = [' '.join(rng.choice(WORDS) for _ in range(5000)) for _ in range(20)]
+
+        start = time.perf_counter()
+        naive = [sum(1 for k in keywords if k in normalize_text(a)) for a in answers]
+        naive_time = time.perf_counter() - start
+
+        matcher = get_matcher(keywords)
+        start = time.perf_counter()
+        compiled = [matcher.count(normalize_text(a)) for a in answers]
+        compiled_time = time.perf_counter() - start
+
+        fuzzy = get_matcher(keywords, 1)
+        start = time.perf_counter()
+        for a in answers:
+            fuzzy.count(normalize_text(a))
+        fuzzy_time = time.perf_counter() - start
+
+        self.assertEqual(naive, compiled)
+        _logger.info("Text matcher on %d x 5000-word answers, %d keywords: naive %.4fs, automaton %.4fs, "
+                     "fuzzy(1) %.4fs", len(answers), len(keywords), naive_time, compiled_time, fuzzy_time)